@@ -6,7 +6,8 @@ from catalog.models import (
     Country,
     Instrument,
     Musician,
-    Band
+    Band,
+    Task,
 )
 
 
@@ -37,3 +38,10 @@ admin.site.register(Genre)
 admin.site.register(Country)
 admin.site.register(Instrument)
 admin.site.register(Band)
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ("name", "status", "progress", "total", "created")
+    list_filter = ("status", "name")
+    readonly_fields = ("started", "finished")
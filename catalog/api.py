@@ -0,0 +1,179 @@
+import hashlib
+import json
+from collections import defaultdict
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views import generic
+
+from catalog.changes import last_changed
+from catalog.memberships import apply_membership_changes
+from catalog.models import Band, Musician, Genre, Instrument, Country
+from catalog.pagination import CursorPage, CursorPaginator
+from catalog.templatetags.query_transform import query_transform
+from catalog.views import (
+    BandListView,
+    MusicianListView,
+    GenreListView,
+    CountryListView,
+    InstrumentListView,
+)
+
+
+class JsonListMixin:
+    """
+    Serve a catalog ListView as JSON. The list view's get_queryset (and
+    its search) is reused, rows are read with .values() and conditional
+    GET is answered from the change times recorded for api_depends_on,
+    without touching the database.
+    """
+
+    paginate_by = 100
+    api_fields = {"id": "id", "name": "name"}
+    api_depends_on = ()
+
+    def get(self, request, *args, **kwargs):
+        changed = last_changed(self.api_depends_on)
+        digest = hashlib.md5(
+            f"{changed.isoformat()}|{request.get_full_path()}".encode()
+        ).hexdigest()
+        etag = quote_etag(digest)
+        last_modified = int(changed.timestamp())
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = JsonResponse(self.get_payload())
+
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+
+        return response
+
+    def get_payload(self):
+        queryset = self.get_queryset().prefetch_related(None)
+        lookups = list(self.api_fields.values())
+        ordering = [
+            field.lstrip("-")
+            for field in CursorPaginator.get_ordering(queryset)
+        ]
+
+        paginator, page, rows, is_paginated = self.paginate_queryset(
+            queryset.values(
+                *lookups,
+                *[field for field in ordering if field not in lookups]
+            ),
+            self.get_paginate_by(queryset)
+        )
+
+        results = [
+            {name: row[lookup] for name, lookup in self.api_fields.items()}
+            for row in rows
+        ]
+        self.extend_results(results)
+
+        return {
+            "results": results,
+            "next": self.get_page_link(page, "next"),
+            "previous": self.get_page_link(page, "previous"),
+        }
+
+    def extend_results(self, results):
+        pass
+
+    def get_page_link(self, page, direction):
+        if not getattr(page, f"has_{direction}")():
+            return None
+
+        if isinstance(page, CursorPage):
+            query = query_transform(
+                self.request,
+                cursor=getattr(page, f"{direction}_cursor"),
+                page=None
+            )
+        else:
+            query = query_transform(
+                self.request,
+                page=getattr(page, f"{direction}_page_number")()
+            )
+
+        return f"{self.request.path}?{query}"
+
+
+class BandApiView(JsonListMixin, BandListView):
+    api_fields = {
+        "id": "id",
+        "name": "name",
+        "description": "description",
+        "country": "country__name",
+    }
+    # Deleting a musician drops its memberships without m2m_changed.
+    api_depends_on = (Band, Country, Genre, Musician, Instrument)
+
+    def extend_results(self, results):
+        genres = defaultdict(list)
+        members = defaultdict(list)
+        band_ids = [result["id"] for result in results]
+
+        for band_id, genre in Band.genres.through.objects.filter(
+            band_id__in=band_ids
+        ).values_list("band_id", "genre__name").order_by("genre__name"):
+            genres[band_id].append(genre)
+
+        for band_id, musician_id in Band.members.through.objects.filter(
+            band_id__in=band_ids
+        ).values_list("band_id", "musician_id").order_by("musician_id"):
+            members[band_id].append(musician_id)
+
+        for result in results:
+            result["genres"] = genres[result["id"]]
+            result["members"] = members[result["id"]]
+
+
+class MusicianApiView(JsonListMixin, MusicianListView):
+    api_fields = {
+        "id": "id",
+        "username": "username",
+        "first_name": "first_name",
+        "last_name": "last_name",
+        "instrument": "instrument__name",
+    }
+    api_depends_on = (Musician, Instrument)
+
+
+class GenreApiView(JsonListMixin, GenreListView):
+    api_depends_on = (Genre,)
+
+
+class CountryApiView(JsonListMixin, CountryListView):
+    api_depends_on = (Country,)
+
+
+class InstrumentApiView(JsonListMixin, InstrumentListView):
+    api_depends_on = (Instrument,)
+
+
+class BandMembershipApiView(LoginRequiredMixin, generic.View):
+    """
+    Add and remove genres and members of many bands in one request:
+
+        {"changes": [{"band": 1, "members": {"add": [2], "remove": [3]},
+                      "genres": {"add": [4]}}]}
+
+    Unlike BandUpdateView, which diffs the full sets of one band, only the
+    deltas are written, in set-based statements for the whole batch.
+    """
+
+    def post(self, request, *args, **kwargs):
+        try:
+            payload = json.loads(request.body)
+            if not isinstance(payload, dict):
+                raise ValueError("Expected a JSON object.")
+            summary = apply_membership_changes(payload.get("changes"))
+        except ValueError as error:
+            return JsonResponse({"error": str(error)}, status=400)
+
+        return JsonResponse(summary)
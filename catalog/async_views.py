@@ -0,0 +1,132 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.paginator import InvalidPage
+from django.http import Http404
+from django.views import generic
+
+from catalog.counters import aget_catalog_counters
+from catalog.detail_cache import AsyncCachedDetailMixin
+from catalog.pagination import CursorPaginator, InvalidCursor
+from catalog.views import (
+    Index,
+    BandListView,
+    BandDetailView,
+    MusicianListView,
+)
+
+
+class AsyncLoginRequiredMixin(LoginRequiredMixin):
+    """LoginRequiredMixin for views whose handlers are coroutines."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        # The session and the user are loaded lazily by sync code.
+        is_authenticated = await sync_to_async(
+            lambda: request.user.is_authenticated
+        )()
+        if not is_authenticated:
+            return self.handle_no_permission()
+
+        return await generic.View.dispatch(self, request, *args, **kwargs)
+
+
+class AsyncListMixin:
+    """
+    Serve a catalog ListView from a coroutine: the page is read with the
+    async ORM before rendering, so the template never queries. Reuses
+    the view's queryset, paginate_by and context.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        page_size = self.get_paginate_by(self.object_list)
+
+        if settings.CATALOG_CURSOR_PAGINATION:
+            self.page_result = await self.apaginate_by_cursor(
+                self.object_list, page_size
+            )
+        else:
+            self.page_result = await self.apaginate_by_offset(
+                self.object_list, page_size
+            )
+
+        context = await self.aget_context_data()
+        return self.render_to_response(context)
+
+    async def aget_context_data(self):
+        return self.get_context_data()
+
+    async def apaginate_by_cursor(self, queryset, page_size):
+        paginator = CursorPaginator(queryset, page_size)
+
+        try:
+            page = await paginator.apage(
+                self.request.GET.get(self.cursor_kwarg)
+            )
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    async def apaginate_by_offset(self, queryset, page_size):
+        paginator = self.get_paginator(
+            queryset,
+            page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        paginator.count = await queryset.acount()
+
+        page_number = (
+            self.kwargs.get(self.page_kwarg)
+            or self.request.GET.get(self.page_kwarg)
+            or 1
+        )
+        if page_number == "last":
+            page_number = paginator.num_pages
+
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage as error:
+            raise Http404(f"Invalid page ({page_number}): {error}")
+
+        page.object_list = [obj async for obj in page.object_list]
+
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def paginate_queryset(self, queryset, page_size):
+        return self.page_result
+
+
+class AsyncIndex(AsyncLoginRequiredMixin, Index):
+    async def get(self, request, *args, **kwargs):
+        return self.render_to_response(await aget_catalog_counters())
+
+
+class AsyncBandListView(
+    AsyncLoginRequiredMixin, AsyncListMixin, BandListView
+):
+    async def get(self, request, *args, **kwargs):
+        self.band_count, self.facets = await sync_to_async(
+            self.get_facets
+        )()
+
+        return await super().get(request, *args, **kwargs)
+
+    async def aget_context_data(self):
+        # Bands whose rows are not cached get their genres prefetched.
+        return await sync_to_async(self.get_context_data)()
+
+
+class AsyncMusicianListView(
+    AsyncLoginRequiredMixin, AsyncListMixin, MusicianListView
+):
+    pass
+
+
+class AsyncBandDetailView(
+    AsyncLoginRequiredMixin,
+    AsyncCachedDetailMixin,
+    BandDetailView
+):
+    pass
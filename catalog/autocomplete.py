@@ -0,0 +1,186 @@
+import threading
+import uuid
+from bisect import bisect_left, insort
+
+from django.core.cache import cache
+from django.db import transaction
+
+from catalog.models import Band, Genre, Musician
+
+AUTOCOMPLETE_GENERATION_PREFIX = "catalog:autocomplete_generation"
+AUTOCOMPLETE_LIMIT = 10
+
+
+def normalize(text):
+    return " ".join(text.split()).casefold()
+
+
+class PrefixIndex:
+    """
+    In-process sorted list of (key, label, pk) answering prefix queries
+    with a binary search.
+
+    The index is built on first use from values_list() and updated in
+    place by signals. Every update also replaces a generation stamp in
+    the shared cache, so other processes notice the change and rebuild
+    lazily on their next query. An update is applied in place only if
+    the shared stamp is still the one this index was built for;
+    otherwise another process changed the model and the index is left
+    to rebuild.
+    """
+
+    def __init__(self, name, model, fields):
+        self.name = name
+        self.model = model
+        self.fields = fields
+        self.lock = threading.RLock()
+        self.entries = []
+        self.keys_by_pk = {}
+        self.generation = None
+
+    @property
+    def generation_key(self):
+        return f"{AUTOCOMPLETE_GENERATION_PREFIX}:{self.name}"
+
+    def get_label(self, values):
+        return values[self.fields[0]]
+
+    def get_keys(self, values):
+        return {normalize(values[field]) for field in self.fields} - {""}
+
+    def rebuild(self, generation):
+        entries = []
+        keys_by_pk = {}
+
+        rows = self.model.objects.values("pk", *self.fields).iterator()
+
+        for values in rows:
+            label = self.get_label(values)
+            keys = [
+                (key, label, values["pk"]) for key in self.get_keys(values)
+            ]
+            keys_by_pk[values["pk"]] = keys
+            entries.extend(keys)
+
+        entries.sort()
+
+        with self.lock:
+            self.entries = entries
+            self.keys_by_pk = keys_by_pk
+            self.generation = generation
+
+    def ensure_fresh(self):
+        generation = cache.get(self.generation_key)
+
+        if generation is None:
+            generation = uuid.uuid4().hex
+            if not cache.add(self.generation_key, generation, None):
+                generation = cache.get(self.generation_key, generation)
+
+        if generation != self.generation:
+            self.rebuild(generation)
+
+    def set_generation(self):
+        generation = uuid.uuid4().hex
+        cache.set(self.generation_key, generation, None)
+        return generation
+
+    def bump_generation(self):
+        """
+        Store and return a new shared generation. Inside a transaction,
+        store another one on commit too, so processes that rebuilt
+        before the commit, without the change, rebuild again.
+        """
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(self.set_generation)
+        return self.set_generation()
+
+    def is_current(self):
+        return self.generation is not None and (
+            cache.get(self.generation_key) == self.generation
+        )
+
+    def search(self, prefix, limit=AUTOCOMPLETE_LIMIT):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        self.ensure_fresh()
+
+        results = {}
+        with self.lock:
+            position = bisect_left(self.entries, (prefix,))
+            for key, label, pk in self.entries[position:]:
+                if len(results) >= limit or not key.startswith(prefix):
+                    break
+                results.setdefault(pk, label)
+
+        return [{"id": pk, "name": label} for pk, label in results.items()]
+
+    def discard(self, pk):
+        for entry in self.keys_by_pk.pop(pk, ()):
+            position = bisect_left(self.entries, entry)
+            if (
+                position < len(self.entries)
+                and self.entries[position] == entry
+            ):
+                del self.entries[position]
+
+    def update(self, instance):
+        values = {field: getattr(instance, field) for field in self.fields}
+        values["pk"] = instance.pk
+
+        with self.lock:
+            current = self.is_current()
+            generation = self.bump_generation()
+            if not current:
+                return
+
+            self.discard(values["pk"])
+            label = self.get_label(values)
+            keys = [
+                (key, label, values["pk"]) for key in self.get_keys(values)
+            ]
+            for entry in keys:
+                insort(self.entries, entry)
+            self.keys_by_pk[values["pk"]] = keys
+            self.generation = generation
+
+    def remove(self, pk):
+        with self.lock:
+            current = self.is_current()
+            generation = self.bump_generation()
+            if current:
+                self.discard(pk)
+                self.generation = generation
+
+
+class MusicianPrefixIndex(PrefixIndex):
+    """Match musicians by first name, last name, full name or username."""
+
+    def get_label(self, values):
+        full_name = f"{values['first_name']} {values['last_name']}".strip()
+        return full_name or values["username"]
+
+    def get_keys(self, values):
+        full_name = normalize(
+            f"{values['first_name']} {values['last_name']}"
+        )
+        return super().get_keys(values) | ({full_name} - {""})
+
+
+AUTOCOMPLETE_INDEXES = {
+    "bands": PrefixIndex("bands", Band, ("name",)),
+    "musicians": MusicianPrefixIndex(
+        "musicians", Musician, ("first_name", "last_name", "username")
+    ),
+    "genres": PrefixIndex("genres", Genre, ("name",)),
+}
+
+
+def autocomplete(prefix, limit=AUTOCOMPLETE_LIMIT, kinds=None):
+    return {
+        kind: index.search(prefix, limit)
+        for kind, index in AUTOCOMPLETE_INDEXES.items()
+        if kinds is None or kind in kinds
+    }
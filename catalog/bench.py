@@ -0,0 +1,378 @@
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import re
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.utils import timezone
+
+from catalog.models import Band, Country, Genre, Instrument, Musician
+from catalog.relation_counts import repair_relation_counts
+from catalog.search import get_search_backend
+
+BATCH_SIZE = 5000
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+SERVER_TIMING_DB = re.compile(r"db;dur=([\d.]+)")
+CATALOG_SIZES = ("bands", "musicians", "genres", "countries", "instruments")
+
+
+def generate_catalog(
+    bands,
+    musicians,
+    genres=300,
+    countries=200,
+    instruments=60,
+    genres_per_band=(1, 4),
+    members_per_band=(2, 6),
+    seed=0,
+):
+    """
+    Fill the database with a synthetic catalog using bulk inserts.
+    Fan-out ranges are inclusive (min, max) per band.
+    """
+    rng = random.Random(seed)
+
+    with transaction.atomic():
+        Genre.objects.bulk_create(
+            [Genre(name=f"Genre {index}") for index in range(genres)],
+            batch_size=BATCH_SIZE,
+        )
+        Country.objects.bulk_create(
+            [Country(name=f"Country {index}") for index in range(countries)],
+            batch_size=BATCH_SIZE,
+        )
+        Instrument.objects.bulk_create(
+            [
+                Instrument(name=f"Instrument {index}")
+                for index in range(instruments)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+        genre_ids = list(Genre.objects.values_list("pk", flat=True))
+        country_ids = list(Country.objects.values_list("pk", flat=True))
+        instrument_ids = list(
+            Instrument.objects.values_list("pk", flat=True)
+        )
+        password = make_password(None)
+
+        for start in range(0, musicians, BATCH_SIZE):
+            Musician.objects.bulk_create([
+                Musician(
+                    username=f"musician_{index}",
+                    first_name=f"First{index}",
+                    last_name=f"Last{rng.randrange(musicians)}",
+                    password=password,
+                    instrument_id=rng.choice(instrument_ids),
+                )
+                for index in range(start, min(start + BATCH_SIZE, musicians))
+            ])
+
+        musician_ids = list(Musician.objects.values_list("pk", flat=True))
+
+        for start in range(0, bands, BATCH_SIZE):
+            created = Band.objects.bulk_create([
+                Band(
+                    name=f"Band {index}",
+                    description=f"Synthetic band number {index}",
+                    country_id=rng.choice(country_ids),
+                )
+                for index in range(start, min(start + BATCH_SIZE, bands))
+            ])
+
+            Band.genres.through.objects.bulk_create([
+                Band.genres.through(band_id=band.pk, genre_id=genre_id)
+                for band in created
+                for genre_id in rng.sample(
+                    genre_ids,
+                    min(rng.randint(*genres_per_band), len(genre_ids))
+                )
+            ])
+            Band.members.through.objects.bulk_create([
+                Band.members.through(band_id=band.pk, musician_id=member_id)
+                for band in created
+                for member_id in rng.sample(
+                    musician_ids,
+                    min(rng.randint(*members_per_band), len(musician_ids))
+                )
+            ])
+
+        repair_relation_counts()
+        get_search_backend().rebuild()
+
+    cache.clear()
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def time_request(client, method, path, data=None):
+    """
+    Issue one request and return (seconds, queries, db_ms), reading the
+    query numbers from the TimingMiddleware Server-Timing header.
+    """
+    start = time.perf_counter()
+    response = getattr(client, method)(path, data)
+    if hasattr(response, "streaming_content"):
+        for _ in response.streaming_content:
+            pass
+    duration = time.perf_counter() - start
+
+    if response.status_code >= 400:
+        raise RuntimeError(
+            f"{method.upper()} {path} returned {response.status_code}"
+        )
+
+    timing = response.get("Server-Timing", "")
+    queries = SERVER_TIMING_QUERIES.search(timing)
+    db_ms = SERVER_TIMING_DB.search(timing)
+
+    return (
+        duration,
+        int(queries.group(1)) if queries else None,
+        float(db_ms.group(1)) if db_ms else None,
+    )
+
+
+def summarize(name, method, path, samples):
+    durations = [sample[0] * 1000 for sample in samples]
+    queries = [sample[1] for sample in samples if sample[1] is not None]
+    db_times = [sample[2] for sample in samples if sample[2] is not None]
+
+    return {
+        "name": name,
+        "method": method.upper(),
+        "path": path,
+        "samples": len(samples),
+        "p50_ms": round(percentile(durations, 50), 2),
+        "p95_ms": round(percentile(durations, 95), 2),
+        "p99_ms": round(percentile(durations, 99), 2),
+        "queries": percentile(queries, 50) if queries else None,
+        "db_p50_ms": round(percentile(db_times, 50), 2) if db_times else None,
+    }
+
+
+def add_catalog_arguments(parser, bands=1000, musicians=5000):
+    parser.add_argument("--bands", type=int, default=bands)
+    parser.add_argument("--musicians", type=int, default=musicians)
+    parser.add_argument("--genres", type=int, default=300)
+    parser.add_argument("--countries", type=int, default=200)
+    parser.add_argument("--instruments", type=int, default=60)
+    parser.add_argument(
+        "--only",
+        help="Time only scenarios whose name contains this text.",
+    )
+    parser.add_argument(
+        "--output",
+        help="Write the results as JSON to this file ('-' for stdout).",
+    )
+    parser.add_argument(
+        "--keepdb",
+        action="store_true",
+        help="Keep the benchmark database (and its catalog) between runs.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def use_file_test_database(name):
+    """
+    Put the SQLite test database in a temporary file: an in-memory one
+    ignores connection closes and cannot use WAL.
+    """
+    test_settings = connection.settings_dict.setdefault("TEST", {})
+    if connection.vendor == "sqlite" and not test_settings.get("NAME"):
+        test_settings["NAME"] = os.path.join(tempfile.gettempdir(), name)
+
+
+@contextmanager
+def benchmark_database(options, stderr):
+    """
+    Create a throwaway test database filled with the synthetic catalog
+    sized by the add_catalog_arguments() options, and destroy it on exit.
+    """
+    creation = connection.creation
+    old_name = connection.settings_dict["NAME"]
+    creation.create_test_db(
+        verbosity=0,
+        autoclobber=True,
+        serialize=False,
+        keepdb=options["keepdb"],
+    )
+
+    try:
+        if options["keepdb"] and Band.objects.exists():
+            stderr.write("Reusing the existing benchmark catalog.")
+        else:
+            stderr.write("Generating the benchmark catalog...")
+            generate_catalog(
+                seed=options["seed"],
+                **{size: options[size] for size in CATALOG_SIZES},
+            )
+        yield
+    finally:
+        creation.destroy_test_db(
+            old_name, verbosity=0, keepdb=options["keepdb"]
+        )
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(options, results, stdout, **extra):
+    report = {
+        "revision": git_revision(),
+        "created_at": timezone.now().isoformat(),
+        "python": platform.python_version(),
+        "database": connection.vendor,
+        "catalog": {size: options[size] for size in CATALOG_SIZES},
+        **extra,
+        "results": results,
+    }
+
+    if options["output"] == "-":
+        stdout.write(json.dumps(report, indent=2))
+    elif options["output"]:
+        with open(options["output"], "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+
+async def asgi_get(application, path, cookie, client_delay):
+    """
+    Send one GET request straight to an ASGI application, as a client
+    that takes client_delay seconds to upload the request and again to
+    download the response. Return (seconds, status).
+    """
+    path, _, query_string = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query_string.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), (b"cookie", cookie.encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    request_sent = False
+    status = None
+
+    async def receive():
+        nonlocal request_sent
+        if request_sent:
+            # The client stays connected until the response is sent.
+            await asyncio.Future()
+
+        request_sent = True
+        await asyncio.sleep(client_delay)
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif not message.get("more_body"):
+            await asyncio.sleep(client_delay)
+
+    start = time.perf_counter()
+    await application(scope, receive, send)
+
+    return time.perf_counter() - start, status
+
+
+async def run_clients(application, paths, cookie, clients, client_delay):
+    """
+    Request every path in paths from clients concurrent clients and
+    return (wall seconds, [request seconds]).
+    """
+    queue = asyncio.Queue()
+    for path in paths:
+        queue.put_nowait(path)
+    durations = []
+
+    async def client():
+        while not queue.empty():
+            path = queue.get_nowait()
+            duration, status = await asgi_get(
+                application, path, cookie, client_delay
+            )
+            if status >= 400:
+                raise RuntimeError(f"GET {path} returned {status}")
+            durations.append(duration)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+
+    return time.perf_counter() - start, durations
+
+
+def wsgi_get(handler, path, cookie):
+    """
+    Send one GET request straight to a WSGI handler, which, unlike the
+    test client, closes expired connections at the end of the request.
+    Return (seconds, status).
+    """
+    path, _, query_string = path.partition("?")
+    environ = RequestFactory()._base_environ(
+        PATH_INFO=path,
+        QUERY_STRING=query_string,
+        REQUEST_METHOD="GET",
+        HTTP_COOKIE=cookie,
+    )
+
+    start = time.perf_counter()
+    response = handler(environ, lambda status, headers: None)
+    try:
+        for _ in response:
+            pass
+    finally:
+        response.close()
+
+    return time.perf_counter() - start, response.status_code
+
+
+def run_threads(handler, paths, cookie, threads):
+    """
+    Request every path in paths from threads worker threads and return
+    (wall seconds, [request seconds]).
+    """
+    def request(path):
+        duration, status = wsgi_get(handler, path, cookie)
+        if status >= 400:
+            raise RuntimeError(f"GET {path} returned {status}")
+        return duration
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        durations = list(executor.map(request, paths))
+
+    return time.perf_counter() - start, durations
@@ -0,0 +1,71 @@
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.utils import timezone
+
+CHANGES_CACHE_PREFIX = "catalog:changed"
+CHANGES_CACHE_TIMEOUT = None
+
+# Cache backends whose entries are only seen by the process that set them.
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+PROCESS_LOCAL_CACHE_WARNING = (
+    "The default cache is local to this process, so the web server will "
+    "not see the cache invalidations and change times recorded here and "
+    "may serve stale pages until it restarts. Set CACHE_BACKEND to a "
+    "cache shared by all processes."
+)
+
+
+def changed_cache_key(model):
+    return f"{CHANGES_CACHE_PREFIX}:{model._meta.label_lower}"
+
+
+def record_changes(models):
+    now = timezone.now()
+    cache.set_many(
+        {changed_cache_key(model): now for model in models},
+        CHANGES_CACHE_TIMEOUT
+    )
+
+
+def touch(*models):
+    """
+    Record that rows of the given models changed just now, and again
+    once the current transaction commits: a read in between still sees
+    the old rows, and would cache them under the new change time.
+    """
+    record_changes(models)
+    transaction.on_commit(lambda: record_changes(models))
+
+
+def last_changed(models):
+    """
+    Return the latest change time of the given models. Models without
+    a recorded change (e.g. after a cache restart) count as changed now.
+    """
+    keys = [changed_cache_key(model) for model in models]
+    changes = cache.get_many(keys)
+
+    now = timezone.now()
+    missing = {key: now for key in keys if key not in changes}
+    if missing:
+        cache.set_many(missing, CHANGES_CACHE_TIMEOUT)
+        changes.update(missing)
+
+    return max(changes.values())
+
+
+def uses_process_local_cache():
+    return isinstance(caches["default"], PROCESS_LOCAL_CACHES)
+
+
+def invalidate_keys(keys):
+    """
+    Delete cache keys now and again once the current transaction commits.
+    A read in between still sees the old rows and may cache them again,
+    under a fresh version stamp that would otherwise outlive the commit.
+    """
+    keys = list(keys)
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,127 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection
+
+from catalog.changes import invalidate_keys
+from catalog.models import (
+    Band,
+    Musician,
+    Genre,
+    Instrument
+)
+
+COUNTERS_CACHE_PREFIX = "catalog:counter"
+COUNTERS_CACHE_TIMEOUT = 60 * 60
+
+# Backends that serialize connections anyway; always count in one statement.
+SINGLE_STATEMENT_VENDORS = {"sqlite"}
+
+COUNTED_MODELS = {
+    "num_bands": Band,
+    "num_musicians": Musician,
+    "num_genres": Genre,
+    "num_instruments": Instrument,
+}
+
+
+def counter_cache_key(model):
+    return f"{COUNTERS_CACHE_PREFIX}:{model._meta.label_lower}"
+
+
+def count_rows(models):
+    """Count rows of several models with a single database round-trip."""
+    quote_name = connection.ops.quote_name
+    columns = ", ".join(
+        f"(SELECT COUNT(*) FROM {quote_name(model._meta.db_table)})"
+        for model in models
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {columns}")
+        return list(cursor.fetchone())
+
+
+def count_model(model):
+    try:
+        return model.objects.count()
+    finally:
+        # Runs in an executor thread; release its connection unless
+        # CONN_MAX_AGE keeps it open.
+        close_old_connections()
+
+
+async def acount_rows(models):
+    """
+    Count rows of several models. With CATALOG_CONCURRENT_COUNTS the
+    counts run at the same time, each in its own thread and connection,
+    so they take as long as the slowest one; otherwise they are issued
+    as the single statement of count_rows().
+    """
+    if (
+        settings.CATALOG_CONCURRENT_COUNTS
+        and connection.vendor not in SINGLE_STATEMENT_VENDORS
+    ):
+        return list(await asyncio.gather(*(
+            sync_to_async(count_model, thread_sensitive=False)(model)
+            for model in models
+        )))
+
+    return await sync_to_async(count_rows)(models)
+
+
+def counter_cache_keys():
+    return {
+        name: counter_cache_key(model)
+        for name, model in COUNTED_MODELS.items()
+    }
+
+
+def cached_counters(keys, cached):
+    return {
+        name: cached[key]
+        for name, key in keys.items()
+        if key in cached
+    }
+
+
+def get_catalog_counters():
+    keys = counter_cache_keys()
+    counters = cached_counters(keys, cache.get_many(keys.values()))
+    missing = [name for name in COUNTED_MODELS if name not in counters]
+
+    if missing:
+        values = count_rows([COUNTED_MODELS[name] for name in missing])
+        fresh = dict(zip(missing, values))
+        cache.set_many(
+            {keys[name]: value for name, value in fresh.items()},
+            COUNTERS_CACHE_TIMEOUT
+        )
+        counters.update(fresh)
+
+    return counters
+
+
+async def aget_catalog_counters():
+    keys = counter_cache_keys()
+    counters = cached_counters(keys, await cache.aget_many(keys.values()))
+    missing = [name for name in COUNTED_MODELS if name not in counters]
+
+    if missing:
+        values = await acount_rows(
+            [COUNTED_MODELS[name] for name in missing]
+        )
+        fresh = dict(zip(missing, values))
+        await cache.aset_many(
+            {keys[name]: value for name, value in fresh.items()},
+            COUNTERS_CACHE_TIMEOUT
+        )
+        counters.update(fresh)
+
+    return counters
+
+
+def invalidate_counter(model):
+    invalidate_keys([counter_cache_key(model)])
@@ -0,0 +1,159 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+
+from catalog.autocomplete import AUTOCOMPLETE_INDEXES
+from catalog.changes import touch
+from catalog.counters import invalidate_counter
+from catalog.detail_cache import invalidate_detail_pages
+from catalog.fragments import invalidate_band_rows
+from catalog.models import Band, Country, Genre, Instrument, Musician
+from catalog.relation_counts import relation_count, update_relation_counts
+from catalog.search import get_search_backend
+
+# Rows deleted along with an object, as (label, model, lookup from that
+# model to the object).
+DELETE_IMPACT = {
+    Country: (
+        ("bands", Band, "country"),
+        ("band memberships", Band.members.through, "band__country"),
+        ("band genre links", Band.genres.through, "band__country"),
+    ),
+    Genre: (
+        ("band genre links", Band.genres.through, "genre"),
+    ),
+    Instrument: (
+        ("musicians", Musician, "instrument"),
+        ("band memberships", Band.members.through, "musician__instrument"),
+    ),
+}
+
+
+def delete_impact(instance):
+    """
+    Count the rows deleted along with instance, per DELETE_IMPACT label,
+    in one query of COUNT subqueries rather than by collecting them.
+    """
+    model = type(instance)
+    impact = DELETE_IMPACT[model]
+
+    counts = model.objects.filter(pk=instance.pk).values_list(*(
+        relation_count(source, lookup) for _, source, lookup in impact
+    )).get()
+
+    return [(label, count) for (label, _, _), count in zip(impact, counts)]
+
+
+def delete_bands(pks):
+    """
+    Delete bands without loading them or sending per-object signals: the
+    relation rows and bands go in three DELETE statements, and counters,
+    caches and the search index are updated once for the whole batch.
+    """
+    pks = list(pks)
+    genre_ids = set(Band.genres.through.objects.filter(
+        band__in=pks
+    ).values_list("genre_id", flat=True))
+    member_ids = set(Band.members.through.objects.filter(
+        band__in=pks
+    ).values_list("musician_id", flat=True))
+    country_ids = set(Band.objects.filter(
+        pk__in=pks
+    ).values_list("country_id", flat=True))
+
+    # Through models have no delete signals, so these don't collect rows.
+    Band.genres.through.objects.filter(band__in=pks).delete()
+    Band.members.through.objects.filter(band__in=pks).delete()
+
+    quote_name = connection.ops.quote_name
+    placeholders = ", ".join(["%s"] * len(pks))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote_name(Band._meta.db_table)} "
+            f"WHERE {quote_name(Band._meta.pk.column)} IN ({placeholders})",
+            pks
+        )
+
+    update_relation_counts(Genre, genre_ids)
+    update_relation_counts(Musician, member_ids)
+    update_relation_counts(Country, country_ids)
+    get_search_backend().remove(Band, pks)
+    invalidate_band_rows(pks)
+    invalidate_detail_pages({Band: pks, Musician: member_ids})
+    invalidate_counter(Band)
+    touch(Band)
+    AUTOCOMPLETE_INDEXES["bands"].bump_generation()
+
+
+def delete_musicians(pks):
+    Musician.objects.filter(pk__in=pks).delete()
+
+
+def remove_genre(genre):
+    def remove(pks):
+        # One m2m_changed for the batch keeps band counters and caches.
+        genre.bands.remove(*pks)
+
+    return remove
+
+
+def get_batches(instance):
+    """
+    Return the queryset of dependents of instance to delete batch by
+    batch, and the function deleting one batch of them by pk.
+    """
+    if isinstance(instance, Country):
+        return Band.objects.filter(country=instance), delete_bands
+    if isinstance(instance, Instrument):
+        return Musician.objects.filter(instrument=instance), delete_musicians
+    if isinstance(instance, Genre):
+        return Band.objects.filter(genres=instance), remove_genre(instance)
+
+    raise ValueError(f"No batched delete for {type(instance).__name__}.")
+
+
+def lock_for_write(instance):
+    """
+    Make a no-op write to instance the first statement of a transaction.
+    SQLite starts transactions deferred and cannot turn one that has read
+    into a writer while another connection writes, whatever the busy
+    timeout; a transaction that writes first waits for the lock instead.
+    """
+    pk_name = instance._meta.pk.name
+    type(instance).objects.filter(pk=instance.pk).update(
+        **{pk_name: F(pk_name)}
+    )
+
+
+def delete_in_batches(instance, batch_size=None, progress=None):
+    """
+    Delete instance and everything it cascades to. Dependents go first,
+    batch_size at a time, each batch in its own transaction, so neither
+    memory nor lock time grows with the size of the cascade. progress,
+    if given, is called with the dependents done and their total.
+    """
+    batch_size = batch_size or settings.CATALOG_DELETE_BATCH_SIZE
+    dependents, delete_batch = get_batches(instance)
+    total = dependents.count() if progress else None
+    deleted = 0
+
+    while True:
+        with transaction.atomic():
+            lock_for_write(instance)
+            pks = list(dependents.order_by("pk").values_list(
+                "pk", flat=True
+            )[:batch_size])
+            if not pks:
+                break
+
+            delete_batch(pks)
+            deleted += len(pks)
+
+        if progress:
+            progress(deleted, total)
+
+    with transaction.atomic():
+        lock_for_write(instance)
+        instance.delete()
+
+    return deleted
@@ -0,0 +1,231 @@
+import uuid
+from collections import defaultdict, namedtuple
+
+from django.core.cache import cache
+from django.db.models import ManyToManyField
+from django.utils.functional import SimpleLazyObject
+from django.views.generic.base import ContextMixin
+
+from catalog.changes import invalidate_keys
+from catalog.models import Band, Musician
+
+DETAIL_VERSION_PREFIX = "catalog:detail_version"
+DETAIL_PAGE_TIMEOUT = 60 * 60 * 24
+
+# Relations rendered by each cached detail page, as ORM lookup paths from
+# the page's model. Every prefix of a path is a dependency too.
+DETAIL_DEPENDENCIES = {
+    Band: ("country", "genres", "members__instrument"),
+    Musician: ("instrument", "bands__country"),
+}
+
+Dependency = namedtuple(
+    "Dependency", ("root", "lookup", "source", "model", "m2m_field")
+)
+
+
+def resolve_dependencies(dependencies):
+    """
+    Expand lookup paths into one Dependency per path prefix, resolved
+    through the models' relation fields. source is the model the last
+    relation starts from, model the one it points to, and m2m_field the
+    ManyToManyField behind the last relation, if any.
+    """
+    resolved = []
+
+    for root, paths in dependencies.items():
+        lookups = set()
+        for path in paths:
+            names = path.split("__")
+            for end in range(1, len(names) + 1):
+                lookups.add("__".join(names[:end]))
+
+        for lookup in sorted(lookups):
+            model = root
+            for name in lookup.split("__"):
+                source = model
+                field = model._meta.get_field(name)
+                model = field.related_model
+
+            m2m_field = None
+            if isinstance(field, ManyToManyField):
+                m2m_field = field
+            elif field.many_to_many:
+                m2m_field = field.field
+
+            resolved.append(
+                Dependency(root, lookup, source, model, m2m_field)
+            )
+
+    return resolved
+
+
+DEPENDENCY_GRAPH = resolve_dependencies(DETAIL_DEPENDENCIES)
+DEPENDENCY_MODELS = set(DETAIL_DEPENDENCIES) | {
+    dependency.model for dependency in DEPENDENCY_GRAPH
+}
+DEPENDENCY_M2M_FIELDS = {
+    dependency.m2m_field
+    for dependency in DEPENDENCY_GRAPH
+    if dependency.m2m_field
+}
+
+
+def detail_version_key(model, pk):
+    return f"{DETAIL_VERSION_PREFIX}:{model._meta.label_lower}:{pk}"
+
+
+def get_detail_version(model, pk):
+    key = detail_version_key(model, pk)
+    version = cache.get(key)
+
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, DETAIL_PAGE_TIMEOUT):
+            version = cache.get(key, version)
+
+    return version
+
+
+async def aget_detail_version(model, pk):
+    key = detail_version_key(model, pk)
+    version = await cache.aget(key)
+
+    if version is None:
+        version = uuid.uuid4().hex
+        if not await cache.aadd(key, version, DETAIL_PAGE_TIMEOUT):
+            version = await cache.aget(key, version)
+
+    return version
+
+
+def reaching(dependency, pks):
+    """Return pks of dependency.root objects that reach pks of source."""
+    prefix = dependency.lookup.rpartition("__")[0]
+    if not prefix:
+        return set(pks)
+
+    return set(dependency.root.objects.filter(
+        **{f"{prefix}__in": pks}
+    ).values_list("pk", flat=True))
+
+
+def invalidate_detail_pages(pages):
+    invalidate_keys([
+        detail_version_key(model, pk)
+        for model, pks in pages.items()
+        for pk in pks
+    ])
+
+
+def invalidate_dependent_pages(instance):
+    """Invalidate the detail pages that render instance."""
+    model = type(instance)
+    pages = defaultdict(set)
+
+    if model in DETAIL_DEPENDENCIES:
+        pages[model].add(instance.pk)
+
+    for dependency in DEPENDENCY_GRAPH:
+        if dependency.model is model:
+            pages[dependency.root] |= set(dependency.root.objects.filter(
+                **{f"{dependency.lookup}__in": [instance.pk]}
+            ).values_list("pk", flat=True))
+
+    invalidate_detail_pages(pages)
+
+
+def invalidate_m2m_pages(m2m_field, instance, pk_set):
+    """
+    Invalidate the detail pages that render the m2m_field relation
+    between instance and the objects in pk_set, or all the objects
+    related to instance when pk_set is None (before a clear()).
+    """
+    if pk_set is None:
+        through = m2m_field.remote_field.through
+        source = m2m_field.m2m_field_name()
+        target = m2m_field.m2m_reverse_field_name()
+        if type(instance) is not m2m_field.model:
+            source, target = target, source
+
+        pk_set = set(through.objects.filter(
+            **{source: instance.pk}
+        ).values_list(target, flat=True))
+
+    if type(instance) is m2m_field.model:
+        invalidate_link_pages(m2m_field, {instance.pk}, pk_set)
+    else:
+        invalidate_link_pages(m2m_field, pk_set, {instance.pk})
+
+
+def invalidate_link_pages(m2m_field, pks, related_pks):
+    """
+    Invalidate the detail pages that render m2m_field links between the
+    m2m_field.model rows in pks and the related rows in related_pks.
+    """
+    pages = defaultdict(set)
+
+    for dependency in DEPENDENCY_GRAPH:
+        if dependency.m2m_field is not m2m_field:
+            continue
+
+        if dependency.source is m2m_field.model:
+            source_pks = pks
+        else:
+            source_pks = related_pks
+
+        pages[dependency.root] |= reaching(dependency, source_pks)
+
+    invalidate_detail_pages(pages)
+
+
+class CachedDetailMixin:
+    """
+    Serve a DetailView whose template caches the parts showing the object
+    in {% cache detail_timeout <name> detail_pk detail_version %}
+    fragments. detail_version is a stamp that signals replace when the
+    object or anything in DETAIL_DEPENDENCIES changes. The object is
+    only fetched to render a missing fragment; the rest of the page,
+    e.g. the navigation bar naming the user, is rendered every time.
+    """
+
+    def get(self, request, *args, **kwargs):
+        pk = kwargs[self.pk_url_kwarg]
+        return self.render_detail(pk, get_detail_version(self.model, pk))
+
+    def render_detail(self, pk, version):
+        self.object = SimpleLazyObject(self.get_object)
+        # SingleObjectMixin.get_context_data() would fetch the object.
+        context = ContextMixin.get_context_data(
+            self,
+            object=self.object,
+            detail_pk=pk,
+            detail_version=version,
+            detail_timeout=DETAIL_PAGE_TIMEOUT,
+            **{self.model._meta.model_name: self.object},
+        )
+        return self.render_to_response(context)
+
+    def get_template_names(self):
+        # The default looks at the class of the object, fetching it.
+        if self.template_name:
+            return [self.template_name]
+
+        opts = self.model._meta
+        return [
+            f"{opts.app_label}/{opts.model_name}"
+            f"{self.template_name_suffix}.html"
+        ]
+
+
+class AsyncCachedDetailMixin(CachedDetailMixin):
+    """
+    CachedDetailMixin for async detail views. The handler renders the
+    response, fetching the object if needed, in a sync thread.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        pk = kwargs[self.pk_url_kwarg]
+        return self.render_detail(
+            pk, await aget_detail_version(self.model, pk)
+        )
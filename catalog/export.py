@@ -0,0 +1,60 @@
+import csv
+import json
+
+from django.db.models import Prefetch
+
+from catalog.models import Band, Genre, Musician
+
+EXPORT_CHUNK_SIZE = 2000
+# Separates genres and members in CSV cells, as read by import_catalog.
+LIST_SEPARATOR = ";"
+BAND_EXPORT_FIELDS = ("name", "description", "country", "genres", "members")
+
+
+class Echo:
+    """File-like object that hands written rows back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def export_bands_queryset():
+    return Band.objects.select_related(
+        "country"
+    ).prefetch_related(
+        Prefetch("genres", queryset=Genre.objects.only("name")),
+        Prefetch("members", queryset=Musician.objects.only("username")),
+    ).only(
+        "name", "description", "country__name"
+    ).order_by("pk")
+
+
+def band_records(queryset):
+    """
+    Yield bands as import_catalog compatible records, fetching rows and
+    their genres/members in chunks so memory does not grow with the
+    table size.
+    """
+    for band in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield {
+            "name": band.name,
+            "description": band.description,
+            "country": band.country.name,
+            "genres": [genre.name for genre in band.genres.all()],
+            "members": [member.username for member in band.members.all()],
+        }
+
+
+def stream_csv(records):
+    writer = csv.DictWriter(Echo(), fieldnames=BAND_EXPORT_FIELDS)
+    yield writer.writeheader()
+
+    for record in records:
+        record["genres"] = LIST_SEPARATOR.join(record["genres"])
+        record["members"] = LIST_SEPARATOR.join(record["members"])
+        yield writer.writerow(record)
+
+
+def stream_ndjson(records):
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + "\n"
@@ -0,0 +1,248 @@
+import hashlib
+import json
+from abc import ABC, abstractmethod
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Exists, OuterRef, Q
+
+from catalog.changes import last_changed
+from catalog.models import Band, Country, Genre, Instrument, Musician
+from catalog.search import search
+from catalog.validators import run_db_validators
+
+FACETS_CACHE_PREFIX = "catalog:facets"
+FACETS_CACHE_TIMEOUT = 60 * 60
+FACET_OPTION_LIMIT = 12
+
+
+class BandFacet(ABC):
+    """
+    A band attribute to filter by. Bands match when they have any of the
+    selected values; the bands of every value are counted in one query.
+    """
+
+    model = None
+    label = ""
+
+    @abstractmethod
+    def filter(self, pks):
+        pass
+
+    @abstractmethod
+    def counts(self, bands, filtered):
+        """
+        Return {pk: number of bands} for the values of bands. filtered is
+        False when bands is the whole table.
+        """
+
+
+class CountryFacet(BandFacet):
+    model = Country
+    label = "Countries"
+
+    def filter(self, pks):
+        return Q(country__in=pks)
+
+    def counts(self, bands, filtered):
+        if not filtered:
+            rows = Country.objects.filter(band_count__gt=0).values_list(
+                "pk", "band_count"
+            )
+        else:
+            rows = bands.order_by().values_list("country").annotate(
+                count=Count("*")
+            )
+
+        return dict(rows)
+
+
+class GenreFacet(BandFacet):
+    model = Genre
+    label = "Genres"
+
+    def filter(self, pks):
+        return Exists(Band.genres.through.objects.filter(
+            band=OuterRef("pk"), genre__in=pks
+        ))
+
+    def counts(self, bands, filtered):
+        if not filtered:
+            rows = Genre.objects.filter(band_count__gt=0).values_list(
+                "pk", "band_count"
+            )
+        else:
+            rows = Band.genres.through.objects.filter(
+                band__in=bands.order_by().values("pk")
+            ).values_list("genre").annotate(count=Count("*"))
+
+        return dict(rows)
+
+
+class InstrumentFacet(BandFacet):
+    model = Instrument
+    label = "Member instruments"
+
+    def filter(self, pks):
+        return Exists(Band.members.through.objects.filter(
+            band=OuterRef("pk"), musician__instrument__in=pks
+        ))
+
+    def counts(self, bands, filtered):
+        memberships = Band.members.through.objects.all()
+        if filtered:
+            memberships = memberships.filter(
+                band__in=bands.order_by().values("pk")
+            )
+
+        return dict(memberships.values_list("musician__instrument").annotate(
+            count=Count("band", distinct=True)
+        ))
+
+
+BAND_FACETS = {
+    "genre": GenreFacet(),
+    "country": CountryFacet(),
+    "instrument": InstrumentFacet(),
+}
+
+# Changes to these models can move bands between facet values.
+FACET_MODELS = (Band, Genre, Country, Instrument, Musician)
+
+
+def is_facet_pk(facet, value):
+    try:
+        run_db_validators(facet.model._meta.pk, value)
+    except ValidationError:
+        return False
+
+    return True
+
+
+def parse_facet_selection(query):
+    """
+    Return {facet name: set of pks} selected in a QueryDict, without
+    values that cannot be pks.
+    """
+    selection = {}
+
+    for name, facet in BAND_FACETS.items():
+        pks = {
+            int(value) for value in query.getlist(name) if value.isdecimal()
+        }
+        pks = {pk for pk in pks if is_facet_pk(facet, pk)}
+        if pks:
+            selection[name] = pks
+
+    return selection
+
+
+def filter_bands(queryset, selection, exclude=None):
+    for name, pks in selection.items():
+        if name != exclude:
+            queryset = queryset.filter(BAND_FACETS[name].filter(pks))
+
+    return queryset
+
+
+def facets_cache_key(selection, name_query):
+    payload = json.dumps({
+        "selection": {name: sorted(pks) for name, pks in selection.items()},
+        "name": name_query,
+        "changed": last_changed(FACET_MODELS).isoformat(),
+    }, sort_keys=True)
+    digest = hashlib.md5(payload.encode()).hexdigest()
+
+    return f"{FACETS_CACHE_PREFIX}:{digest}"
+
+
+def count_facets(selection, name_query=""):
+    """
+    Return the number of bands matching the name search and the
+    selection, and {facet name: [(pk, label, count), ...]} for them,
+    most common values first. Each
+    facet is counted without its own selection, so its other values stay
+    selectable. Without a search or other selections, genre and country
+    counts are read from the denormalized band_count. Results are cached
+    per selection until one of the FACET_MODELS changes.
+    """
+    key = facets_cache_key(selection, name_query)
+    counts = cache.get(key)
+
+    if counts is None:
+        bands = Band.objects.all()
+        if name_query:
+            bands = search(bands, name_query)
+
+        total = filter_bands(bands, selection).count()
+        facets = {}
+        for name, facet in BAND_FACETS.items():
+            filtered = bool(name_query) or any(
+                other != name for other in selection
+            )
+            counts = facet.counts(
+                filter_bands(bands, selection, exclude=name), filtered
+            )
+            # Keep selected values listed, so they can be deselected.
+            for pk in selection.get(name, ()):
+                counts.setdefault(pk, 0)
+
+            labels = dict(facet.model.objects.filter(
+                pk__in=counts
+            ).values_list("pk", "name"))
+
+            facets[name] = sorted(
+                (
+                    (pk, labels[pk], count)
+                    for pk, count in counts.items()
+                    if pk in labels
+                ),
+                key=lambda option: (-option[2], option[1])
+            )
+
+        counts = (total, facets)
+        cache.set(key, counts, FACETS_CACHE_TIMEOUT)
+
+    return counts
+
+
+def toggle_facet_query(query, name, pk):
+    """Return the query string with pk added to or removed from a facet."""
+    query = query.copy()
+    values = [value for value in query.getlist(name) if value != str(pk)]
+    if len(values) == len(query.getlist(name)):
+        values.append(str(pk))
+
+    query.setlist(name, values)
+    query.pop("page", None)
+    query.pop("cursor", None)
+
+    return query.urlencode()
+
+
+def get_band_facets(query):
+    """
+    Return the number of matching bands and the facets of the band list
+    for a request QueryDict, with the top FACET_OPTION_LIMIT values of
+    each facet plus the selected ones.
+    """
+    selection = parse_facet_selection(query)
+    total, counts = count_facets(selection, query.get("name", ""))
+    facets = []
+
+    for name, facet in BAND_FACETS.items():
+        selected = selection.get(name, set())
+        options = [
+            {
+                "pk": pk,
+                "name": label,
+                "count": count,
+                "selected": pk in selected,
+                "query": toggle_facet_query(query, name, pk),
+            }
+            for index, (pk, label, count) in enumerate(counts[name])
+            if index < FACET_OPTION_LIMIT or pk in selected
+        ]
+        facets.append({"name": name, "label": facet.label, "options": options})
+
+    return total, facets
@@ -1,7 +1,10 @@
 from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
+from django.urls import reverse_lazy
+
 from catalog.models import Musician, Band, Genre
+from catalog.widgets import MemberPickerWidget
 
 
 class MusicianCreationForm(UserCreationForm):
@@ -35,7 +38,10 @@ class BandForm(forms.ModelForm):
     )
     members = forms.ModelMultipleChoiceField(
         queryset=get_user_model().objects.all(),
-        widget=forms.CheckboxSelectMultiple,
+        widget=MemberPickerWidget(
+            source_url=reverse_lazy("catalog:api-musician-list"),
+            search_param="musician",
+        ),
     )
 
     class Meta:
@@ -0,0 +1,69 @@
+import uuid
+
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+
+from catalog.changes import invalidate_keys
+from catalog.models import Band
+
+BAND_ROW_VERSION_PREFIX = "catalog:band_row_version"
+BAND_ROW_FRAGMENT_TIMEOUT = 60 * 60 * 24
+# Name of the {% cache %} fragment of a row in band_list.html.
+BAND_ROW_FRAGMENT = "band_row"
+
+
+def band_row_version_key(pk):
+    return f"{BAND_ROW_VERSION_PREFIX}:{pk}"
+
+
+def attach_band_row_versions(bands):
+    """
+    Set row_version on every band, used by band_list.html as part of
+    the row fragment cache key. Missing versions get a fresh random
+    stamp, so a row is never served from a fragment older than its
+    last invalidation. Return the bands whose row will be rendered
+    because its fragment is not cached.
+    """
+    bands = list(bands)
+    keys = {band.pk: band_row_version_key(band.pk) for band in bands}
+    versions = cache.get_many(keys.values())
+
+    missing = {
+        key: uuid.uuid4().hex
+        for key in keys.values()
+        if key not in versions
+    }
+    if missing:
+        cache.set_many(missing, BAND_ROW_FRAGMENT_TIMEOUT)
+        versions.update(missing)
+
+    for band in bands:
+        band.row_version = versions[keys[band.pk]]
+
+    fragment_keys = {
+        band.pk: make_template_fragment_key(
+            BAND_ROW_FRAGMENT, [band.pk, band.row_version]
+        )
+        for band in bands
+        if keys[band.pk] not in missing
+    }
+    fragments = cache.get_many(fragment_keys.values())
+
+    return [
+        band for band in bands
+        if fragment_keys.get(band.pk) not in fragments
+    ]
+
+
+def invalidate_band_rows(pks):
+    invalidate_keys([band_row_version_key(pk) for pk in pks])
+
+
+def invalidate_genre_band_rows(genre):
+    invalidate_band_rows(genre.bands.values_list("pk", flat=True))
+
+
+def invalidate_country_band_rows(country):
+    invalidate_band_rows(
+        Band.objects.filter(country=country).values_list("pk", flat=True)
+    )
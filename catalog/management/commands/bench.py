@@ -0,0 +1,298 @@
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from catalog.bench import (
+    add_catalog_arguments,
+    benchmark_database,
+    summarize,
+    time_request,
+    write_report,
+)
+from catalog.models import Band, Country, Genre, Instrument, Musician
+
+BENCH_PASSWORD = "Bench_Pass12345"
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic catalog in a throwaway test database and time "
+        "every catalog URL through the test client. Prints p50/p95/p99 "
+        "latency and query counts, and optionally writes them as JSON."
+    )
+
+    def add_arguments(self, parser):
+        add_catalog_arguments(parser)
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Requests timed per URL.",
+        )
+
+    def handle(self, *args, **options):
+        with benchmark_database(options, self.stderr):
+            with override_settings(DEBUG=False, ALLOWED_HOSTS=["testserver"]):
+                results = self.run_scenarios(options)
+
+        self.print_table(results)
+        write_report(
+            options, results, self.stdout, repeat=options["repeat"]
+        )
+
+    def run_scenarios(self, options):
+        client = Client()
+        client.force_login(Musician.objects.create_user(
+            username="bench_user",
+            password=BENCH_PASSWORD,
+            instrument=Instrument.objects.first(),
+        ))
+        results = []
+
+        for name, method, make_request in self.get_scenarios(options):
+            if options["only"] and options["only"] not in name:
+                continue
+
+            samples = []
+            path = None
+            for iteration in range(options["repeat"]):
+                path, data = make_request(iteration)
+                samples.append(time_request(client, method, path, data))
+
+            results.append(summarize(name, method, path, samples))
+            self.stderr.write(f"  {name}: done")
+
+        return results
+
+    def get_scenarios(self, options):
+        repeat = options["repeat"]
+        band = Band.objects.order_by("pk").first()
+        musician = Musician.objects.order_by("pk").first()
+        country_id = Country.objects.values_list("pk", flat=True).first()
+        genre_ids = list(Genre.objects.values_list("pk", flat=True)[:2])
+        instrument_id = Instrument.objects.values_list(
+            "pk", flat=True
+        ).first()
+        member_ids = list(Musician.objects.values_list("pk", flat=True)[:3])
+        deep_page = max(Band.objects.count() // 5 // 2, 1)
+
+        scenarios = [
+            ("index", "get", lambda i: (reverse("catalog:index"), None)),
+            (
+                "band-export",
+                "get",
+                lambda i: (reverse("catalog:band-export"), None),
+            ),
+            (
+                "band-list-deep-page",
+                "get",
+                lambda i: (
+                    reverse("catalog:band-list-view"), {"page": deep_page}
+                ),
+            ),
+            (
+                "band-list-facets",
+                "get",
+                lambda i: (
+                    reverse("catalog:band-list-view"),
+                    {"genre": genre_ids[:1], "instrument": instrument_id},
+                ),
+            ),
+            (
+                "band-detail",
+                "get",
+                lambda i: (
+                    reverse("catalog:band-detail-view", args=[band.pk]),
+                    None,
+                ),
+            ),
+            (
+                "musician-detail",
+                "get",
+                lambda i: (
+                    reverse(
+                        "catalog:musician-detail-view",
+                        args=[musician.pk]
+                    ),
+                    None,
+                ),
+            ),
+        ]
+
+        searches = {
+            "genre": ("name", "Genre 12"),
+            "country": ("name", "Country 12"),
+            "instrument": ("name", "Instrument 12"),
+            "musician": ("musician", "First1234"),
+            "band": ("name", "Band 1234"),
+        }
+        for model_name, (param, query) in searches.items():
+            list_url = reverse(f"catalog:{model_name}-list-view")
+            api_url = reverse(f"catalog:api-{model_name}-list")
+            scenarios += [
+                (
+                    f"{model_name}-list",
+                    "get",
+                    lambda i, url=list_url: (url, None),
+                ),
+                (
+                    f"{model_name}-search",
+                    "get",
+                    lambda i, url=list_url, param=param, query=query: (
+                        url, {param: query}
+                    ),
+                ),
+                (
+                    f"api-{model_name}-list",
+                    "get",
+                    lambda i, url=api_url: (url, None),
+                ),
+            ]
+
+        for model, model_name in (
+            (Genre, "genre"),
+            (Country, "country"),
+            (Instrument, "instrument"),
+        ):
+            disposable = model.objects.bulk_create([
+                model(name=f"Bench disposable {model_name} {index}")
+                for index in range(repeat)
+            ])
+            target = model.objects.create(name=f"Bench {model_name}")
+            scenarios += [
+                (
+                    f"{model_name}-create",
+                    "post",
+                    lambda i, model_name=model_name: (
+                        reverse(f"catalog:{model_name}-create"),
+                        {"name": f"Bench new {model_name} {i}"},
+                    ),
+                ),
+                (
+                    f"{model_name}-update",
+                    "post",
+                    lambda i, model_name=model_name, pk=target.pk: (
+                        reverse(f"catalog:{model_name}-update", args=[pk]),
+                        {"name": f"Bench updated {model_name} {i}"},
+                    ),
+                ),
+                (
+                    f"{model_name}-delete",
+                    "post",
+                    lambda i, model_name=model_name, objects=disposable: (
+                        reverse(
+                            f"catalog:{model_name}-delete",
+                            args=[objects[i].pk]
+                        ),
+                        None,
+                    ),
+                ),
+            ]
+
+        band_data = {
+            "description": "Benchmark band",
+            "country": country_id,
+            "genres": genre_ids,
+            "members": member_ids,
+        }
+        disposable_bands = Band.objects.bulk_create([
+            Band(
+                name=f"Bench disposable band {index}",
+                description="Disposable",
+                country_id=country_id,
+            )
+            for index in range(repeat)
+        ])
+        musician_data = {
+            "password1": BENCH_PASSWORD,
+            "password2": BENCH_PASSWORD,
+            "first_name": "Bench",
+            "last_name": "Musician",
+            "instrument": instrument_id,
+        }
+        disposable_musicians = Musician.objects.bulk_create([
+            Musician(
+                username=f"bench_disposable_{index}",
+                instrument_id=instrument_id,
+            )
+            for index in range(repeat)
+        ])
+
+        scenarios += [
+            (
+                "band-create",
+                "post",
+                lambda i: (
+                    reverse("catalog:band-create"),
+                    {**band_data, "name": f"Bench new band {i}"},
+                ),
+            ),
+            (
+                "band-update",
+                "post",
+                lambda i: (
+                    reverse("catalog:band-update", args=[band.pk]),
+                    {**band_data, "name": f"Bench updated band {i}"},
+                ),
+            ),
+            (
+                "band-delete",
+                "post",
+                lambda i: (
+                    reverse(
+                        "catalog:band-delete",
+                        args=[disposable_bands[i].pk]
+                    ),
+                    None,
+                ),
+            ),
+            (
+                "musician-create",
+                "post",
+                lambda i: (
+                    reverse("catalog:musician-create"),
+                    {**musician_data, "username": f"bench_new_{i}"},
+                ),
+            ),
+            (
+                "musician-update",
+                "post",
+                lambda i: (
+                    reverse("catalog:musician-update", args=[musician.pk]),
+                    {**musician_data, "username": f"bench_updated_{i}"},
+                ),
+            ),
+            (
+                "musician-delete",
+                "post",
+                lambda i: (
+                    reverse(
+                        "catalog:musician-delete",
+                        args=[disposable_musicians[i].pk]
+                    ),
+                    None,
+                ),
+            ),
+        ]
+
+        return scenarios
+
+    def print_table(self, results):
+        header = (
+            f"{'scenario':<24}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'p99 ms':>10}{'queries':>9}{'db ms':>9}"
+        )
+        self.stderr.write(header)
+        self.stderr.write("-" * len(header))
+
+        for result in results:
+            queries = result["queries"]
+            db_ms = result["db_p50_ms"]
+            self.stderr.write(
+                f"{result['name']:<24}"
+                f"{result['p50_ms']:>10.2f}"
+                f"{result['p95_ms']:>10.2f}"
+                f"{result['p99_ms']:>10.2f}"
+                f"{'-' if queries is None else queries:>9}"
+                f"{'-' if db_ms is None else db_ms:>9}"
+            )
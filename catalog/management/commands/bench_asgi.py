@@ -0,0 +1,184 @@
+import asyncio
+import math
+from itertools import cycle, islice
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from catalog.bench import (
+    add_catalog_arguments,
+    benchmark_database,
+    percentile,
+    run_clients,
+    write_report,
+)
+from catalog.models import Band, Instrument, Musician
+
+BENCH_PASSWORD = "Bench_Pass12345"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync and async catalog views under ASGI: many slow "
+        "clients request each URL concurrently from a synthetic catalog "
+        "in a throwaway test database. Prints throughput and latency."
+    )
+
+    def add_arguments(self, parser):
+        add_catalog_arguments(parser)
+        parser.add_argument(
+            "--clients",
+            type=int,
+            default=50,
+            help="Concurrent clients.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Requests sent per URL.",
+        )
+        parser.add_argument(
+            "--client-delay",
+            type=float,
+            default=50,
+            help="Milliseconds a client takes to send a request and again "
+                 "to read the response.",
+        )
+
+    def handle(self, *args, **options):
+        with benchmark_database(options, self.stderr):
+            # Queued requests are all slow; don't log each of them.
+            with override_settings(
+                DEBUG=False,
+                ALLOWED_HOSTS=["testserver"],
+                CATALOG_SLOW_REQUEST_MS=math.inf,
+            ):
+                results = self.run_scenarios(options)
+
+        self.print_table(results)
+        write_report(
+            options,
+            results,
+            self.stdout,
+            clients=options["clients"],
+            requests=options["requests"],
+            client_delay_ms=options["client_delay"],
+        )
+
+    def run_scenarios(self, options):
+        client = Client()
+        client.force_login(Musician.objects.create_user(
+            username="bench_user",
+            password=BENCH_PASSWORD,
+            instrument=Instrument.objects.first(),
+        ))
+        cookie = (
+            f"{settings.SESSION_COOKIE_NAME}="
+            f"{client.cookies[settings.SESSION_COOKIE_NAME].value}"
+        )
+        application = get_asgi_application()
+        results = []
+
+        for name, mode, paths in self.get_scenarios(options):
+            if options["only"] and options["only"] not in name:
+                continue
+
+            cache.clear()
+            wall, durations = asyncio.run(run_clients(
+                application,
+                paths,
+                cookie,
+                options["clients"],
+                options["client_delay"] / 1000,
+            ))
+            durations = [duration * 1000 for duration in durations]
+
+            results.append({
+                "name": name,
+                "mode": mode,
+                "path": paths[0],
+                "samples": len(durations),
+                "requests_per_second": round(len(durations) / wall, 1),
+                "p50_ms": round(percentile(durations, 50), 2),
+                "p95_ms": round(percentile(durations, 95), 2),
+                "p99_ms": round(percentile(durations, 99), 2),
+            })
+            self.stderr.write(f"  {name} ({mode}): done")
+
+        return results
+
+    def get_scenarios(self, options):
+        count = options["requests"]
+        band_ids = list(
+            Band.objects.order_by("pk").values_list("pk", flat=True)[:count]
+        )
+
+        def repeated(url):
+            return [url] * count
+
+        def band_pages(name):
+            return [
+                reverse(name, args=[pk])
+                for pk in islice(cycle(band_ids), count)
+            ]
+
+        scenarios = [
+            (
+                "index",
+                repeated(reverse("catalog:index")),
+                repeated(reverse("catalog:async-index")),
+            ),
+            (
+                "band-list",
+                repeated(reverse("catalog:band-list-view")),
+                repeated(reverse("catalog:async-band-list-view")),
+            ),
+            (
+                "musician-list",
+                repeated(reverse("catalog:musician-list-view")),
+                repeated(reverse("catalog:async-musician-list-view")),
+            ),
+            (
+                "musician-search",
+                repeated(
+                    reverse("catalog:musician-list-view")
+                    + "?musician=First1234"
+                ),
+                repeated(
+                    reverse("catalog:async-musician-list-view")
+                    + "?musician=First1234"
+                ),
+            ),
+            (
+                "band-detail",
+                band_pages("catalog:band-detail-view"),
+                band_pages("catalog:async-band-detail-view"),
+            ),
+        ]
+
+        for name, sync_paths, async_paths in scenarios:
+            yield name, "sync", sync_paths
+            yield name, "async", async_paths
+
+    def print_table(self, results):
+        header = (
+            f"{'scenario':<20}{'mode':<7}{'req/s':>9}{'p50 ms':>10}"
+            f"{'p95 ms':>10}{'p99 ms':>10}"
+        )
+        self.stderr.write(header)
+        self.stderr.write("-" * len(header))
+
+        for result in results:
+            self.stderr.write(
+                f"{result['name']:<20}"
+                f"{result['mode']:<7}"
+                f"{result['requests_per_second']:>9.1f}"
+                f"{result['p50_ms']:>10.2f}"
+                f"{result['p95_ms']:>10.2f}"
+                f"{result['p99_ms']:>10.2f}"
+            )
@@ -0,0 +1,183 @@
+import math
+import threading
+from itertools import cycle, islice
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from catalog.bench import (
+    add_catalog_arguments,
+    benchmark_database,
+    percentile,
+    run_threads,
+    use_file_test_database,
+    write_report,
+)
+from catalog.models import Band, Instrument, Musician
+
+BENCH_PASSWORD = "Bench_Pass12345"
+
+
+class ConnectionCounter:
+    def __init__(self):
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, sender, **kwargs):
+        with self.lock:
+            self.count += 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare opening a database connection per request with persistent "
+        "connections (CONN_MAX_AGE): worker threads request catalog URLs "
+        "through the WSGI handler from a synthetic catalog in a throwaway "
+        "test database. Prints throughput, latency and connections opened."
+    )
+
+    def add_arguments(self, parser):
+        add_catalog_arguments(parser)
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="Concurrent worker threads.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Requests sent per URL and mode.",
+        )
+        parser.add_argument(
+            "--conn-max-age",
+            type=int,
+            default=600,
+            help="CONN_MAX_AGE of the persistent mode.",
+        )
+
+    def handle(self, *args, **options):
+        use_file_test_database("music_world_bench.sqlite3")
+        with benchmark_database(options, self.stderr):
+            with override_settings(
+                DEBUG=False,
+                ALLOWED_HOSTS=["testserver"],
+                CATALOG_SLOW_REQUEST_MS=math.inf,
+            ):
+                results = self.run_scenarios(options)
+
+        self.print_table(results)
+        write_report(
+            options,
+            results,
+            self.stdout,
+            threads=options["threads"],
+            requests=options["requests"],
+        )
+
+    def run_scenarios(self, options):
+        client = Client()
+        client.force_login(Musician.objects.create_user(
+            username="bench_user",
+            password=BENCH_PASSWORD,
+            instrument=Instrument.objects.first(),
+        ))
+        cookie = (
+            f"{settings.SESSION_COOKIE_NAME}="
+            f"{client.cookies[settings.SESSION_COOKIE_NAME].value}"
+        )
+        handler = WSGIHandler()
+        modes = (
+            ("connect-per-request", 0),
+            ("persistent", options["conn_max_age"]),
+        )
+        original_max_age = connection.settings_dict["CONN_MAX_AGE"]
+        results = []
+
+        counter = ConnectionCounter()
+        connection_created.connect(counter)
+        try:
+            for name, paths in self.get_scenarios(options):
+                if options["only"] and options["only"] not in name:
+                    continue
+
+                for mode, max_age in modes:
+                    # The settings dict is shared by the connections of
+                    # every thread.
+                    connection.settings_dict["CONN_MAX_AGE"] = max_age
+                    connections.close_all()
+                    cache.clear()
+                    counter.count = 0
+
+                    wall, durations = run_threads(
+                        handler, paths, cookie, options["threads"]
+                    )
+                    durations = [duration * 1000 for duration in durations]
+
+                    results.append({
+                        "name": name,
+                        "mode": mode,
+                        "conn_max_age": max_age,
+                        "path": paths[0],
+                        "samples": len(durations),
+                        "connections": counter.count,
+                        "requests_per_second": round(
+                            len(durations) / wall, 1
+                        ),
+                        "p50_ms": round(percentile(durations, 50), 2),
+                        "p95_ms": round(percentile(durations, 95), 2),
+                        "p99_ms": round(percentile(durations, 99), 2),
+                    })
+                    self.stderr.write(f"  {name} ({mode}): done")
+        finally:
+            connection_created.disconnect(counter)
+            connection.settings_dict["CONN_MAX_AGE"] = original_max_age
+
+        return results
+
+    def get_scenarios(self, options):
+        count = options["requests"]
+        band_ids = list(
+            Band.objects.order_by("pk").values_list("pk", flat=True)[:count]
+        )
+
+        return [
+            ("index", [reverse("catalog:index")] * count),
+            ("band-list", [reverse("catalog:band-list-view")] * count),
+            (
+                "musician-list",
+                [reverse("catalog:musician-list-view")] * count,
+            ),
+            (
+                "band-detail",
+                [
+                    reverse("catalog:band-detail-view", args=[pk])
+                    for pk in islice(cycle(band_ids), count)
+                ],
+            ),
+        ]
+
+    def print_table(self, results):
+        header = (
+            f"{'scenario':<16}{'mode':<22}{'req/s':>9}{'p50 ms':>10}"
+            f"{'p95 ms':>10}{'connects':>10}"
+        )
+        self.stderr.write(header)
+        self.stderr.write("-" * len(header))
+
+        for result in results:
+            self.stderr.write(
+                f"{result['name']:<16}"
+                f"{result['mode']:<22}"
+                f"{result['requests_per_second']:>9.1f}"
+                f"{result['p50_ms']:>10.2f}"
+                f"{result['p95_ms']:>10.2f}"
+                f"{result['connections']:>10}"
+            )
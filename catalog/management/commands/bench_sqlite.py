@@ -0,0 +1,193 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections, transaction
+from django.test import override_settings
+
+from catalog.bench import (
+    add_catalog_arguments,
+    benchmark_database,
+    percentile,
+    use_file_test_database,
+    write_report,
+)
+from catalog.models import Band, Country, Genre, Musician
+
+# SQLite's own defaults, as used before CATALOG_SQLITE_PRAGMAS existed.
+ROLLBACK_JOURNAL_PRAGMAS = {
+    "journal_mode": "delete",
+    "synchronous": "full",
+    "mmap_size": 0,
+    "cache_size": -2000,
+    "busy_timeout": 5000,
+}
+
+
+class Worker(threading.Thread):
+    """Repeat an operation until the deadline, timing every run."""
+
+    def __init__(self, operation, deadline):
+        super().__init__()
+        self.operation = operation
+        self.deadline = deadline
+        self.durations = []
+        self.errors = 0
+
+    def run(self):
+        try:
+            while time.perf_counter() < self.deadline:
+                start = time.perf_counter()
+                try:
+                    self.operation()
+                except OperationalError:
+                    self.errors += 1
+                    continue
+                self.durations.append(time.perf_counter() - start)
+        finally:
+            connection.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Run concurrent band list reads and band creates against a SQLite "
+        "file database, first with the rollback journal and then with "
+        "CATALOG_SQLITE_PRAGMAS. Prints read and write throughput and "
+        "latency, showing how long readers stall behind writers."
+    )
+
+    def add_arguments(self, parser):
+        add_catalog_arguments(parser)
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument("--writers", type=int, default=1)
+        parser.add_argument(
+            "--seconds",
+            type=float,
+            default=5,
+            help="Duration of each mode.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("bench_sqlite needs a SQLite database.")
+
+        use_file_test_database("music_world_bench.sqlite3")
+        with benchmark_database(options, self.stderr):
+            results = [
+                self.run_mode(options, "rollback-journal", {
+                    **settings.CATALOG_SQLITE_PRAGMAS,
+                    **ROLLBACK_JOURNAL_PRAGMAS,
+                }),
+                self.run_mode(
+                    options, "configured", settings.CATALOG_SQLITE_PRAGMAS
+                ),
+            ]
+
+        self.print_table(results)
+        write_report(
+            options,
+            results,
+            self.stdout,
+            readers=options["readers"],
+            writers=options["writers"],
+            seconds=options["seconds"],
+        )
+
+    def run_mode(self, options, name, pragmas):
+        country = Country.objects.first()
+        genre_ids = list(Genre.objects.values_list("pk", flat=True)[:2])
+        member_ids = list(Musician.objects.values_list("pk", flat=True)[:3])
+        counter = iter(range(10 ** 9))
+        counter_lock = threading.Lock()
+
+        def read():
+            # What BandListView reads for one page.
+            queryset = Band.objects.select_related(
+                "country"
+            ).prefetch_related("genres")
+            queryset.count()
+            list(queryset[:5])
+
+        def write():
+            # What BandCreateView writes, signals included.
+            with counter_lock:
+                index = next(counter)
+            with transaction.atomic():
+                band = Band.objects.create(
+                    name=f"Bench {name} band {index}",
+                    description="Concurrent write",
+                    country=country,
+                )
+                band.genres.set(genre_ids)
+                band.members.set(member_ids)
+
+        with override_settings(CATALOG_SQLITE_PRAGMAS=pragmas):
+            connections.close_all()
+            # journal_mode is stored in the database file, so switch it
+            # before the workers connect.
+            connection.ensure_connection()
+            connection.close()
+
+            deadline = time.perf_counter() + options["seconds"]
+            readers = [
+                Worker(read, deadline) for _ in range(options["readers"])
+            ]
+            writers = [
+                Worker(write, deadline) for _ in range(options["writers"])
+            ]
+            for worker in readers + writers:
+                worker.start()
+            for worker in readers + writers:
+                worker.join()
+
+        self.stderr.write(f"  {name}: done")
+
+        return {
+            "name": name,
+            "pragmas": pragmas,
+            "reads": self.summarize(readers, options["seconds"]),
+            "writes": self.summarize(writers, options["seconds"]),
+        }
+
+    @staticmethod
+    def summarize(workers, seconds):
+        durations = [
+            duration * 1000
+            for worker in workers
+            for duration in worker.durations
+        ]
+        summary = {
+            "operations": len(durations),
+            "per_second": round(len(durations) / seconds, 1),
+            "errors": sum(worker.errors for worker in workers),
+        }
+        if durations:
+            summary.update({
+                "p50_ms": round(percentile(durations, 50), 2),
+                "p99_ms": round(percentile(durations, 99), 2),
+                "max_ms": round(max(durations), 2),
+            })
+
+        return summary
+
+    def print_table(self, results):
+        header = (
+            f"{'mode':<18}{'op':<7}{'ops/s':>9}{'p50 ms':>10}"
+            f"{'p99 ms':>10}{'max ms':>10}{'errors':>8}"
+        )
+        self.stderr.write(header)
+        self.stderr.write("-" * len(header))
+
+        for result in results:
+            for operation in ("reads", "writes"):
+                summary = result[operation]
+                self.stderr.write(
+                    f"{result['name']:<18}"
+                    f"{operation:<7}"
+                    f"{summary['per_second']:>9.1f}"
+                    f"{summary.get('p50_ms', '-'):>10}"
+                    f"{summary.get('p99_ms', '-'):>10}"
+                    f"{summary.get('max_ms', '-'):>10}"
+                    f"{summary['errors']:>8}"
+                )
@@ -0,0 +1,279 @@
+import csv
+import json
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from catalog.autocomplete import AUTOCOMPLETE_INDEXES
+from catalog.changes import (
+    PROCESS_LOCAL_CACHE_WARNING,
+    touch,
+    uses_process_local_cache,
+)
+from catalog.counters import COUNTED_MODELS, invalidate_counter
+from catalog.detail_cache import invalidate_detail_pages
+from catalog.export import LIST_SEPARATOR
+from catalog.fragments import invalidate_band_rows
+from catalog.models import Band, Country, Genre, Instrument, Musician
+from catalog.relation_counts import update_relation_counts
+from catalog.search import get_search_backend
+
+
+class NameMap:
+    """
+    In-memory name -> id map for a lookup model, filled from the database
+    on demand and creating missing rows in bulk.
+    """
+
+    def __init__(self, model, field="name", create=True):
+        self.model = model
+        self.field = field
+        self.create = create
+        self.ids = {}
+        self.search_backend = get_search_backend()
+
+    def resolve(self, names):
+        missing = {name for name in names if name not in self.ids}
+        if not missing:
+            return
+
+        self.load(missing)
+        missing -= self.ids.keys()
+
+        if missing and self.create:
+            self.model.objects.bulk_create(
+                [self.model(**{self.field: name}) for name in missing],
+                ignore_conflicts=True,
+            )
+            self.load(missing)
+            self.search_backend.index(self.model.objects.filter(
+                **{f"{self.field}__in": missing}
+            ))
+            missing -= self.ids.keys()
+
+        if missing:
+            raise CommandError(
+                f"Unknown {self.model._meta.verbose_name}: "
+                f"{', '.join(sorted(missing))}"
+            )
+
+    def load(self, names):
+        self.ids.update(
+            self.model.objects.filter(
+                **{f"{self.field}__in": names}
+            ).values_list(self.field, "pk")
+        )
+
+    def __getitem__(self, name):
+        return self.ids[name]
+
+
+def split_list(value):
+    if isinstance(value, list):
+        return [item.strip() for item in value if item.strip()]
+
+    return [
+        item.strip()
+        for item in (value or "").split(LIST_SEPARATOR)
+        if item.strip()
+    ]
+
+
+def read_records(path, file_format):
+    with open(path, newline="", encoding="utf-8") as file:
+        if file_format == "csv":
+            yield from csv.DictReader(file)
+            return
+
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def batches(records, size):
+    records = iter(records)
+    while batch := list(islice(records, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream bands or musicians from a JSON Lines or CSV file into the "
+        "catalog using bulk inserts. Genres and members are lists (or "
+        f"'{LIST_SEPARATOR}'-separated in CSV); countries, genres and "
+        "instruments are resolved by name and created when missing, "
+        "members by username."
+    )
+    # Set by the import_catalog task to record the records read so far.
+    progress = None
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import.")
+        parser.add_argument(
+            "--model",
+            choices=("band", "musician"),
+            default="band",
+            help="Kind of records in the file.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=("jsonl", "csv"),
+            help="File format, guessed from the extension by default.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Number of records inserted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        if uses_process_local_cache():
+            self.stderr.write(self.style.WARNING(PROCESS_LOCAL_CACHE_WARNING))
+
+        path = options["path"]
+        file_format = options["format"] or (
+            "csv" if path.lower().endswith(".csv") else "jsonl"
+        )
+        import_batch = (
+            self.import_bands
+            if options["model"] == "band"
+            else self.import_musicians
+        )
+
+        self.country_ids = NameMap(Country)
+        self.genre_ids = NameMap(Genre)
+        self.instrument_ids = NameMap(Instrument)
+        self.musician_ids = NameMap(Musician, "username", create=False)
+        self.search_backend = get_search_backend()
+
+        created = skipped = 0
+
+        try:
+            for batch in batches(
+                read_records(path, file_format), options["batch_size"]
+            ):
+                with transaction.atomic():
+                    batch_created = import_batch(batch)
+                created += batch_created
+                skipped += len(batch) - batch_created
+                if self.progress:
+                    self.progress(created + skipped)
+        except (OSError, ValueError, KeyError) as error:
+            raise CommandError(f"Cannot import {path}: {error!r}")
+        finally:
+            for model in COUNTED_MODELS.values():
+                invalidate_counter(model)
+            touch(Band, Country, Genre, Instrument, Musician)
+            for index in AUTOCOMPLETE_INDEXES.values():
+                index.bump_generation()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {created} {options['model']}s, "
+            f"skipped {skipped} existing."
+        ))
+
+    @staticmethod
+    def new_records(records, model, field):
+        """Drop records already in the database or repeated in the batch."""
+        seen = set(model.objects.filter(
+            **{f"{field}__in": [record[field] for record in records]}
+        ).values_list(field, flat=True))
+        new = []
+
+        for record in records:
+            if record[field] not in seen:
+                seen.add(record[field])
+                new.append(record)
+
+        return new
+
+    def import_bands(self, records):
+        records = self.new_records(records, Band, "name")
+        if not records:
+            return 0
+
+        self.country_ids.resolve({record["country"] for record in records})
+        self.genre_ids.resolve({
+            genre
+            for record in records
+            for genre in split_list(record.get("genres"))
+        })
+        self.musician_ids.resolve({
+            username
+            for record in records
+            for username in split_list(record.get("members"))
+        })
+
+        bands = Band.objects.bulk_create([
+            Band(
+                name=record["name"],
+                description=record.get("description", ""),
+                country_id=self.country_ids[record["country"]],
+            )
+            for record in records
+        ])
+
+        genre_links = Band.genres.through.objects.bulk_create([
+            Band.genres.through(
+                band_id=band.pk,
+                genre_id=self.genre_ids[genre],
+            )
+            for band, record in zip(bands, records)
+            for genre in set(split_list(record.get("genres")))
+        ])
+        memberships = Band.members.through.objects.bulk_create([
+            Band.members.through(
+                band_id=band.pk,
+                musician_id=self.musician_ids[username],
+            )
+            for band, record in zip(bands, records)
+            for username in set(split_list(record.get("members")))
+        ])
+
+        # bulk_create() sends no m2m_changed, so count the new links here.
+        update_relation_counts(Band, [band.pk for band in bands])
+        update_relation_counts(Genre, {link.genre_id for link in genre_links})
+        update_relation_counts(
+            Musician, {membership.musician_id for membership in memberships}
+        )
+        update_relation_counts(Country, {band.country_id for band in bands})
+
+        self.search_backend.index(bands)
+        invalidate_band_rows([band.pk for band in bands])
+        invalidate_detail_pages({
+            Band: [band.pk for band in bands],
+            Musician: {
+                membership.musician_id for membership in memberships
+            },
+        })
+
+        return len(bands)
+
+    def import_musicians(self, records):
+        records = self.new_records(records, Musician, "username")
+        if not records:
+            return 0
+
+        self.instrument_ids.resolve(
+            {record["instrument"] for record in records}
+        )
+        unusable_password = make_password(None)
+
+        musicians = Musician.objects.bulk_create([
+            Musician(
+                username=record["username"],
+                first_name=record.get("first_name", ""),
+                last_name=record.get("last_name", ""),
+                email=record.get("email", ""),
+                password=unusable_password,
+                instrument_id=self.instrument_ids[record["instrument"]],
+            )
+            for record in records
+        ])
+
+        self.search_backend.index(musicians)
+
+        return len(musicians)
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from catalog.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the catalog search index from the database tables."
+    # Set by the rebuild_search_index task to record its progress.
+    progress = None
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to rebuild the search index for.",
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"]
+
+        with transaction.atomic(using=using):
+            get_search_backend(using).rebuild(self.progress)
+
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
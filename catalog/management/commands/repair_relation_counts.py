@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from catalog.relation_counts import repair_relation_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the denormalized band, genre, member and country counters "
+        "from the relation tables and fix the rows that drifted."
+    )
+    # Set by the repair_relation_counts task to record its progress.
+    progress = None
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            repaired = repair_relation_counts(self.progress)
+
+        for model, rows in repaired.items():
+            self.stdout.write(
+                f"{model._meta.verbose_name_plural}: {rows} repaired"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Repaired the relation counters of {sum(repaired.values())} rows."
+        ))
@@ -0,0 +1,160 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from catalog.changes import (
+    PROCESS_LOCAL_CACHE_WARNING,
+    uses_process_local_cache,
+)
+from catalog.tasks import (
+    claim_task,
+    fail_task,
+    requeue_stale_tasks,
+    requeue_task,
+    run_task,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued catalog tasks (bulk deletes, imports, index and "
+        "counter rebuilds) in a pool of worker processes, outside of the "
+        "web server's request threads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count() or 2,
+            help="Worker processes; 0 runs tasks in this process.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait before looking for new tasks.",
+        )
+        parser.add_argument(
+            "--requeue-stale",
+            type=int,
+            metavar="SECONDS",
+            help=(
+                "Before starting, queue again the tasks running for more "
+                "than SECONDS, e.g. after a worker was killed."
+            ),
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        self.processes = options["processes"]
+        self.executor = None
+        # {future: (task pk, executor it was submitted to)}
+        self.running = {}
+
+        if uses_process_local_cache():
+            self.stderr.write(self.style.WARNING(PROCESS_LOCAL_CACHE_WARNING))
+
+        if options["requeue_stale"] is not None:
+            requeued = requeue_stale_tasks(options["requeue_stale"])
+            self.stderr.write(f"Requeued {requeued} stale tasks.")
+
+        if self.processes:
+            self.executor = self.make_executor()
+
+        self.stderr.write(
+            f"Worker started with {self.processes or 'no'} subprocesses."
+        )
+
+        try:
+            while True:
+                self.collect_finished()
+                claimed = self.start_tasks()
+
+                if options["burst"] and not claimed and not self.running:
+                    break
+                if not claimed:
+                    time.sleep(options["poll_interval"])
+        except KeyboardInterrupt:
+            self.stderr.write("Stopping; waiting for running tasks.")
+        finally:
+            if self.executor:
+                self.executor.shutdown(wait=True)
+
+    def make_executor(self):
+        # Fresh interpreters, so no database connection is shared with a
+        # forked parent.
+        connections.close_all()
+        return ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        )
+
+    def restart_pool(self):
+        self.stderr.write(self.style.ERROR(
+            "A worker process died; starting a new pool."
+        ))
+        self.executor.shutdown(wait=False)
+        self.executor = self.make_executor()
+
+    def collect_finished(self):
+        """
+        Forget finished tasks. run_task() records its own errors, so an
+        exception here means the process running the task died: mark the
+        task failed, and replace the pool if it was the current one.
+        """
+        for future, (pk, executor) in list(self.running.items()):
+            if not future.done():
+                continue
+
+            del self.running[future]
+            error = future.exception()
+            if error is None:
+                continue
+
+            fail_task(pk, f"The worker process failed: {error!r}")
+            self.stderr.write(self.style.ERROR(f"Task {pk} failed."))
+            if (
+                isinstance(error, BrokenProcessPool)
+                and executor is self.executor
+            ):
+                self.restart_pool()
+
+    def start_tasks(self):
+        """Claim tasks while there are free processes; return how many."""
+        claimed = 0
+
+        while self.executor is None or len(self.running) < self.processes:
+            pk = claim_task()
+            if pk is None:
+                break
+
+            claimed += 1
+            self.stderr.write(f"Running task {pk}.")
+            if self.executor is None:
+                run_task(pk)
+                continue
+
+            try:
+                future = self.executor.submit(run_task, pk)
+            except BrokenProcessPool:
+                # Broken before its futures were collected; run the task
+                # on the new pool.
+                requeue_task(pk)
+                self.restart_pool()
+                break
+
+            self.running[future] = (pk, self.executor)
+
+        return claimed
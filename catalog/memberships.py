@@ -0,0 +1,175 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from catalog.changes import touch
+from catalog.detail_cache import invalidate_link_pages
+from catalog.fragments import invalidate_band_rows
+from catalog.models import Band
+from catalog.relation_counts import M2M_COUNTS, update_relation_counts
+from catalog.validators import run_db_validators
+
+# Band m2m fields editable in batches, by their name in a change.
+MEMBERSHIP_FIELDS = {
+    "genres": Band.genres.field,
+    "members": Band.members.field,
+}
+MEMBERSHIP_ACTIONS = ("add", "remove")
+MAX_MEMBERSHIP_CHANGES = 1000
+
+
+def is_pk(value, model=Band):
+    """Return whether value is a valid pk of model from JSON."""
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        return False
+
+    try:
+        run_db_validators(model._meta.pk, value)
+    except ValidationError:
+        return False
+
+    return True
+
+
+def parse_membership_changes(changes):
+    """
+    Return {field name: (links to add, links to remove)} for a list of
+    {"band": pk, "genres": {"add": [pk, ...], "remove": [...]}, ...}
+    changes, with links as (band pk, related pk) pairs. Raise ValueError
+    for malformed or contradictory changes.
+    """
+    if not isinstance(changes, list) or not changes:
+        raise ValueError("changes must be a non-empty list.")
+    if len(changes) > MAX_MEMBERSHIP_CHANGES:
+        raise ValueError(
+            f"At most {MAX_MEMBERSHIP_CHANGES} changes per request."
+        )
+
+    deltas = {name: (set(), set()) for name in MEMBERSHIP_FIELDS}
+
+    for change in changes:
+        if not isinstance(change, dict) or not is_pk(change.get("band")):
+            raise ValueError("Every change needs a band id.")
+
+        for name, delta in change.items():
+            if name == "band":
+                continue
+            if name not in MEMBERSHIP_FIELDS or not isinstance(delta, dict):
+                raise ValueError(f"Unknown membership field: {name!r}.")
+            model = MEMBERSHIP_FIELDS[name].related_model
+
+            for action, pks in delta.items():
+                if action not in MEMBERSHIP_ACTIONS:
+                    raise ValueError(f"Unknown action: {action!r}.")
+                if not isinstance(pks, list) or not all(
+                    is_pk(pk, model) for pk in pks
+                ):
+                    raise ValueError(f"{name}.{action} must list ids.")
+
+                links = deltas[name][MEMBERSHIP_ACTIONS.index(action)]
+                links.update((change["band"], pk) for pk in pks)
+
+    for name, (added, removed) in deltas.items():
+        if added & removed:
+            raise ValueError(f"{name} links are both added and removed.")
+
+    return deltas
+
+
+def check_missing_pks(deltas):
+    """Raise ValueError if a change names a band or object that is gone."""
+    wanted = {Band: set()}
+
+    for name, links in deltas.items():
+        model = MEMBERSHIP_FIELDS[name].related_model
+        wanted.setdefault(model, set())
+        for band, related in set().union(*links):
+            wanted[Band].add(band)
+            wanted[model].add(related)
+
+    for model, pks in wanted.items():
+        missing = pks - set(model.objects.filter(
+            pk__in=pks
+        ).values_list("pk", flat=True))
+        if missing:
+            raise ValueError(
+                f"Unknown {model._meta.verbose_name} ids: {sorted(missing)}."
+            )
+
+
+def links_changed(m2m_field, links):
+    """
+    Do for links from many bands what the m2m_changed receivers do after
+    one add() or remove(): recount both sides, invalidate the pages and
+    rows showing the links and record the change, once for the batch.
+    """
+    band_pks = {band for band, _ in links}
+    related_pks = {related for _, related in links}
+    own_field, related_field = M2M_COUNTS[m2m_field]
+
+    update_relation_counts(Band, band_pks, [own_field])
+    update_relation_counts(
+        m2m_field.related_model, related_pks, [related_field]
+    )
+    invalidate_link_pages(m2m_field, band_pks, related_pks)
+    if m2m_field is Band.genres.field:
+        invalidate_band_rows(band_pks)
+    touch(Band)
+
+
+def update_links(m2m_field, added, removed):
+    """
+    Add and remove (band pk, related pk) links of m2m_field with one
+    SELECT, one bulk INSERT and one DELETE on its through table. Links
+    that already exist, or never did, are skipped. Through tables send
+    no signals for these writes, so links_changed() is called instead.
+    Return the number of links added and removed.
+    """
+    through = m2m_field.remote_field.through
+    source = m2m_field.m2m_field_name()
+    target = m2m_field.m2m_reverse_field_name()
+
+    existing = {
+        (band, related): pk
+        for pk, band, related in through.objects.filter(**{
+            f"{source}__in": {band for band, _ in added | removed}
+        }).values_list("pk", source, target)
+    }
+    added = added - existing.keys()
+    removed = removed & existing.keys()
+
+    if added:
+        # A concurrent add of the same link is not an error.
+        through.objects.bulk_create(
+            [
+                through(**{f"{source}_id": band, f"{target}_id": related})
+                for band, related in added
+            ],
+            ignore_conflicts=True
+        )
+
+    if removed:
+        through.objects.filter(
+            pk__in=[existing[link] for link in removed]
+        ).delete()
+
+    if added or removed:
+        links_changed(m2m_field, added | removed)
+
+    return {"added": len(added), "removed": len(removed)}
+
+
+def apply_membership_changes(changes):
+    """
+    Apply a batch of band genre and member changes in one transaction,
+    with set-based writes and one counter and cache update per field
+    rather than a diff and m2m_changed signals per band. Return
+    {field name: {"added": n, "removed": n}}.
+    """
+    deltas = parse_membership_changes(changes)
+    check_missing_pks(deltas)
+
+    with transaction.atomic():
+        return {
+            name: update_links(MEMBERSHIP_FIELDS[name], added, removed)
+            for name, (added, removed) in deltas.items()
+        }
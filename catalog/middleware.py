@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("catalog.timing")
+
+
+class QueryRecorder:
+    """Database execute wrapper counting queries and their duration."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class TimingMiddleware:
+    """
+    Measure DB queries, DB time, template render time and total latency
+    of every request. The numbers are sent in a Server-Timing header and
+    logged under the resolved URL name (e.g. catalog:band-list-view);
+    requests slower than CATALOG_SLOW_REQUEST_MS are logged as warnings.
+
+    Uses connection.execute_wrapper, so it works with DEBUG = False.
+    Under ASGI the wrappers are installed from the thread that runs the
+    request's thread-sensitive sync code, where the async ORM queries.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        recorder = QueryRecorder()
+        request.render_duration = 0.0
+        start = time.perf_counter()
+
+        with self.wrap_connections(recorder):
+            response = self.get_response(request)
+
+        total = time.perf_counter() - start
+        self.report(request, response, recorder, total)
+
+        return response
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        request.render_duration = 0.0
+        start = time.perf_counter()
+
+        stack = await sync_to_async(self.wrap_connections)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+
+        total = time.perf_counter() - start
+        self.report(request, response, recorder, total)
+
+        return response
+
+    @staticmethod
+    def wrap_connections(recorder):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        return stack
+
+    def process_template_response(self, request, response):
+        render_start = time.perf_counter()
+
+        def record_render_duration(rendered_response):
+            request.render_duration = time.perf_counter() - render_start
+
+        response.add_post_render_callback(record_render_duration)
+
+        return response
+
+    @staticmethod
+    def report(request, response, recorder, total):
+        match = request.resolver_match
+        view_name = match.view_name if match else request.path_info
+
+        response["Server-Timing"] = ", ".join((
+            f'db;dur={recorder.duration * 1000:.1f};'
+            f'desc="{recorder.count} queries"',
+            f"tpl;dur={request.render_duration * 1000:.1f}",
+            f"total;dur={total * 1000:.1f}",
+        ))
+
+        log = (
+            logger.warning
+            if total * 1000 >= settings.CATALOG_SLOW_REQUEST_MS
+            else logger.debug
+        )
+        log(
+            "%s %s %s: %d queries, db %.1fms, template %.1fms, "
+            "total %.1fms",
+            request.method,
+            view_name,
+            response.status_code,
+            recorder.count,
+            recorder.duration * 1000,
+            request.render_duration * 1000,
+            total * 1000,
+        )
@@ -0,0 +1,77 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+SEARCH_INDEX_TABLE = "catalog_search_index"
+
+SEARCH_FIELDS = {
+    ("catalog.band", "catalog_band"): ("name", "description"),
+    ("catalog.genre", "catalog_genre"): ("name",),
+    ("catalog.country", "catalog_country"): ("name",),
+    ("catalog.instrument", "catalog_instrument"): ("name",),
+}
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    quote_name = connection.ops.quote_name
+
+    if connection.vendor == "sqlite":
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {SEARCH_INDEX_TABLE} USING fts5("
+                f"label UNINDEXED, object_id UNINDEXED, content, "
+                f"tokenize='trigram')"
+            )
+        except OperationalError:
+            # SQLite was built without FTS5 or is older than 3.34,
+            # search falls back to plain icontains lookups.
+            return
+
+        for (label, table), fields in SEARCH_FIELDS.items():
+            content = " || char(10) || ".join(
+                quote_name(field) for field in fields
+            )
+            schema_editor.execute(
+                f"INSERT INTO {SEARCH_INDEX_TABLE} "
+                f"(label, object_id, content) "
+                f"SELECT %s, id, {content} FROM {quote_name(table)}",
+                [label]
+            )
+
+    elif connection.vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+        for (_, table), fields in SEARCH_FIELDS.items():
+            for field in fields:
+                schema_editor.execute(
+                    f"CREATE INDEX IF NOT EXISTS "
+                    f"{quote_name(f'{table}_{field}_trgm')} "
+                    f"ON {quote_name(table)} "
+                    f"USING gin (UPPER({quote_name(field)}) gin_trgm_ops)"
+                )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    quote_name = connection.ops.quote_name
+
+    if connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SEARCH_INDEX_TABLE}")
+
+    elif connection.vendor == "postgresql":
+        for (_, table), fields in SEARCH_FIELDS.items():
+            for field in fields:
+                schema_editor.execute(
+                    f"DROP INDEX IF EXISTS "
+                    f"{quote_name(f'{table}_{field}_trgm')}"
+                )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("catalog", "0002_alter_country_options"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
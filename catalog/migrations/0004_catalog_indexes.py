@@ -0,0 +1,95 @@
+from django.db import migrations, models
+
+SEARCH_INDEX_TABLE = "catalog_search_index"
+SEARCH_ROWID_STRIDE = 8
+MUSICIAN_SEARCH_FIELDS = ("first_name", "last_name", "username")
+
+SEARCH_FIELDS = {
+    ("catalog.band", "catalog_band", 1): ("name", "description"),
+    ("catalog.musician", "catalog_musician", 2): MUSICIAN_SEARCH_FIELDS,
+    ("catalog.genre", "catalog_genre", 3): ("name",),
+    ("catalog.country", "catalog_country", 4): ("name",),
+    ("catalog.instrument", "catalog_instrument", 5): ("name",),
+}
+
+
+def reindex_search_documents(apps, schema_editor):
+    connection = schema_editor.connection
+    quote_name = connection.ops.quote_name
+
+    if connection.vendor == "sqlite":
+        if SEARCH_INDEX_TABLE not in connection.introspection.table_names():
+            return
+
+        # Documents are re-inserted under computed rowids, so updates and
+        # deletes can find them without scanning the whole FTS table.
+        schema_editor.execute(f"DELETE FROM {SEARCH_INDEX_TABLE}")
+
+        for (label, table, code), fields in SEARCH_FIELDS.items():
+            content = " || char(10) || ".join(
+                quote_name(field) for field in fields
+            )
+            schema_editor.execute(
+                f"INSERT INTO {SEARCH_INDEX_TABLE} "
+                f"(rowid, label, object_id, content) "
+                f"SELECT id * %s + %s, %s, id, {content} "
+                f"FROM {quote_name(table)}",
+                [SEARCH_ROWID_STRIDE, code, label]
+            )
+
+    elif connection.vendor == "postgresql":
+        for field in MUSICIAN_SEARCH_FIELDS:
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS "
+                f"{quote_name(f'catalog_musician_{field}_trgm')} "
+                f"ON catalog_musician "
+                f"USING gin (UPPER({quote_name(field)}) gin_trgm_ops)"
+            )
+
+
+def unindex_musicians(apps, schema_editor):
+    connection = schema_editor.connection
+    quote_name = connection.ops.quote_name
+
+    if connection.vendor == "sqlite":
+        if SEARCH_INDEX_TABLE not in connection.introspection.table_names():
+            return
+
+        schema_editor.execute(
+            f"DELETE FROM {SEARCH_INDEX_TABLE} WHERE label = %s",
+            ["catalog.musician"]
+        )
+
+    elif connection.vendor == "postgresql":
+        for field in MUSICIAN_SEARCH_FIELDS:
+            schema_editor.execute(
+                f"DROP INDEX IF EXISTS "
+                f"{quote_name(f'catalog_musician_{field}_trgm')}"
+            )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("catalog", "0003_search_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="band",
+            index=models.Index(
+                fields=["country", "name"],
+                name="band_country_name_idx",
+            ),
+        ),
+        migrations.RunSQL(
+            "CREATE INDEX band_members_musician_band_idx "
+            "ON catalog_band_members (musician_id, band_id)",
+            "DROP INDEX band_members_musician_band_idx",
+        ),
+        migrations.RunSQL(
+            "CREATE INDEX band_genres_genre_band_idx "
+            "ON catalog_band_genres (genre_id, band_id)",
+            "DROP INDEX band_genres_genre_band_idx",
+        ),
+        migrations.RunPython(reindex_search_documents, unindex_musicians),
+    ]
@@ -0,0 +1,85 @@
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+# model -> {field: (source model, column)}, as in catalog.relation_counts.
+RELATION_COUNTS = {
+    "band": {
+        "genre_count": ("band_genres", "band"),
+        "member_count": ("band_members", "band"),
+    },
+    "genre": {"band_count": ("band_genres", "genre")},
+    "musician": {"band_count": ("band_members", "musician")},
+    "country": {"band_count": ("band", "country")},
+}
+
+
+def count_relations(apps, schema_editor):
+    Band = apps.get_model("catalog", "Band")
+    sources = {
+        "band": Band,
+        "band_genres": Band.genres.through,
+        "band_members": Band.members.through,
+    }
+
+    for model_name, counts in RELATION_COUNTS.items():
+        expressions = {}
+        for field, (source, column) in counts.items():
+            rows = sources[source].objects.filter(
+                **{column: models.OuterRef("pk")}
+            ).order_by().values(column).annotate(
+                count=models.Count("*")
+            ).values("count")
+            expressions[field] = Coalesce(
+                models.Subquery(rows), models.Value(0)
+            )
+
+        apps.get_model("catalog", model_name).objects.update(**expressions)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("catalog", "0004_catalog_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="band",
+            name="genre_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="band",
+            name="member_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="country",
+            name="band_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="genre",
+            name="band_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="musician",
+            name="band_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="band",
+            index=models.Index(
+                fields=["-member_count", "name"],
+                name="band_popularity_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="musician",
+            index=models.Index(
+                fields=["-band_count", "username"],
+                name="musician_popularity_idx",
+            ),
+        ),
+        migrations.RunPython(count_relations, migrations.RunPython.noop),
+    ]
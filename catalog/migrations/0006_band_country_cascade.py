@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("catalog", "0005_relation_counts"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="band",
+            name="country",
+            field=models.ForeignKey(
+                on_delete=models.CASCADE, to="catalog.country"
+            ),
+        ),
+    ]
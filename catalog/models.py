@@ -1,10 +1,12 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.urls import reverse
 
 
 class Genre(models.Model):
     name = models.CharField(max_length=63, unique=True)
+    band_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["name"]
@@ -15,6 +17,7 @@ class Genre(models.Model):
 
 class Country(models.Model):
     name = models.CharField(max_length=255, unique=True)
+    band_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name_plural = "countries"
@@ -36,9 +39,16 @@ class Instrument(models.Model):
 
 class Musician(AbstractUser):
     instrument = models.ForeignKey(Instrument, on_delete=models.CASCADE)
+    band_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["username"]
+        indexes = [
+            models.Index(
+                fields=["-band_count", "username"],
+                name="musician_popularity_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -47,15 +57,69 @@ class Musician(AbstractUser):
 class Band(models.Model):
     name = models.CharField(max_length=255, unique=True)
     description = models.TextField()
-    country = models.ForeignKey(Country, on_delete=models.DO_NOTHING)
+    country = models.ForeignKey(Country, on_delete=models.CASCADE)
     genres = models.ManyToManyField(Genre, related_name="bands")
     members = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
         related_name="bands"
     )
+    # Maintained by catalog.relation_counts; see repair_relation_counts.
+    genre_count = models.PositiveIntegerField(default=0, editable=False)
+    member_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            models.Index(
+                fields=["country", "name"],
+                name="band_country_name_idx",
+            ),
+            models.Index(
+                fields=["-member_count", "name"],
+                name="band_popularity_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name}"
+
+
+class Task(models.Model):
+    """A unit of background work, run by `manage.py run_worker`."""
+
+    class Status(models.TextChoices):
+        QUEUED = "queued"
+        RUNNING = "running"
+        DONE = "done"
+        FAILED = "failed"
+
+    name = models.CharField(max_length=63)
+    arguments = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=15, choices=Status.choices, default=Status.QUEUED
+    )
+    progress = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(null=True, blank=True)
+    result = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    started = models.DateTimeField(null=True, blank=True)
+    finished = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created"]
+        indexes = [
+            models.Index(
+                fields=["status", "created"],
+                name="task_status_created_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+    def get_absolute_url(self):
+        return reverse("catalog:task-detail-view", args=[self.pk])
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.DONE, self.Status.FAILED)
@@ -0,0 +1,205 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import Http404
+
+from catalog.validators import run_db_validators
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorPage:
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Keyset paginator that seeks past the last row of the previous page
+    instead of using OFFSET, so every page costs the same index range
+    scan and no COUNT(*) is issued.
+
+    Rows are ordered by the queryset ordering (falling back to the
+    model Meta.ordering) with the primary key appended as a tiebreaker.
+    Ordering fields must be plain, non-null columns or annotations.
+    """
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = self.get_ordering(queryset)
+
+    @staticmethod
+    def get_ordering(queryset):
+        ordering = list(
+            queryset.query.order_by or queryset.model._meta.ordering
+        )
+        pk_name = queryset.model._meta.pk.name
+
+        if not {"pk", "-pk", pk_name, f"-{pk_name}"} & set(ordering):
+            ordering.append("pk")
+
+        return ordering
+
+    @staticmethod
+    def encode_cursor(values, backwards):
+        payload = json.dumps({"v": values, "b": backwards})
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            values, backwards = payload["v"], bool(payload["b"])
+        except (ValueError, TypeError, KeyError):
+            raise InvalidCursor(cursor)
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise InvalidCursor(cursor)
+
+        # A tampered cursor must not reach the database as a bad value.
+        try:
+            values = [
+                self.clean_value(field.lstrip("-"), value)
+                for field, value in zip(self.ordering, values)
+                if isinstance(value, (str, int, float))
+            ]
+        except (ValidationError, ValueError, TypeError, OverflowError):
+            raise InvalidCursor(cursor)
+
+        if None in values or len(values) != len(self.ordering):
+            raise InvalidCursor(cursor)
+
+        return values, backwards
+
+    def clean_value(self, name, value):
+        field = self.get_field(name)
+        value = field.to_python(value)
+        run_db_validators(field, value)
+        return value
+
+    def get_field(self, name):
+        """Return the model field or annotation output field of name."""
+        annotations = self.queryset.query.annotations
+        if name in annotations:
+            return annotations[name].output_field
+
+        model = self.queryset.model
+        for part in name.split("__"):
+            if part == "pk":
+                field = model._meta.pk
+            else:
+                field = model._meta.get_field(part)
+            model = field.related_model
+
+        return field
+
+    def position(self, obj):
+        if isinstance(obj, dict):
+            return [obj[field.lstrip("-")] for field in self.ordering]
+
+        return [
+            getattr(obj, field.lstrip("-")) for field in self.ordering
+        ]
+
+    def seek(self, values, backwards):
+        """Build a filter selecting rows strictly after the given position."""
+        condition = Q()
+        equal = Q()
+
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip("-")
+            descending = field.startswith("-") != backwards
+            lookup = "lt" if descending else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+
+        return condition
+
+    def page_queryset(self, cursor):
+        queryset = self.queryset.order_by(*self.ordering)
+        backwards = False
+
+        if cursor:
+            values, backwards = self.decode_cursor(cursor)
+            if backwards:
+                queryset = queryset.reverse()
+            queryset = queryset.filter(self.seek(values, backwards))
+
+        return queryset[:self.per_page + 1], backwards
+
+    def page(self, cursor=None):
+        queryset, backwards = self.page_queryset(cursor)
+        return self.make_page(list(queryset), cursor, backwards)
+
+    async def apage(self, cursor=None):
+        queryset, backwards = self.page_queryset(cursor)
+        rows = [row async for row in queryset]
+        return self.make_page(rows, cursor, backwards)
+
+    def make_page(self, rows, cursor, backwards):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if backwards:
+            rows.reverse()
+
+        if not rows:
+            return CursorPage(rows, None, None)
+
+        has_next = has_more if not backwards else True
+        has_previous = bool(cursor) if not backwards else has_more
+
+        return CursorPage(
+            rows,
+            self.encode_cursor(self.position(rows[-1]), False)
+            if has_next else None,
+            self.encode_cursor(self.position(rows[0]), True)
+            if has_previous else None,
+        )
+
+
+class CursorPaginationMixin:
+    """
+    Use CursorPaginator for a ListView when CATALOG_CURSOR_PAGINATION is
+    enabled, keeping Django's offset Paginator otherwise.
+    """
+
+    cursor_kwarg = "cursor"
+
+    def paginate_queryset(self, queryset, page_size):
+        if not settings.CATALOG_CURSOR_PAGINATION:
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = CursorPaginator(queryset, page_size)
+
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+
+        return paginator, page, page.object_list, page.has_other_pages()
@@ -0,0 +1,125 @@
+from django.db.models import Count, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from catalog.models import Band, Country, Genre, Musician
+
+# Denormalized relation counters, as model -> {field: (source, column)}:
+# each counter is the number of source rows whose column points at the row.
+RELATION_COUNTS = {
+    Band: {
+        "genre_count": (Band.genres.through, "band"),
+        "member_count": (Band.members.through, "band"),
+    },
+    Genre: {"band_count": (Band.genres.through, "genre")},
+    Musician: {"band_count": (Band.members.through, "musician")},
+    Country: {"band_count": (Band, "country")},
+}
+
+# Counters kept by each m2m field, for its model and its related model.
+M2M_COUNTS = {
+    Band.genres.field: ("genre_count", "band_count"),
+    Band.members.field: ("member_count", "band_count"),
+}
+
+
+def relation_count(source, column):
+    counts = source.objects.filter(
+        **{column: OuterRef("pk")}
+    ).order_by().values(column).annotate(count=Count("*")).values("count")
+
+    return Coalesce(Subquery(counts), Value(0))
+
+
+def update_relation_counts(model, pks=None, fields=None):
+    """
+    Recount the counters of the model rows in pks (all rows when None)
+    in a single UPDATE. Recounting instead of incrementing keeps the
+    counters exact when a pk_set names objects that were already added
+    or never related.
+    """
+    counts = RELATION_COUNTS[model]
+    queryset = model.objects.all()
+
+    if pks is not None:
+        pks = set(pks) - {None}
+        if not pks:
+            return 0
+        queryset = queryset.filter(pk__in=pks)
+
+    return queryset.update(**{
+        field: relation_count(*counts[field]) for field in fields or counts
+    })
+
+
+def related_pks(m2m_field, instance):
+    if isinstance(instance, m2m_field.model):
+        accessor = m2m_field.name
+    else:
+        accessor = m2m_field.remote_field.get_accessor_name()
+
+    return set(getattr(instance, accessor).values_list("pk", flat=True))
+
+
+def update_m2m_counts(m2m_field, instance, pk_set):
+    """Recount both sides of the m2m_field links of instance to pk_set."""
+    own_field, related_field = M2M_COUNTS[m2m_field]
+
+    if isinstance(instance, m2m_field.model):
+        own_pks, other_pks = {instance.pk}, pk_set
+    else:
+        own_pks, other_pks = pk_set, {instance.pk}
+
+    update_relation_counts(m2m_field.model, own_pks, [own_field])
+    update_relation_counts(m2m_field.related_model, other_pks, [related_field])
+
+
+def counts_of_relations(instance):
+    """
+    Return (model, pks, fields) for every counter that counts a relation
+    of instance. Read before a delete, as the relation rows go with it.
+    """
+    affected = []
+
+    for m2m_field, (own_field, related_field) in M2M_COUNTS.items():
+        if isinstance(instance, m2m_field.model):
+            affected.append((
+                m2m_field.related_model,
+                related_pks(m2m_field, instance),
+                [related_field],
+            ))
+        elif isinstance(instance, m2m_field.related_model):
+            affected.append((
+                m2m_field.model,
+                related_pks(m2m_field, instance),
+                [own_field],
+            ))
+
+    if isinstance(instance, Band):
+        affected.append((Country, {instance.country_id}, ["band_count"]))
+
+    return affected
+
+
+def repair_relation_counts(progress=None):
+    """
+    Recount the counters that drifted from the relation tables, e.g.
+    after raw SQL or bulk writes that send no signals. Return the number
+    of rows fixed per model. progress, if given, is called with the
+    number of models done and their total.
+    """
+    repaired = {}
+
+    for done, (model, counts) in enumerate(RELATION_COUNTS.items()):
+        expressions = {
+            field: relation_count(*relation)
+            for field, relation in counts.items()
+        }
+        drifted = Q()
+        for field, expression in expressions.items():
+            drifted |= ~Q(**{field: expression})
+
+        repaired[model] = model.objects.filter(drifted).update(**expressions)
+        if progress:
+            progress(done + 1, len(RELATION_COUNTS))
+
+    return repaired
@@ -0,0 +1,218 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+from catalog.models import Band, Musician, Genre, Country, Instrument
+
+MUSICIAN_SEARCH_FIELDS = ("first_name", "last_name", "username")
+
+SEARCH_INDEX_TABLE = "catalog_search_index"
+MIN_TRIGRAM_QUERY_LENGTH = 3
+
+# FTS5 can only look rows up by rowid, so every document is stored under
+# the rowid object_id * SEARCH_ROWID_STRIDE + the code of its model.
+SEARCH_ROWID_STRIDE = 8
+SEARCH_MODEL_CODES = {
+    "catalog.band": 1,
+    "catalog.musician": 2,
+    "catalog.genre": 3,
+    "catalog.country": 4,
+    "catalog.instrument": 5,
+}
+
+SEARCH_FIELDS = {
+    Band: ("name", "description"),
+    Musician: MUSICIAN_SEARCH_FIELDS,
+    Genre: ("name",),
+    Country: ("name",),
+    Instrument: ("name",),
+}
+
+
+def search_musicians(queryset, query):
+    """
+    Match musicians by first name, last name or username in one query,
+    filtered through the search index.
+
+    Prefix matches rank above substring matches, and earlier fields in
+    MUSICIAN_SEARCH_FIELDS rank above later ones.
+    """
+    ranks = []
+    field_count = len(MUSICIAN_SEARCH_FIELDS)
+
+    for position, field in enumerate(MUSICIAN_SEARCH_FIELDS):
+        ranks.append(When(
+            **{f"{field}__istartswith": query},
+            then=Value(2 * field_count - position)
+        ))
+
+    for position, field in enumerate(MUSICIAN_SEARCH_FIELDS):
+        ranks.append(When(
+            **{f"{field}__icontains": query},
+            then=Value(field_count - position)
+        ))
+
+    return search(queryset, query).annotate(
+        search_rank=Case(*ranks, default=Value(0), output_field=IntegerField())
+    ).order_by("-search_rank", *queryset.model._meta.ordering)
+
+
+def search_rowid(model, pk):
+    code = SEARCH_MODEL_CODES[model._meta.label_lower]
+    return pk * SEARCH_ROWID_STRIDE + code
+
+
+def search_document(instance):
+    return "\n".join(
+        str(getattr(instance, field))
+        for field in SEARCH_FIELDS[type(instance)]
+    )
+
+
+class SearchBackend:
+    """
+    Plain icontains search, used by backends without a dedicated index.
+
+    Every backend matches the same rows as icontains over SEARCH_FIELDS.
+    """
+
+    def __init__(self, using):
+        self.using = using
+
+    def search(self, queryset, query):
+        matches = Q()
+        for field in SEARCH_FIELDS[queryset.model]:
+            matches |= Q(**{f"{field}__icontains": query})
+
+        return queryset.filter(matches)
+
+    def index(self, instances):
+        pass
+
+    def remove(self, model, pks):
+        pass
+
+    def rebuild(self, progress=None):
+        """
+        Rebuild the index from the tables. progress, if given, is called
+        with the number of models done and their total.
+        """
+
+
+class PostgresTrigramBackend(SearchBackend):
+    """
+    icontains compiles to UPPER(...) LIKE UPPER(...) on PostgreSQL, which
+    the pg_trgm GIN expression indexes created by migrations 0003 and 0004
+    serve without a table scan, so no separate index has to be maintained.
+    """
+
+
+class SqliteFts5Backend(SearchBackend):
+    """
+    Search through an FTS5 virtual table using the trigram tokenizer,
+    which supports case-insensitive substring matching for queries of at
+    least three characters. Shorter queries fall back to icontains.
+    """
+
+    def search(self, queryset, query):
+        # NUL would end the MATCH string early, making it invalid.
+        query = query.replace("\x00", "")
+        if len(query) < MIN_TRIGRAM_QUERY_LENGTH:
+            return super().search(queryset, query)
+
+        phrase = '"{}"'.format(query.replace('"', '""'))
+
+        return queryset.filter(pk__in=RawSQL(
+            f"SELECT object_id FROM {SEARCH_INDEX_TABLE} "
+            f"WHERE content MATCH %s AND label = %s",
+            (phrase, queryset.model._meta.label_lower)
+        ))
+
+    def index(self, instances):
+        instances = list(instances)
+        if not instances:
+            return
+
+        model = type(instances[0])
+        self.remove(model, [instance.pk for instance in instances])
+
+        with connections[self.using].cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_INDEX_TABLE} "
+                f"(rowid, label, object_id, content) "
+                f"VALUES (%s, %s, %s, %s)",
+                [
+                    (
+                        search_rowid(model, instance.pk),
+                        model._meta.label_lower,
+                        instance.pk,
+                        search_document(instance)
+                    )
+                    for instance in instances
+                ]
+            )
+
+    def remove(self, model, pks):
+        rowids = [search_rowid(model, pk) for pk in pks]
+        if not rowids:
+            return
+
+        placeholders = ", ".join(["%s"] * len(rowids))
+
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {SEARCH_INDEX_TABLE} "
+                f"WHERE rowid IN ({placeholders})",
+                rowids
+            )
+
+    def rebuild(self, progress=None):
+        connection = connections[self.using]
+        quote_name = connection.ops.quote_name
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_INDEX_TABLE}")
+
+            for done, (model, fields) in enumerate(SEARCH_FIELDS.items()):
+                content = " || char(10) || ".join(
+                    quote_name(field) for field in fields
+                )
+                cursor.execute(
+                    f"INSERT INTO {SEARCH_INDEX_TABLE} "
+                    f"(rowid, label, object_id, content) "
+                    f"SELECT id * %s + %s, %s, id, {content} "
+                    f"FROM {quote_name(model._meta.db_table)}",
+                    [
+                        SEARCH_ROWID_STRIDE,
+                        SEARCH_MODEL_CODES[model._meta.label_lower],
+                        model._meta.label_lower,
+                    ]
+                )
+                if progress:
+                    progress(done + 1, len(SEARCH_FIELDS))
+
+
+_backends = {}
+
+
+def get_search_backend(using=DEFAULT_DB_ALIAS):
+    if using not in _backends:
+        connection = connections[using]
+
+        if connection.vendor == "postgresql":
+            backend_class = PostgresTrigramBackend
+        elif (
+            connection.vendor == "sqlite"
+            and SEARCH_INDEX_TABLE in connection.introspection.table_names()
+        ):
+            backend_class = SqliteFts5Backend
+        else:
+            backend_class = SearchBackend
+
+        _backends[using] = backend_class(using)
+
+    return _backends[using]
+
+
+def search(queryset, query):
+    return get_search_backend(queryset.db).search(queryset, query)
@@ -0,0 +1,298 @@
+from django.db.models.signals import (
+    pre_save,
+    post_save,
+    post_delete,
+    pre_delete,
+    m2m_changed,
+)
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from catalog.autocomplete import AUTOCOMPLETE_INDEXES
+from catalog.changes import touch
+from catalog.counters import COUNTED_MODELS, invalidate_counter
+from catalog.detail_cache import (
+    DEPENDENCY_M2M_FIELDS,
+    DEPENDENCY_MODELS,
+    invalidate_dependent_pages,
+    invalidate_m2m_pages,
+)
+from catalog.fragments import (
+    invalidate_band_rows,
+    invalidate_genre_band_rows,
+    invalidate_country_band_rows,
+)
+from catalog.models import Band, Musician, Genre, Instrument, Country
+from catalog.relation_counts import (
+    M2M_COUNTS,
+    RELATION_COUNTS,
+    counts_of_relations,
+    related_pks,
+    update_m2m_counts,
+    update_relation_counts,
+)
+from catalog.search import SEARCH_FIELDS, get_search_backend
+from catalog.sqlite import configure_sqlite_connection
+
+TRACKED_MODELS = (Band, Musician, Genre, Instrument, Country)
+# Musician fields saved on login and password changes, which no catalog
+# page, API payload or facet shows.
+ACCOUNT_FIELDS = {"last_login", "password"}
+AUTOCOMPLETE_MODELS = {
+    index.model: index for index in AUTOCOMPLETE_INDEXES.values()
+}
+M2M_FIELDS_BY_THROUGH = {
+    field.remote_field.through: field for field in DEPENDENCY_M2M_FIELDS
+}
+COUNTED_M2M_FIELDS_BY_THROUGH = {
+    field.remote_field.through: field for field in M2M_COUNTS
+}
+
+
+def invalidate_counter_on_create(sender, created, **kwargs):
+    if created:
+        invalidate_counter(sender)
+
+
+def invalidate_counter_on_delete(sender, **kwargs):
+    invalidate_counter(sender)
+
+
+def update_search_index(sender, instance, using, update_fields, **kwargs):
+    if update_fields and not set(update_fields) & set(SEARCH_FIELDS[sender]):
+        return
+
+    get_search_backend(using).index([instance])
+
+
+def remove_from_search_index(sender, instance, using, **kwargs):
+    get_search_backend(using).remove(sender, [instance.pk])
+
+
+def changes_catalog(update_fields):
+    return not update_fields or not set(update_fields) <= ACCOUNT_FIELDS
+
+
+def touch_changed_model(sender, update_fields=None, **kwargs):
+    if changes_catalog(update_fields):
+        touch(sender)
+
+
+def touch_band_on_m2m_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        touch(Band)
+
+
+def update_autocomplete(sender, instance, update_fields, **kwargs):
+    index = AUTOCOMPLETE_MODELS[sender]
+    if update_fields and not set(update_fields) & set(index.fields):
+        return
+
+    index.update(instance)
+
+
+def remove_from_autocomplete(sender, instance, **kwargs):
+    AUTOCOMPLETE_MODELS[sender].remove(instance.pk)
+
+
+def invalidate_detail_pages_on_change(
+    sender, instance, update_fields=None, **kwargs
+):
+    if changes_catalog(update_fields):
+        invalidate_dependent_pages(instance)
+
+
+def invalidate_detail_pages_on_m2m_change(
+    sender, instance, action, pk_set, **kwargs
+):
+    if action in ("post_add", "post_remove", "pre_clear"):
+        invalidate_m2m_pages(
+            M2M_FIELDS_BY_THROUGH[sender],
+            instance,
+            None if action == "pre_clear" else pk_set
+        )
+
+
+def update_relation_counts_on_m2m_change(
+    sender, instance, action, pk_set, **kwargs
+):
+    m2m_field = COUNTED_M2M_FIELDS_BY_THROUGH[sender]
+    cleared_attr = f"_cleared_{m2m_field.name}_pks"
+
+    if action == "pre_clear":
+        setattr(instance, cleared_attr, related_pks(m2m_field, instance))
+    elif action == "post_clear":
+        update_m2m_counts(
+            m2m_field, instance, instance.__dict__.pop(cleared_attr, set())
+        )
+    elif action in ("post_add", "post_remove"):
+        update_m2m_counts(m2m_field, instance, pk_set)
+
+
+def remember_counted_relations(sender, instance, **kwargs):
+    instance._counted_relations = counts_of_relations(instance)
+
+
+def update_relation_counts_on_delete(sender, instance, **kwargs):
+    for model, pks, fields in instance.__dict__.pop(
+        "_counted_relations", ()
+    ):
+        update_relation_counts(model, pks, fields)
+
+
+for counted_model in COUNTED_MODELS.values():
+    post_save.connect(
+        invalidate_counter_on_create,
+        sender=counted_model,
+        dispatch_uid=f"counter_create_{counted_model._meta.label_lower}"
+    )
+    post_delete.connect(
+        invalidate_counter_on_delete,
+        sender=counted_model,
+        dispatch_uid=f"counter_delete_{counted_model._meta.label_lower}"
+    )
+
+for searchable_model in SEARCH_FIELDS:
+    post_save.connect(
+        update_search_index,
+        sender=searchable_model,
+        dispatch_uid=f"search_index_{searchable_model._meta.label_lower}"
+    )
+    post_delete.connect(
+        remove_from_search_index,
+        sender=searchable_model,
+        dispatch_uid=f"search_remove_{searchable_model._meta.label_lower}"
+    )
+
+for tracked_model in TRACKED_MODELS:
+    post_save.connect(
+        touch_changed_model,
+        sender=tracked_model,
+        dispatch_uid=f"changed_save_{tracked_model._meta.label_lower}"
+    )
+    post_delete.connect(
+        touch_changed_model,
+        sender=tracked_model,
+        dispatch_uid=f"changed_delete_{tracked_model._meta.label_lower}"
+    )
+
+for autocomplete_model in AUTOCOMPLETE_MODELS:
+    post_save.connect(
+        update_autocomplete,
+        sender=autocomplete_model,
+        dispatch_uid=f"autocomplete_{autocomplete_model._meta.label_lower}"
+    )
+    post_delete.connect(
+        remove_from_autocomplete,
+        sender=autocomplete_model,
+        dispatch_uid=(
+            f"autocomplete_remove_{autocomplete_model._meta.label_lower}"
+        )
+    )
+
+for dependency_model in DEPENDENCY_MODELS:
+    post_save.connect(
+        invalidate_detail_pages_on_change,
+        sender=dependency_model,
+        dispatch_uid=f"detail_save_{dependency_model._meta.label_lower}"
+    )
+    pre_delete.connect(
+        invalidate_detail_pages_on_change,
+        sender=dependency_model,
+        dispatch_uid=f"detail_delete_{dependency_model._meta.label_lower}"
+    )
+
+for through_model in M2M_FIELDS_BY_THROUGH:
+    m2m_changed.connect(
+        invalidate_detail_pages_on_m2m_change,
+        sender=through_model,
+        dispatch_uid=f"detail_m2m_{through_model._meta.label_lower}"
+    )
+
+for through_model in COUNTED_M2M_FIELDS_BY_THROUGH:
+    m2m_changed.connect(
+        update_relation_counts_on_m2m_change,
+        sender=through_model,
+        dispatch_uid=f"relation_counts_m2m_{through_model._meta.label_lower}"
+    )
+
+for related_model in RELATION_COUNTS:
+    pre_delete.connect(
+        remember_counted_relations,
+        sender=related_model,
+        dispatch_uid=f"relation_counts_pre_{related_model._meta.label_lower}"
+    )
+    post_delete.connect(
+        update_relation_counts_on_delete,
+        sender=related_model,
+        dispatch_uid=f"relation_counts_{related_model._meta.label_lower}"
+    )
+
+for through_model in (Band.genres.through, Band.members.through):
+    m2m_changed.connect(
+        touch_band_on_m2m_change,
+        sender=through_model,
+        dispatch_uid=f"changed_m2m_{through_model._meta.label_lower}"
+    )
+
+
+@receiver(post_save, sender=Band, dispatch_uid="band_row_save")
+def invalidate_band_row(sender, instance, **kwargs):
+    invalidate_band_rows([instance.pk])
+
+
+@receiver(
+    m2m_changed,
+    sender=Band.genres.through,
+    dispatch_uid="band_row_genres"
+)
+def invalidate_band_rows_on_genres_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not reverse and action in ("post_add", "post_remove", "post_clear"):
+        invalidate_band_rows([instance.pk])
+    elif reverse and action in ("post_add", "post_remove"):
+        invalidate_band_rows(pk_set)
+    elif reverse and action == "pre_clear":
+        invalidate_genre_band_rows(instance)
+
+
+@receiver(post_save, sender=Genre, dispatch_uid="band_row_genre_save")
+@receiver(pre_delete, sender=Genre, dispatch_uid="band_row_genre_delete")
+def invalidate_band_rows_on_genre_change(sender, instance, **kwargs):
+    invalidate_genre_band_rows(instance)
+
+
+@receiver(post_save, sender=Country, dispatch_uid="band_row_country_save")
+def invalidate_band_rows_on_country_change(sender, instance, **kwargs):
+    invalidate_country_band_rows(instance)
+
+
+@receiver(pre_save, sender=Band, dispatch_uid="relation_counts_country_pre")
+def remember_band_country(sender, instance, update_fields, **kwargs):
+    if update_fields and "country" not in update_fields:
+        return
+
+    instance._previous_country_id = None
+    if instance.pk is not None:
+        instance._previous_country_id = Band.objects.filter(
+            pk=instance.pk
+        ).values_list("country_id", flat=True).first()
+
+
+@receiver(post_save, sender=Band, dispatch_uid="relation_counts_country")
+def update_country_band_count(sender, instance, **kwargs):
+    if "_previous_country_id" not in instance.__dict__:
+        return
+
+    previous_country_id = instance.__dict__.pop("_previous_country_id")
+    if previous_country_id != instance.country_id:
+        update_relation_counts(
+            Country, {previous_country_id, instance.country_id}
+        )
+
+
+@receiver(connection_created, dispatch_uid="sqlite_pragmas")
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor == "sqlite":
+        configure_sqlite_connection(connection)
@@ -0,0 +1,11 @@
+from django.conf import settings
+
+
+def configure_sqlite_connection(connection):
+    """
+    Run the CATALOG_SQLITE_PRAGMAS on a new SQLite connection. PRAGMA
+    takes no query parameters, so the values come from settings only.
+    """
+    with connection.cursor() as cursor:
+        for name, value in settings.CATALOG_SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,85 @@
+// Searches musicians through the JSON API and adds the chosen ones to the
+// select rendered by MemberPickerWidget. Double-click a selected musician
+// to remove it.
+document.querySelectorAll(".member-picker").forEach(function (picker) {
+  var select = picker.querySelector("select");
+  var search = picker.querySelector(".member-picker-search");
+  var results = picker.querySelector(".member-picker-results");
+  var more = picker.querySelector(".member-picker-more");
+  var nextUrl = null;
+  var timer = null;
+
+  function label(item) {
+    var name = (item.first_name + " " + item.last_name).trim();
+    return name || item.username;
+  }
+
+  function isSelected(id) {
+    return Array.prototype.some.call(select.options, function (option) {
+      return option.value === String(id);
+    });
+  }
+
+  function addResult(item) {
+    var entry = document.createElement("li");
+    entry.className = "list-group-item list-group-item-action";
+    entry.textContent = label(item);
+    entry.addEventListener("click", function () {
+      if (!isSelected(item.id)) {
+        select.add(new Option(label(item), item.id, true, true));
+      }
+      entry.remove();
+    });
+    results.appendChild(entry);
+  }
+
+  function load(url, append) {
+    fetch(url, {headers: {"Accept": "application/json"}})
+      .then(function (response) { return response.json(); })
+      .then(function (data) {
+        if (!append) {
+          results.innerHTML = "";
+        }
+        data.results.forEach(function (item) {
+          if (!isSelected(item.id)) {
+            addResult(item);
+          }
+        });
+        nextUrl = data.next;
+        more.hidden = !nextUrl;
+      });
+  }
+
+  search.addEventListener("input", function () {
+    clearTimeout(timer);
+    timer = setTimeout(function () {
+      var query = search.value.trim();
+      if (!query) {
+        results.innerHTML = "";
+        more.hidden = true;
+        return;
+      }
+      var params = new URLSearchParams();
+      params.set(picker.dataset.searchParam, query);
+      load(picker.dataset.source + "?" + params.toString(), false);
+    }, 250);
+  });
+
+  more.addEventListener("click", function () {
+    if (nextUrl) {
+      load(nextUrl, true);
+    }
+  });
+
+  select.addEventListener("dblclick", function (event) {
+    if (event.target.tagName === "OPTION") {
+      event.target.remove();
+    }
+  });
+
+  select.form.addEventListener("submit", function () {
+    Array.prototype.forEach.call(select.options, function (option) {
+      option.selected = true;
+    });
+  });
+});
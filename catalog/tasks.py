@@ -0,0 +1,152 @@
+import logging
+import traceback
+from datetime import timedelta
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command, load_command_class
+from django.db import close_old_connections
+from django.utils import timezone
+
+from catalog.deletion import delete_in_batches
+from catalog.models import Task
+
+logger = logging.getLogger("catalog.tasks")
+
+# Task functions by name. Each is called with a progress callback and the
+# task's JSON arguments as keyword arguments; its return value is stored
+# as the task result.
+TASKS = {}
+
+# Queued tasks looked at per claim, in case other workers take the first.
+CLAIM_CANDIDATES = 10
+
+
+def register(function):
+    TASKS[function.__name__] = function
+    return function
+
+
+def enqueue(name, **arguments):
+    """Queue a registered task for `manage.py run_worker`."""
+    if name not in TASKS:
+        raise ValueError(f"Unknown task: {name!r}.")
+
+    return Task.objects.create(name=name, arguments=arguments)
+
+
+class Progress:
+    """Progress callback recording how much of a task is done."""
+
+    def __init__(self, pk):
+        self.pk = pk
+
+    def __call__(self, done, total=None):
+        fields = {"progress": done}
+        if total is not None:
+            fields["total"] = total
+
+        Task.objects.filter(pk=self.pk).update(**fields)
+
+
+def claim_task():
+    """
+    Mark the oldest queued task as running and return its pk, or None
+    if the queue is empty. The conditional UPDATE makes a claim atomic
+    without row locks, so workers on any database never share a task.
+    """
+    candidates = Task.objects.filter(
+        status=Task.Status.QUEUED
+    ).order_by("created", "pk").values_list("pk", flat=True)
+
+    for pk in candidates[:CLAIM_CANDIDATES]:
+        claimed = Task.objects.filter(
+            pk=pk, status=Task.Status.QUEUED
+        ).update(status=Task.Status.RUNNING, started=timezone.now())
+        if claimed:
+            return pk
+
+    return None
+
+
+def requeue_stale_tasks(seconds):
+    """
+    Queue again the tasks that have been running for more than seconds,
+    e.g. after their worker was killed, and return how many there were.
+    """
+    return Task.objects.filter(
+        status=Task.Status.RUNNING,
+        started__lt=timezone.now() - timedelta(seconds=seconds),
+    ).update(status=Task.Status.QUEUED, started=None, progress=0, total=None)
+
+
+def fail_task(pk, message):
+    """Record a claimed task as failed, unless it already finished."""
+    Task.objects.filter(pk=pk, status=Task.Status.RUNNING).update(
+        status=Task.Status.FAILED, result=message, finished=timezone.now()
+    )
+
+
+def requeue_task(pk):
+    Task.objects.filter(pk=pk, status=Task.Status.RUNNING).update(
+        status=Task.Status.QUEUED, started=None
+    )
+
+
+def call_catalog_command(name, progress, *args, **options):
+    """Run a catalog command reporting progress, and return its output."""
+    command = load_command_class("catalog", name)
+    command.progress = progress
+    output = StringIO()
+    call_command(command, *args, stdout=output, **options)
+
+    return output.getvalue()
+
+
+def run_task(pk):
+    """Run a claimed task and record its result or traceback."""
+    task = Task.objects.get(pk=pk)
+
+    try:
+        result = TASKS[task.name](progress=Progress(pk), **task.arguments)
+    except Exception:
+        logger.exception("Task %s (%s) failed.", task.pk, task.name)
+        status, result = Task.Status.FAILED, traceback.format_exc()
+    else:
+        status, result = Task.Status.DONE, result or ""
+
+    Task.objects.filter(pk=pk).update(
+        status=status, result=result, finished=timezone.now()
+    )
+    # Worker processes outlive tasks; drop broken or expired connections.
+    close_old_connections()
+
+    return status
+
+
+@register
+def delete_object(progress, model, pk):
+    instance = apps.get_model(model).objects.filter(pk=pk).first()
+    if instance is None:
+        return "Already deleted."
+
+    deleted = delete_in_batches(instance, progress=progress)
+
+    return f"Deleted {instance} and {deleted} dependent rows."
+
+
+@register
+def import_catalog(progress, path, model="band", batch_size=2000):
+    return call_catalog_command(
+        "import_catalog", progress, path, model=model, batch_size=batch_size
+    )
+
+
+@register
+def rebuild_search_index(progress):
+    return call_catalog_command("rebuild_search_index", progress)
+
+
+@register
+def repair_relation_counts(progress):
+    return call_catalog_command("repair_relation_counts", progress)
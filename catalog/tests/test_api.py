@@ -0,0 +1,323 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from catalog.models import Band, Country, Genre, Instrument
+
+API_BANDS_URL = reverse("catalog:api-band-list")
+API_MEMBERSHIPS_URL = reverse("catalog:api-band-memberships")
+API_MUSICIANS_URL = reverse("catalog:api-musician-list")
+API_GENRES_URL = reverse("catalog:api-genre-list")
+
+
+class LoginRequiredTest(TestCase):
+    def test_login_required_for_api(self):
+        response = self.client.get(API_BANDS_URL)
+        self.assertNotEqual(response.status_code, 200)
+
+    def test_login_required_for_membership_api(self):
+        response = self.client.post(
+            API_MEMBERSHIPS_URL, {"changes": []}, "application/json"
+        )
+        self.assertNotEqual(response.status_code, 200)
+
+
+class CatalogApiTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.country = Country.objects.create(name="England")
+        self.genre = Genre.objects.create(name="Progressive rock")
+        self.instrument = Instrument.objects.create(name="Flute")
+        self.user = get_user_model().objects.create_user(
+            username="ian",
+            password="Pass12345",
+            first_name="Ian",
+            last_name="Anderson",
+            instrument=self.instrument
+        )
+        self.client.force_login(self.user)
+
+        self.band = Band.objects.create(
+            name="Jethro Tull",
+            description="Rock flute",
+            country=self.country,
+        )
+        self.band.genres.add(self.genre)
+        self.band.members.add(self.user)
+
+    def test_band_api_lists_bands(self):
+        response = self.client.get(API_BANDS_URL)
+
+        self.assertEqual(response.json(), {
+            "results": [{
+                "id": self.band.id,
+                "name": "Jethro Tull",
+                "description": "Rock flute",
+                "country": "England",
+                "genres": ["Progressive rock"],
+                "members": [self.user.id],
+            }],
+            "next": None,
+            "previous": None,
+        })
+
+    def test_musician_api_reuses_search(self):
+        get_user_model().objects.create_user(
+            username="martin",
+            password="Pass12345",
+            instrument=self.instrument
+        )
+
+        response = self.client.get(API_MUSICIANS_URL, {"musician": "ander"})
+
+        self.assertEqual(
+            [result["username"] for result in response.json()["results"]],
+            ["ian"]
+        )
+
+    def test_api_pages_link_to_next_page(self):
+        for genre_id in range(100):
+            Genre.objects.create(name=f"Genre {genre_id:03}")
+
+        first_page = self.client.get(API_GENRES_URL).json()
+        second_page = self.client.get(first_page["next"]).json()
+
+        self.assertEqual(len(first_page["results"]), 100)
+        self.assertEqual(
+            [result["name"] for result in second_page["results"]],
+            ["Progressive rock"]
+        )
+
+    @override_settings(CATALOG_CURSOR_PAGINATION=True)
+    def test_api_pages_with_cursor_pagination(self):
+        for genre_id in range(100):
+            Genre.objects.create(name=f"Genre {genre_id:03}")
+
+        first_page = self.client.get(API_GENRES_URL).json()
+        second_page = self.client.get(first_page["next"]).json()
+
+        self.assertIn("cursor=", first_page["next"])
+        self.assertEqual(
+            [result["name"] for result in second_page["results"]],
+            ["Progressive rock"]
+        )
+
+    def test_api_answers_not_modified_without_queries(self):
+        response = self.client.get(API_BANDS_URL)
+        self.client.get(API_BANDS_URL)
+
+        with self.assertNumQueries(2):
+            not_modified = self.client.get(
+                API_BANDS_URL,
+                HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(
+            self.client.get(
+                API_BANDS_URL,
+                HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+            ).status_code,
+            304
+        )
+
+    def test_api_etag_changes_with_data(self):
+        response = self.client.get(API_BANDS_URL)
+
+        self.band.genres.add(Genre.objects.create(name="Folk rock"))
+
+        changed = self.client.get(
+            API_BANDS_URL,
+            HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], response["ETag"])
+
+    def test_api_etag_changes_again_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.band.genres.add(Genre.objects.create(name="Folk rock"))
+            # A poll before the commit sees the new change time.
+            response = self.client.get(API_BANDS_URL)
+
+        changed = self.client.get(
+            API_BANDS_URL,
+            HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], response["ETag"])
+
+    def test_api_etag_changes_when_member_is_deleted(self):
+        member = get_user_model().objects.create_user(
+            username="martin",
+            password="Pass12345",
+            instrument=Instrument.objects.create(name="Guitar")
+        )
+        self.band.members.add(member)
+        response = self.client.get(API_BANDS_URL)
+
+        member.instrument.delete()
+
+        changed = self.client.get(
+            API_BANDS_URL,
+            HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()["results"][0]["members"], [
+            self.user.id
+        ])
+
+    def test_api_etag_ignores_logins(self):
+        response = self.client.get(API_MUSICIANS_URL)
+
+        self.client.login(username="ian", password="Pass12345")
+
+        self.assertEqual(
+            self.client.get(
+                API_MUSICIANS_URL,
+                HTTP_IF_NONE_MATCH=response["ETag"]
+            ).status_code,
+            304
+        )
+
+    def test_api_etag_ignores_unrelated_changes(self):
+        response = self.client.get(API_GENRES_URL)
+
+        Instrument.objects.create(name="Mandolin")
+
+        self.assertEqual(
+            self.client.get(
+                API_GENRES_URL,
+                HTTP_IF_NONE_MATCH=response["ETag"]
+            ).status_code,
+            304
+        )
+
+
+class BandMembershipApiTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.country = Country.objects.create(name="England")
+        self.rock = Genre.objects.create(name="Rock")
+        self.folk = Genre.objects.create(name="Folk")
+        instrument = Instrument.objects.create(name="Flute")
+        self.ian = get_user_model().objects.create_user(
+            username="ian",
+            password="Pass12345",
+            instrument=instrument
+        )
+        self.martin = get_user_model().objects.create_user(
+            username="martin",
+            password="Pass12345",
+            instrument=instrument
+        )
+        self.client.force_login(self.ian)
+
+        self.bands = []
+        for index in range(10):
+            band = Band.objects.create(
+                name=f"Band {index}",
+                description="Band",
+                country=self.country,
+            )
+            band.genres.add(self.rock)
+            band.members.add(self.ian)
+            self.bands.append(band)
+
+    def post_changes(self, changes):
+        return self.client.post(
+            API_MEMBERSHIPS_URL, {"changes": changes}, "application/json"
+        )
+
+    def swap_changes(self, bands):
+        return [
+            {
+                "band": band.pk,
+                "genres": {"add": [self.folk.pk], "remove": [self.rock.pk]},
+                "members": {"add": [self.martin.pk], "remove": [self.ian.pk]},
+            }
+            for band in bands
+        ]
+
+    def test_applies_deltas_and_updates_counters(self):
+        response = self.post_changes(self.swap_changes(self.bands[:3]))
+
+        self.assertEqual(response.json(), {
+            "genres": {"added": 3, "removed": 3},
+            "members": {"added": 3, "removed": 3},
+        })
+        self.assertEqual(
+            set(self.folk.bands.values_list("pk", flat=True)),
+            {band.pk for band in self.bands[:3]}
+        )
+        for obj, count in (
+            (self.rock, 7), (self.folk, 3), (self.ian, 7), (self.martin, 3)
+        ):
+            obj.refresh_from_db()
+            self.assertEqual(obj.band_count, count)
+
+        band = Band.objects.get(pk=self.bands[0].pk)
+        self.assertEqual((band.genre_count, band.member_count), (1, 1))
+
+    def test_existing_and_missing_links_are_skipped(self):
+        response = self.post_changes([{
+            "band": self.bands[0].pk,
+            "genres": {"add": [self.rock.pk], "remove": [self.folk.pk]},
+        }])
+
+        self.assertEqual(
+            response.json()["genres"], {"added": 0, "removed": 0}
+        )
+        self.assertEqual(self.bands[0].genres.count(), 1)
+
+    def test_query_count_does_not_grow_with_batch(self):
+        with CaptureQueriesContext(connection) as small:
+            self.post_changes(self.swap_changes(self.bands[:2]))
+        with CaptureQueriesContext(connection) as large:
+            self.post_changes(self.swap_changes(self.bands[2:]))
+
+        self.assertEqual(len(large), len(small))
+
+    def test_invalidates_cached_band_pages(self):
+        url = reverse("catalog:band-detail-view", args=[self.bands[0].pk])
+        self.assertNotContains(self.client.get(url), "Folk")
+
+        self.post_changes(self.swap_changes(self.bands[:1]))
+
+        self.assertContains(self.client.get(url), "Folk")
+
+    def test_rejects_invalid_changes_without_writing(self):
+        for changes in (
+            [],
+            [{"genres": {"add": [self.folk.pk]}}],
+            [{"band": self.bands[0].pk, "country": {"add": [1]}}],
+            [{"band": self.bands[0].pk, "genres": {"add": ["folk"]}}],
+            [{
+                "band": self.bands[0].pk,
+                "genres": {"add": [self.folk.pk], "remove": [self.folk.pk]},
+            }],
+            [
+                {"band": self.bands[0].pk, "genres": {"add": [self.folk.pk]}},
+                {"band": 999, "genres": {"add": [self.folk.pk]}},
+            ],
+            [{"band": 10 ** 30, "genres": {"add": [self.folk.pk]}}],
+            [{"band": self.bands[0].pk, "members": {"add": [2 ** 63]}}],
+        ):
+            with self.subTest(changes=changes):
+                response = self.post_changes(changes)
+
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("error", response.json())
+
+        self.assertFalse(self.folk.bands.exists())
+
+    def test_rejects_malformed_json(self):
+        response = self.client.post(
+            API_MEMBERSHIPS_URL, "{", "application/json"
+        )
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,130 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from catalog.models import Band, Country, Genre, Instrument
+
+ASYNC_INDEX_URL = reverse("catalog:async-index")
+ASYNC_BANDS_URL = reverse("catalog:async-band-list-view")
+ASYNC_MUSICIANS_URL = reverse("catalog:async-musician-list-view")
+
+
+def query_count(response):
+    return int(re.search(
+        r'desc="(\d+) queries"', response["Server-Timing"]
+    ).group(1))
+
+
+class AsyncLoginRequiredTest(TestCase):
+    async def test_login_required_for_async_views(self):
+        for url in (ASYNC_INDEX_URL, ASYNC_BANDS_URL, ASYNC_MUSICIANS_URL):
+            response = await self.async_client.get(url)
+            self.assertEqual(response.status_code, 302)
+            self.assertTrue(response.url.startswith(reverse("login")))
+
+
+class AsyncViewsTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        country = Country.objects.create(name="Sweden")
+        genre = Genre.objects.create(name="Pop")
+        self.instrument = Instrument.objects.create(name="Piano")
+        self.user = get_user_model().objects.create_user(
+            username="benny",
+            password="Pass12345",
+            first_name="Benny",
+            last_name="Andersson",
+            instrument=self.instrument
+        )
+        self.async_client.force_login(self.user)
+
+        for index in range(7):
+            band = Band.objects.create(
+                name=f"Band {index}",
+                description=f"Description {index}",
+                country=country,
+            )
+            band.genres.add(genre)
+            band.members.add(self.user)
+
+        self.band = Band.objects.get(name="Band 0")
+
+    async def test_async_index_shows_counters(self):
+        response = await self.async_client.get(ASYNC_INDEX_URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["num_bands"], 7)
+        self.assertEqual(response.context["num_musicians"], 1)
+
+    async def test_async_band_list_is_paginated(self):
+        response = await self.async_client.get(ASYNC_BANDS_URL, {"page": 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [band.name for band in response.context["band_list"]],
+            ["Band 5", "Band 6"]
+        )
+        self.assertContains(response, "[Sweden]")
+        self.assertContains(response, "Pop")
+
+    async def test_async_band_list_query_count_does_not_depend_on_rows(self):
+        # Facet counts are computed once and cached, and so are the rows.
+        await self.async_client.get(ASYNC_BANDS_URL)
+        await self.async_client.get(ASYNC_BANDS_URL, {"page": 2})
+
+        first = await self.async_client.get(ASYNC_BANDS_URL)
+        second = await self.async_client.get(ASYNC_BANDS_URL, {"page": 2})
+
+        self.assertEqual(query_count(first), query_count(second))
+
+    async def test_async_band_list_invalid_page(self):
+        response = await self.async_client.get(ASYNC_BANDS_URL, {"page": 9})
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(CATALOG_CURSOR_PAGINATION=True)
+    async def test_async_band_list_cursor_pagination(self):
+        response = await self.async_client.get(ASYNC_BANDS_URL)
+        page = response.context["page_obj"]
+
+        response = await self.async_client.get(
+            ASYNC_BANDS_URL, {"cursor": page.next_cursor}
+        )
+        self.assertEqual(
+            [band.name for band in response.context["band_list"]],
+            ["Band 5", "Band 6"]
+        )
+
+    async def test_async_musician_list_search(self):
+        response = await self.async_client.get(
+            ASYNC_MUSICIANS_URL, {"musician": "ben"}
+        )
+
+        self.assertEqual(
+            [musician.username for musician in response.context[
+                "musician_list"
+            ]],
+            ["benny"]
+        )
+        self.assertContains(response, "Piano")
+
+    async def test_async_band_detail(self):
+        url = reverse("catalog:async-band-detail-view", args=[self.band.id])
+        response = await self.async_client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Benny Andersson")
+        self.assertContains(response, "( Piano )")
+
+        cached = await self.async_client.get(url)
+        self.assertEqual(cached.content, response.content)
+        # Only the session and user lookups of the login check.
+        self.assertEqual(query_count(cached), 2)
+
+    async def test_async_band_detail_not_found(self):
+        response = await self.async_client.get(
+            reverse("catalog:async-band-detail-view", args=[0])
+        )
+        self.assertEqual(response.status_code, 404)
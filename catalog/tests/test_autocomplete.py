@@ -0,0 +1,147 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from catalog.autocomplete import PrefixIndex
+from catalog.models import Band, Country, Genre, Instrument
+
+AUTOCOMPLETE_URL = reverse("catalog:autocomplete")
+
+
+class LoginRequiredTest(TestCase):
+    def test_login_required_for_autocomplete(self):
+        response = self.client.get(AUTOCOMPLETE_URL, {"q": "pink"})
+        self.assertNotEqual(response.status_code, 200)
+
+
+class AutocompleteViewTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.country = Country.objects.create(name="England")
+        self.genre = Genre.objects.create(name="Progressive rock")
+        Genre.objects.create(name="Punk")
+        self.user = get_user_model().objects.create_user(
+            username="gilmour",
+            password="Pass12345",
+            first_name="David",
+            last_name="Gilmour",
+            instrument=Instrument.objects.create(name="Guitar")
+        )
+        self.client.force_login(self.user)
+
+        self.band = Band.objects.create(
+            name="Pink Floyd",
+            description="Psychedelic rock",
+            country=self.country,
+        )
+        Band.objects.create(
+            name="Genesis",
+            description="Progressive rock",
+            country=self.country,
+        )
+
+    def test_matches_prefix_case_insensitively(self):
+        response = self.client.get(AUTOCOMPLETE_URL, {"q": "PINK"})
+
+        self.assertEqual(response.json(), {
+            "bands": [{"id": self.band.id, "name": "Pink Floyd"}],
+            "musicians": [],
+            "genres": [],
+        })
+
+    def test_matches_musician_by_any_name(self):
+        for query in ("dav", "gilm", "david gil"):
+            response = self.client.get(
+                AUTOCOMPLETE_URL, {"q": query, "type": "musicians"}
+            )
+            self.assertEqual(
+                response.json(),
+                {"musicians": [{"id": self.user.id, "name": "David Gilmour"}]}
+            )
+
+    def test_limit_and_type(self):
+        response = self.client.get(
+            AUTOCOMPLETE_URL, {"q": "p", "type": "genres", "limit": 1}
+        )
+
+        self.assertEqual(
+            response.json(),
+            {"genres": [{"id": self.genre.id, "name": "Progressive rock"}]}
+        )
+
+    def test_unknown_type_is_rejected(self):
+        response = self.client.get(
+            AUTOCOMPLETE_URL, {"q": "p", "type": "countries"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_index_follows_updates_and_deletes(self):
+        self.client.get(AUTOCOMPLETE_URL, {"q": "pink"})
+
+        self.band.name = "Floyd"
+        self.band.save()
+        Genre.objects.filter(name="Punk").get().delete()
+
+        response = self.client.get(AUTOCOMPLETE_URL, {"q": "p"})
+        self.assertEqual(response.json()["bands"], [])
+        self.assertEqual(
+            response.json()["genres"],
+            [{"id": self.genre.id, "name": "Progressive rock"}]
+        )
+
+        response = self.client.get(AUTOCOMPLETE_URL, {"q": "flo"})
+        self.assertEqual(
+            response.json()["bands"],
+            [{"id": self.band.id, "name": "Floyd"}]
+        )
+
+    def test_rebuilds_after_bulk_changes(self):
+        self.client.get(AUTOCOMPLETE_URL, {"q": "pink"})
+        Band.objects.filter(pk=self.band.pk).update(name="Floyd")
+
+        cache.clear()
+        response = self.client.get(AUTOCOMPLETE_URL, {"q": "flo"})
+        self.assertEqual(
+            response.json()["bands"],
+            [{"id": self.band.id, "name": "Floyd"}]
+        )
+
+    def test_warm_index_answers_without_catalog_queries(self):
+        self.client.get(AUTOCOMPLETE_URL, {"q": "pink"})
+
+        with self.assertNumQueries(2):
+            # Only the session and user lookups of the login check.
+            self.client.get(AUTOCOMPLETE_URL, {"q": "gen"})
+
+    def test_update_after_another_process_rebuilds(self):
+        # Two processes with their own copy of the index.
+        first = PrefixIndex("bands", Band, ("name",))
+        second = PrefixIndex("bands", Band, ("name",))
+        first.search("p")
+        second.search("p")
+        genesis = Band.objects.get(name="Genesis")
+
+        Band.objects.filter(pk=self.band.pk).update(name="Floyd")
+        self.band.name = "Floyd"
+        first.update(self.band)
+        Band.objects.filter(pk=genesis.pk).update(name="Gabriel")
+        genesis.name = "Gabriel"
+        second.update(genesis)
+
+        for index in (first, second):
+            self.assertEqual(
+                [band["name"] for band in index.search("flo")], ["Floyd"]
+            )
+            self.assertEqual(
+                [band["name"] for band in index.search("gab")], ["Gabriel"]
+            )
+
+    def test_transactional_bump_is_repeated_on_commit(self):
+        index = PrefixIndex("bands", Band, ("name",))
+        index.search("p")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            generation = index.bump_generation()
+
+        self.assertNotIn(cache.get(index.generation_key), (None, generation))
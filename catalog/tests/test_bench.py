@@ -0,0 +1,91 @@
+import asyncio
+
+from django.http import HttpResponse
+from django.test import TestCase
+from catalog.bench import (
+    generate_catalog,
+    percentile,
+    run_clients,
+    run_threads,
+)
+from catalog.models import Band, Country, Genre, Instrument, Musician
+from catalog.search import search
+
+
+class GenerateCatalogTest(TestCase):
+    def test_generate_catalog_creates_requested_sizes(self):
+        generate_catalog(
+            bands=30,
+            musicians=50,
+            genres=5,
+            countries=4,
+            instruments=3,
+            genres_per_band=(1, 2),
+            members_per_band=(2, 3),
+        )
+
+        self.assertEqual(Band.objects.count(), 30)
+        self.assertEqual(Musician.objects.count(), 50)
+        self.assertEqual(Genre.objects.count(), 5)
+        self.assertEqual(Country.objects.count(), 4)
+        self.assertEqual(Instrument.objects.count(), 3)
+
+        for band in Band.objects.prefetch_related("genres", "members"):
+            self.assertIn(len(band.genres.all()), (1, 2))
+            self.assertIn(len(band.members.all()), (2, 3))
+
+    def test_generated_catalog_is_searchable(self):
+        generate_catalog(bands=15, musicians=10, genres=2, countries=2)
+
+        self.assertEqual(
+            list(search(Band.objects.all(), "number 12")),
+            [Band.objects.get(name="Band 12")]
+        )
+
+
+class PercentileTest(TestCase):
+    def test_percentile_uses_nearest_rank(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+
+
+class RunClientsTest(TestCase):
+    def test_run_clients_sends_every_request(self):
+        requested = []
+
+        async def application(scope, receive, send):
+            await receive()
+            requested.append((scope["path"], scope["query_string"]))
+            await send({"type": "http.response.start", "status": 200})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        wall, durations = asyncio.run(run_clients(
+            application, ["/a/?page=2", "/b/", "/c/"], "sessionid=x", 2, 0
+        ))
+
+        self.assertEqual(len(durations), 3)
+        self.assertCountEqual(
+            requested, [("/a/", b"page=2"), ("/b/", b""), ("/c/", b"")]
+        )
+
+
+class RunThreadsTest(TestCase):
+    def test_run_threads_sends_every_request(self):
+        requested = []
+
+        def handler(environ, start_response):
+            requested.append((environ["PATH_INFO"], environ["QUERY_STRING"]))
+            return HttpResponse("ok")
+
+        wall, durations = run_threads(
+            handler, ["/a/?page=2", "/b/", "/c/"], "sessionid=x", 2
+        )
+
+        self.assertEqual(len(durations), 3)
+        self.assertCountEqual(
+            requested, [("/a/", "page=2"), ("/b/", ""), ("/c/", "")]
+        )
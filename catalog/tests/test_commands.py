@@ -0,0 +1,124 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from catalog.models import Band, Country, Genre, Instrument
+from catalog.search import search
+
+
+class ImportCatalogCommandTest(TestCase):
+    def setUp(self) -> None:
+        self.instrument = Instrument.objects.create(name="Guitar")
+        self.musician = get_user_model().objects.create_user(
+            username="kirk",
+            password="Pass12345",
+            instrument=self.instrument
+        )
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write_file(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return path
+
+    def import_file(self, path, *args):
+        stderr = StringIO()
+        call_command(
+            "import_catalog", path, *args, stdout=StringIO(), stderr=stderr
+        )
+        return stderr.getvalue()
+
+    def test_import_warns_about_process_local_cache(self):
+        path = self.write_file("empty.jsonl", "")
+
+        self.assertNotIn("local to this process", self.import_file(path))
+        with override_settings(CACHES={"default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }}):
+            self.assertIn("local to this process", self.import_file(path))
+
+    def test_import_bands_from_json_lines(self):
+        Country.objects.create(name="USA")
+        records = [
+            {
+                "name": "Metallica",
+                "description": "Thrash metal from Los Angeles",
+                "country": "USA",
+                "genres": ["Thrash metal", "Heavy metal"],
+                "members": ["kirk"],
+            },
+            {
+                "name": "Sepultura",
+                "description": "Thrash metal from Belo Horizonte",
+                "country": "Brazil",
+                "genres": ["Thrash metal"],
+            },
+        ]
+        path = self.write_file(
+            "bands.jsonl",
+            "\n".join(json.dumps(record) for record in records)
+        )
+
+        self.import_file(path, "--batch-size", "1")
+
+        metallica = Band.objects.get(name="Metallica")
+        self.assertEqual(metallica.country.name, "USA")
+        self.assertEqual(
+            sorted(metallica.genres.values_list("name", flat=True)),
+            ["Heavy metal", "Thrash metal"]
+        )
+        self.assertEqual(list(metallica.members.all()), [self.musician])
+        self.assertEqual(
+            (metallica.genre_count, metallica.member_count), (2, 1)
+        )
+        self.assertEqual(
+            Genre.objects.get(name="Thrash metal").band_count, 2
+        )
+        self.assertEqual(
+            Band.objects.get(name="Sepultura").country.name,
+            "Brazil"
+        )
+        self.assertEqual(Genre.objects.count(), 2)
+        self.assertEqual(
+            list(search(Band.objects.all(), "Belo Horizonte")),
+            [Band.objects.get(name="Sepultura")]
+        )
+
+    def test_import_bands_from_csv_skips_existing(self):
+        path = self.write_file(
+            "bands.csv",
+            "name,description,country,genres,members\n"
+            "Anthrax,New York thrash,USA,Thrash metal;Crossover,kirk\n"
+            "Anthrax,Duplicate,USA,,\n"
+        )
+
+        self.import_file(path)
+        self.import_file(path)
+
+        anthrax = Band.objects.get(name="Anthrax")
+        self.assertEqual(anthrax.description, "New York thrash")
+        self.assertEqual(anthrax.genres.count(), 2)
+        self.assertEqual(Band.objects.count(), 1)
+
+    def test_import_musicians(self):
+        path = self.write_file(
+            "musicians.csv",
+            "username,first_name,last_name,instrument\n"
+            "lars,Lars,Ulrich,Drums\n"
+            "kirk,Kirk,Hammett,Guitar\n"
+        )
+
+        self.import_file(path, "--model", "musician")
+
+        lars = get_user_model().objects.get(username="lars")
+        self.assertEqual(lars.instrument.name, "Drums")
+        self.assertFalse(lars.has_usable_password())
+        self.assertEqual(get_user_model().objects.count(), 2)
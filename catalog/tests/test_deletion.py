@@ -0,0 +1,154 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from catalog.deletion import delete_impact, delete_in_batches
+from catalog.models import Band, Country, Genre, Instrument, Musician, Task
+from catalog.search import search
+
+
+class DeleteInBatchesTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.norway = Country.objects.create(name="Norway")
+        self.sweden = Country.objects.create(name="Sweden")
+        self.genre = Genre.objects.create(name="Black metal")
+        self.guitar = Instrument.objects.create(name="Guitar")
+        self.drums = Instrument.objects.create(name="Drums")
+        self.guitarist = get_user_model().objects.create_user(
+            username="euronymous",
+            password="Pass12345",
+            instrument=self.guitar
+        )
+        self.drummer = get_user_model().objects.create_user(
+            username="hellhammer",
+            password="Pass12345",
+            instrument=self.drums
+        )
+
+        for index in range(5):
+            band = Band.objects.create(
+                name=f"Norwegian band {index}",
+                description="Band",
+                country=self.norway,
+            )
+            band.genres.add(self.genre)
+            band.members.add(self.guitarist, self.drummer)
+
+        self.swedish_band = Band.objects.create(
+            name="Swedish band", description="Band", country=self.sweden
+        )
+        self.swedish_band.genres.add(self.genre)
+        self.swedish_band.members.add(self.guitarist)
+
+    def test_delete_impact(self):
+        with self.assertNumQueries(1):
+            impact = delete_impact(self.norway)
+
+        self.assertEqual(impact, [
+            ("bands", 5),
+            ("band memberships", 10),
+            ("band genre links", 5),
+        ])
+        self.assertEqual(
+            delete_impact(self.guitar),
+            [("musicians", 1), ("band memberships", 6)]
+        )
+        self.assertEqual(delete_impact(self.genre), [("band genre links", 6)])
+
+    def test_delete_country_in_batches(self):
+        deleted = delete_in_batches(self.norway, batch_size=2)
+
+        self.assertEqual(deleted, 5)
+        self.assertFalse(Country.objects.filter(pk=self.norway.pk).exists())
+        self.assertEqual(list(Band.objects.all()), [self.swedish_band])
+        self.assertEqual(
+            list(search(Band.objects.all(), "Norwegian")), []
+        )
+        self.assertEqual(Band.members.through.objects.count(), 1)
+
+        self.genre.refresh_from_db()
+        self.guitarist.refresh_from_db()
+        self.drummer.refresh_from_db()
+        self.assertEqual(self.genre.band_count, 1)
+        self.assertEqual(self.guitarist.band_count, 1)
+        self.assertEqual(self.drummer.band_count, 0)
+
+    def test_batch_transactions_write_first(self):
+        with CaptureQueriesContext(connection) as queries:
+            delete_in_batches(self.norway, batch_size=2)
+
+        statements = [query["sql"] for query in queries]
+        first_statements = [
+            statements[index + 1]
+            for index, sql in enumerate(statements)
+            if sql.startswith("SAVEPOINT")
+        ]
+
+        self.assertEqual(len(first_statements), 5)
+        for sql in first_statements:
+            self.assertTrue(sql.startswith("UPDATE"), sql)
+
+    def test_delete_instrument_in_batches(self):
+        delete_in_batches(self.drums, batch_size=1)
+
+        self.assertFalse(Musician.objects.filter(pk=self.drummer.pk).exists())
+        self.assertFalse(Instrument.objects.filter(pk=self.drums.pk).exists())
+        self.assertEqual(
+            set(Band.objects.values_list("member_count", flat=True)), {1}
+        )
+
+    def test_delete_genre_in_batches(self):
+        deleted = delete_in_batches(self.genre, batch_size=4)
+
+        self.assertEqual(deleted, 6)
+        self.assertFalse(Genre.objects.exists())
+        self.assertEqual(
+            set(Band.objects.values_list("genre_count", flat=True)), {0}
+        )
+
+
+class DeleteViewImpactTest(TestCase):
+    def setUp(self) -> None:
+        instrument = Instrument.objects.create(name="Guitar")
+        self.user = get_user_model().objects.create_user(
+            username="UserName",
+            password="Pass12345",
+            instrument=instrument
+        )
+        self.client.force_login(self.user)
+
+        self.country = Country.objects.create(name="Norway")
+        for index in range(3):
+            Band.objects.create(
+                name=f"Band {index}", description="Band", country=self.country
+            )
+        self.url = reverse("catalog:country-delete", args=[self.country.id])
+
+    def test_confirm_page_shows_impact(self):
+        response = self.client.get(self.url)
+
+        self.assertContains(response, "<li>3 bands</li>", html=True)
+        self.assertContains(response, "<li>0 band memberships</li>", html=True)
+
+    def test_small_delete_runs_in_request(self):
+        response = self.client.post(self.url)
+
+        self.assertRedirects(response, reverse("catalog:country-list-view"))
+        self.assertFalse(Country.objects.exists())
+        self.assertFalse(Band.objects.exists())
+
+    @override_settings(CATALOG_BACKGROUND_DELETE_THRESHOLD=2)
+    def test_large_delete_is_queued(self):
+        response = self.client.post(self.url)
+
+        task = Task.objects.get()
+        self.assertRedirects(response, task.get_absolute_url())
+        self.assertEqual(task.name, "delete_object")
+        self.assertEqual(
+            task.arguments, {"model": "catalog.country", "pk": self.country.pk}
+        )
+        self.assertEqual(Band.objects.count(), 3)
@@ -0,0 +1,171 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from catalog.detail_cache import detail_version_key, get_detail_version
+from catalog.models import Band, Country, Genre, Instrument
+
+
+class DetailPageCacheTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.country = Country.objects.create(name="Germany")
+        self.genre = Genre.objects.create(name="Krautrock")
+        self.instrument = Instrument.objects.create(name="Synthesizer")
+        self.user = get_user_model().objects.create_user(
+            username="schneider",
+            password="Pass12345",
+            first_name="Florian",
+            last_name="Schneider",
+            instrument=self.instrument
+        )
+        self.client.force_login(self.user)
+
+        self.band = Band.objects.create(
+            name="Kraftwerk",
+            description="Electronic",
+            country=self.country,
+        )
+        self.band.genres.add(self.genre)
+        self.band.members.add(self.user)
+
+        self.band_url = reverse(
+            "catalog:band-detail-view", args=[self.band.id]
+        )
+        self.musician_url = reverse(
+            "catalog:musician-detail-view", args=[self.user.id]
+        )
+
+    def assertCachedPage(self, url, text):
+        self.client.get(url)
+
+        # Only the session and user lookups of the login check.
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+
+        self.assertContains(response, text)
+
+    def test_detail_pages_are_served_from_cache(self):
+        self.assertCachedPage(self.band_url, "Kraftwerk")
+        self.assertCachedPage(self.musician_url, "Florian")
+
+    def test_pages_follow_band_changes(self):
+        self.client.get(self.band_url)
+        self.client.get(self.musician_url)
+
+        self.band.name = "Organisation"
+        self.band.save()
+
+        self.assertContains(self.client.get(self.band_url), "Organisation")
+        self.assertContains(
+            self.client.get(self.musician_url), "Organisation"
+        )
+
+    def test_pages_follow_related_object_changes(self):
+        self.client.get(self.band_url)
+        self.client.get(self.musician_url)
+
+        self.country.name = "West Germany"
+        self.country.save()
+        self.instrument.name = "Flute"
+        self.instrument.save()
+        self.genre.name = "Electronic"
+        self.genre.save()
+
+        band_response = self.client.get(self.band_url)
+        self.assertContains(band_response, "West Germany")
+        self.assertContains(band_response, "Flute")
+        genre_url = reverse("catalog:genre-detail-view", args=[self.genre.id])
+        self.assertContains(
+            band_response,
+            f'<a class="text-white" href="{genre_url}">Electronic</a>',
+            html=True
+        )
+        musician_response = self.client.get(self.musician_url)
+        self.assertContains(musician_response, "West Germany")
+        self.assertContains(musician_response, "Flute")
+
+    def test_pages_follow_membership_changes(self):
+        self.client.get(self.band_url)
+        self.client.get(self.musician_url)
+
+        self.user.bands.clear()
+
+        self.assertNotContains(
+            self.client.get(self.band_url), self.musician_url
+        )
+        self.assertNotContains(
+            self.client.get(self.musician_url), "Kraftwerk"
+        )
+
+        self.band.members.add(self.user)
+
+        self.assertContains(self.client.get(self.band_url), self.musician_url)
+        self.assertContains(self.client.get(self.musician_url), "Kraftwerk")
+
+    def test_pages_cached_before_commit_are_invalidated_again(self):
+        key = detail_version_key(Band, self.band.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.band.name = "Organisation"
+            self.band.save()
+            self.assertIsNone(cache.get(key))
+            # A concurrent request caching the page as last committed.
+            get_detail_version(Band, self.band.pk)
+
+        self.assertIsNone(cache.get(key))
+
+    def test_pages_follow_deletes(self):
+        self.client.get(self.musician_url)
+
+        self.genre.delete()
+        self.band.delete()
+
+        self.assertNotContains(
+            self.client.get(self.musician_url), "Kraftwerk"
+        )
+        self.assertEqual(self.client.get(self.band_url).status_code, 404)
+
+    def test_unrelated_changes_keep_pages_cached(self):
+        self.client.get(self.band_url)
+        Band.objects.create(
+            name="Neu!",
+            description="Motorik",
+            country=Country.objects.create(name="Austria"),
+        ).members.add(
+            get_user_model().objects.create_user(
+                username="rother",
+                password="Pass12345",
+                instrument=Instrument.objects.create(name="Guitar")
+            )
+        )
+
+        with self.assertNumQueries(2):
+            self.client.get(self.band_url)
+
+    def test_cached_fragments_are_shared_by_users(self):
+        self.client.get(self.band_url)
+        other = get_user_model().objects.create_user(
+            username="hutter",
+            password="Pass12345",
+            instrument=self.instrument
+        )
+        self.client.force_login(other)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.band_url)
+
+        self.assertContains(response, "hutter")
+        self.assertContains(response, "Kraftwerk")
+
+    def test_cached_pages_report_render_time(self):
+        self.client.get(self.band_url)
+
+        timing = self.client.get(self.band_url)["Server-Timing"]
+
+        self.assertGreater(
+            float(re.search(r"tpl;dur=(\d+\.\d)", timing).group(1)), 0
+        )
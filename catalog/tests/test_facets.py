@@ -0,0 +1,186 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import TestCase
+from django.urls import reverse
+
+from catalog.facets import (
+    count_facets,
+    parse_facet_selection,
+    toggle_facet_query,
+)
+from catalog.models import Band, Country, Genre, Instrument
+
+BANDS_URL = reverse("catalog:band-list-view")
+
+
+class BandFacetsTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.sweden = Country.objects.create(name="Sweden")
+        self.norway = Country.objects.create(name="Norway")
+        self.pop = Genre.objects.create(name="Pop")
+        self.metal = Genre.objects.create(name="Metal")
+        self.piano = Instrument.objects.create(name="Piano")
+        self.drums = Instrument.objects.create(name="Drums")
+        self.pianist = get_user_model().objects.create_user(
+            username="benny",
+            password="Pass12345",
+            instrument=self.piano
+        )
+        self.drummer = get_user_model().objects.create_user(
+            username="hellhammer",
+            password="Pass12345",
+            instrument=self.drums
+        )
+        self.client.force_login(self.pianist)
+
+        self.abba = self.create_band(
+            "ABBA", self.sweden, [self.pop], [self.pianist]
+        )
+        self.roxette = self.create_band(
+            "Roxette", self.sweden, [self.pop], [self.drummer]
+        )
+        self.mayhem = self.create_band(
+            "Mayhem", self.norway, [self.metal], [self.drummer]
+        )
+        self.aha = self.create_band(
+            "a-ha", self.norway, [self.pop], [self.pianist, self.drummer]
+        )
+
+    @staticmethod
+    def create_band(name, country, genres, members):
+        band = Band.objects.create(
+            name=name, description=name, country=country
+        )
+        band.genres.set(genres)
+        band.members.set(members)
+        return band
+
+    def band_names(self, params):
+        response = self.client.get(BANDS_URL, params)
+        return sorted(band.name for band in response.context["band_list"])
+
+    def test_filters_combine_across_facets(self):
+        self.assertEqual(
+            self.band_names({"genre": self.pop.pk}),
+            ["ABBA", "Roxette", "a-ha"]
+        )
+        self.assertEqual(
+            self.band_names({
+                "genre": self.pop.pk, "instrument": self.piano.pk
+            }),
+            ["ABBA", "a-ha"]
+        )
+        self.assertEqual(
+            self.band_names({
+                "country": [self.sweden.pk, self.norway.pk],
+                "instrument": self.piano.pk,
+            }),
+            ["ABBA", "a-ha"]
+        )
+
+    def test_unfiltered_counts(self):
+        total, facets = count_facets({})
+
+        self.assertEqual(total, 4)
+        self.assertEqual(facets["genre"], [
+            (self.pop.pk, "Pop", 3), (self.metal.pk, "Metal", 1)
+        ])
+        self.assertEqual(facets["country"], [
+            (self.norway.pk, "Norway", 2), (self.sweden.pk, "Sweden", 2)
+        ])
+        self.assertEqual(facets["instrument"], [
+            (self.drums.pk, "Drums", 3), (self.piano.pk, "Piano", 2)
+        ])
+
+    def test_facet_counts_ignore_own_selection(self):
+        total, facets = count_facets({"country": {self.norway.pk}})
+
+        self.assertEqual(total, 2)
+        # Other countries stay selectable.
+        self.assertEqual(facets["country"], [
+            (self.norway.pk, "Norway", 2), (self.sweden.pk, "Sweden", 2)
+        ])
+        self.assertEqual(facets["genre"], [
+            (self.metal.pk, "Metal", 1), (self.pop.pk, "Pop", 1)
+        ])
+        self.assertEqual(facets["instrument"], [
+            (self.drums.pk, "Drums", 2), (self.piano.pk, "Piano", 1)
+        ])
+
+    def test_selected_value_without_bands_is_listed(self):
+        total, facets = count_facets({
+            "genre": {self.metal.pk}, "instrument": {self.piano.pk}
+        })
+
+        self.assertEqual(total, 0)
+        self.assertIn((self.metal.pk, "Metal", 0), facets["genre"])
+
+    def test_counts_are_cached_until_bands_change(self):
+        count_facets({"genre": {self.pop.pk}})
+
+        with self.assertNumQueries(0):
+            count_facets({"genre": {self.pop.pk}})
+
+        self.roxette.delete()
+        total, facets = count_facets({"genre": {self.pop.pk}})
+        self.assertEqual(total, 2)
+        self.assertEqual(
+            dict((pk, count) for pk, _, count in facets["country"]),
+            {self.sweden.pk: 1, self.norway.pk: 1}
+        )
+
+    def test_counts_are_kept_on_login(self):
+        count_facets({"genre": {self.pop.pk}})
+
+        self.client.login(username="hellhammer", password="Pass12345")
+
+        with self.assertNumQueries(0):
+            count_facets({"genre": {self.pop.pk}})
+
+    def test_non_decimal_selection_is_ignored(self):
+        self.assertEqual(
+            parse_facet_selection(QueryDict("genre=²&genre=x&genre=3")),
+            {"genre": {3}}
+        )
+        self.assertEqual(
+            self.client.get(BANDS_URL, {"genre": "²"}).status_code, 200
+        )
+
+    def test_out_of_range_selection_is_ignored(self):
+        too_large = str(10 ** 30)
+
+        self.assertEqual(
+            parse_facet_selection(QueryDict(f"genre={too_large}&genre=3")),
+            {"genre": {3}}
+        )
+        self.assertEqual(
+            self.client.get(BANDS_URL, {"genre": too_large}).status_code, 200
+        )
+
+    def test_counts_follow_name_search(self):
+        total, facets = count_facets({}, "ABBA")
+
+        self.assertEqual(total, 1)
+        self.assertEqual(facets["genre"], [(self.pop.pk, "Pop", 1)])
+
+    def test_band_list_renders_facet_links(self):
+        response = self.client.get(BANDS_URL, {"genre": self.pop.pk})
+
+        self.assertContains(response, "Pop (3) ✕")
+        self.assertContains(
+            response,
+            f'href="?genre={self.pop.pk}&amp;country={self.norway.pk}"'
+        )
+
+    def test_toggle_facet_query(self):
+        query = QueryDict("genre=1&genre=2&page=3&sort=popular")
+
+        self.assertEqual(
+            toggle_facet_query(query, "genre", 2), "genre=1&sort=popular"
+        )
+        self.assertEqual(
+            toggle_facet_query(query, "country", 5),
+            "genre=1&genre=2&sort=popular&country=5"
+        )
@@ -0,0 +1,43 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from catalog.models import Instrument
+
+GENRES_LIST_URL = reverse("catalog:genre-list-view")
+
+
+class TimingMiddlewareTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="T_UserName",
+            password="T_Pass12345",
+            instrument=Instrument.objects.create(name="Oboe"),
+        )
+        self.client.force_login(self.user)
+
+    def test_server_timing_header_reports_queries_and_render(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(GENRES_LIST_URL)
+
+        timing = response["Server-Timing"]
+
+        self.assertIn('desc="3 queries"', timing)
+        self.assertRegex(timing, r"db;dur=\d+\.\d")
+        self.assertRegex(timing, r"total;dur=\d+\.\d")
+        self.assertGreater(
+            float(re.search(r"tpl;dur=(\d+\.\d)", timing).group(1)), 0
+        )
+
+    @override_settings(CATALOG_SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged_with_url_name(self):
+        with self.assertLogs("catalog.timing", "WARNING") as logs:
+            self.client.get(GENRES_LIST_URL)
+
+        self.assertIn("catalog:genre-list-view", logs.output[0])
+        self.assertIn("3 queries", logs.output[0])
+
+    def test_fast_requests_are_not_logged_as_slow(self):
+        with self.assertNoLogs("catalog.timing", "WARNING"):
+            self.client.get(GENRES_LIST_URL)
@@ -0,0 +1,129 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from catalog.models import Band, Country, Instrument
+from catalog.pagination import CursorPaginator
+
+BANDS_LIST_URL = reverse("catalog:band-list-view")
+MUSICIANS_LIST_URL = reverse("catalog:musician-list-view")
+
+
+@override_settings(CATALOG_CURSOR_PAGINATION=True)
+class CursorPaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        number_of_bands = 12
+
+        country = Country.objects.create(name="Iceland")
+
+        for band_id in range(number_of_bands):
+            Band.objects.create(
+                name=f"Band {band_id:02}",
+                description=f"Description {band_id}",
+                country=country,
+            )
+
+    def setUp(self) -> None:
+        self.instrument = Instrument.objects.create(name="Harp")
+        self.user = get_user_model().objects.create_user(
+            username="C_UserName",
+            password="C_Pass12345",
+            instrument=self.instrument
+        )
+        self.client.force_login(self.user)
+
+    def walk(self, url, params=None, direction="next"):
+        pages = []
+        params = dict(params or {})
+
+        while True:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            page = response.context["page_obj"]
+            pages.append(list(page.object_list))
+
+            cursor = getattr(page, f"{direction}_cursor")
+            if cursor is None:
+                return pages, page
+
+            params["cursor"] = cursor
+
+    def test_cursor_pages_cover_all_bands_in_order(self):
+        pages, _ = self.walk(BANDS_LIST_URL)
+
+        self.assertEqual([len(page) for page in pages], [5, 5, 2])
+        self.assertEqual(
+            [band for page in pages for band in page],
+            list(Band.objects.all())
+        )
+
+    def test_cursor_pages_walk_backwards(self):
+        forward_pages, last_page = self.walk(BANDS_LIST_URL)
+
+        backward_pages, _ = self.walk(
+            BANDS_LIST_URL,
+            {"cursor": last_page.previous_cursor},
+            direction="previous"
+        )
+
+        self.assertEqual(backward_pages, forward_pages[-2::-1])
+
+    def test_cursor_page_does_not_count_rows(self):
+        response = self.client.get(BANDS_LIST_URL)
+        cursor = response.context["page_obj"].next_cursor
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(BANDS_LIST_URL, {"cursor": cursor})
+
+        for query in context.captured_queries:
+            self.assertNotIn("COUNT(", query["sql"])
+            self.assertNotIn("OFFSET", query["sql"])
+
+    def test_cursor_pagination_follows_search_ranking(self):
+        for musician_id in range(5):
+            get_user_model().objects.create_user(
+                username=f"user_{musician_id}",
+                password="C_Pass12345",
+                first_name="Sam" if musician_id % 2 else "Tom",
+                last_name="Sampson",
+                instrument=self.instrument
+            )
+
+        pages, _ = self.walk(MUSICIANS_LIST_URL, {"musician": "sam"})
+        usernames = [
+            musician.username for page in pages for musician in page
+        ]
+
+        self.assertEqual(
+            usernames,
+            ["user_1", "user_3", "user_0", "user_2", "user_4"]
+        )
+
+    def test_invalid_cursor_returns_not_found(self):
+        response = self.client.get(BANDS_LIST_URL, {"cursor": "broken"})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_tampered_cursor_returns_not_found(self):
+        for values in (
+            ["x", "y"],
+            ["Band", None],
+            [["Band"], 1],
+            ["Band", 10 ** 30],
+            ["Band", 1e300],
+        ):
+            cursor = CursorPaginator.encode_cursor(values, False)
+            with self.subTest(values=values):
+                for url in (
+                    BANDS_LIST_URL,
+                    reverse("catalog:api-band-list"),
+                    reverse(
+                        "catalog:country-detail-view",
+                        args=[Country.objects.get().pk]
+                    ),
+                ):
+                    response = self.client.get(url, {"cursor": cursor})
+
+                    self.assertEqual(response.status_code, 404)
@@ -0,0 +1,186 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from catalog.models import Band, Country, Genre, Instrument
+
+BANDS_URL = reverse("catalog:band-list-view")
+MUSICIANS_URL = reverse("catalog:musician-list-view")
+
+
+class RelationCountsTest(TestCase):
+    def setUp(self) -> None:
+        self.sweden = Country.objects.create(name="Sweden")
+        self.norway = Country.objects.create(name="Norway")
+        self.pop = Genre.objects.create(name="Pop")
+        self.rock = Genre.objects.create(name="Rock")
+        self.instrument = Instrument.objects.create(name="Piano")
+        self.benny = get_user_model().objects.create_user(
+            username="benny",
+            password="Pass12345",
+            instrument=self.instrument
+        )
+        self.bjorn = get_user_model().objects.create_user(
+            username="bjorn",
+            password="Pass12345",
+            instrument=self.instrument
+        )
+        self.band = Band.objects.create(
+            name="ABBA",
+            description="Pop group",
+            country=self.sweden,
+        )
+
+    def assertCounts(self, obj, **counts):
+        obj.refresh_from_db()
+        for field, count in counts.items():
+            self.assertEqual(getattr(obj, field), count, field)
+
+    def test_add_and_remove_update_both_sides(self):
+        self.band.genres.add(self.pop, self.rock)
+        self.band.members.add(self.benny)
+
+        self.assertCounts(self.band, genre_count=2, member_count=1)
+        self.assertCounts(self.pop, band_count=1)
+        self.assertCounts(self.benny, band_count=1)
+
+        self.band.genres.remove(self.rock)
+        self.assertCounts(self.band, genre_count=1)
+        self.assertCounts(self.rock, band_count=0)
+
+    def test_repeated_add_and_remove_of_unrelated_objects(self):
+        self.band.genres.add(self.pop)
+        self.band.genres.add(self.pop)
+        self.band.genres.remove(self.rock)
+
+        self.assertCounts(self.band, genre_count=1)
+        self.assertCounts(self.pop, band_count=1)
+        self.assertCounts(self.rock, band_count=0)
+
+    def test_reverse_add_and_clear(self):
+        other = Band.objects.create(
+            name="Roxette", description="Pop duo", country=self.sweden
+        )
+        self.benny.bands.add(self.band, other)
+        self.assertCounts(self.benny, band_count=2)
+        self.assertCounts(other, member_count=1)
+
+        self.benny.bands.clear()
+        self.assertCounts(self.benny, band_count=0)
+        self.assertCounts(self.band, member_count=0)
+        self.assertCounts(other, member_count=0)
+
+    def test_set_and_forward_clear(self):
+        self.band.members.set([self.benny, self.bjorn])
+        self.band.members.set([self.bjorn])
+
+        self.assertCounts(self.band, member_count=1)
+        self.assertCounts(self.benny, band_count=0)
+        self.assertCounts(self.bjorn, band_count=1)
+
+        self.band.members.clear()
+        self.assertCounts(self.band, member_count=0)
+        self.assertCounts(self.bjorn, band_count=0)
+
+    def test_country_band_count_follows_band(self):
+        self.assertCounts(self.sweden, band_count=1)
+
+        self.band.country = self.norway
+        self.band.save()
+        self.assertCounts(self.sweden, band_count=0)
+        self.assertCounts(self.norway, band_count=1)
+
+        self.band.delete()
+        self.assertCounts(self.norway, band_count=0)
+
+    def test_deleting_band_updates_related_counts(self):
+        self.band.genres.add(self.pop)
+        self.band.members.add(self.benny)
+
+        self.band.delete()
+
+        self.assertCounts(self.pop, band_count=0)
+        self.assertCounts(self.benny, band_count=0)
+
+    def test_deleting_related_objects_updates_band_counts(self):
+        self.band.genres.add(self.pop, self.rock)
+        self.band.members.add(self.benny, self.bjorn)
+
+        self.rock.delete()
+        self.benny.delete()
+
+        self.assertCounts(self.band, genre_count=1, member_count=1)
+
+    def test_repair_command_fixes_drifted_counts(self):
+        self.band.genres.add(self.pop)
+        Band.objects.update(genre_count=7, member_count=3)
+        Genre.objects.update(band_count=0)
+
+        out = StringIO()
+        call_command("repair_relation_counts", stdout=out)
+
+        self.assertCounts(self.band, genre_count=1, member_count=0)
+        self.assertCounts(self.pop, band_count=1)
+        self.assertIn(
+            "Repaired the relation counters of 2 rows.", out.getvalue()
+        )
+
+
+class PopularitySortTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        country = Country.objects.create(name="Sweden")
+        instrument = Instrument.objects.create(name="Piano")
+        self.user = get_user_model().objects.create_user(
+            username="benny",
+            password="Pass12345",
+            instrument=instrument
+        )
+        self.client.force_login(self.user)
+
+        for index, members in enumerate((0, 1, 1)):
+            band = Band.objects.create(
+                name=f"Band {index}",
+                description="Band",
+                country=country,
+            )
+            if members:
+                band.members.add(self.user)
+
+    def test_band_list_sorted_by_member_count(self):
+        response = self.client.get(BANDS_URL, {"sort": "popular"})
+
+        self.assertEqual(
+            [band.name for band in response.context["band_list"]],
+            ["Band 1", "Band 2", "Band 0"]
+        )
+        self.assertContains(response, "Sort by name")
+
+    def test_band_list_defaults_to_name_order(self):
+        response = self.client.get(BANDS_URL)
+
+        self.assertEqual(
+            [band.name for band in response.context["band_list"]],
+            ["Band 0", "Band 1", "Band 2"]
+        )
+        self.assertContains(response, "Most popular first")
+
+    def test_musician_list_sorted_by_band_count(self):
+        get_user_model().objects.create_user(
+            username="agnetha",
+            password="Pass12345",
+            instrument=self.user.instrument
+        )
+
+        response = self.client.get(MUSICIANS_URL, {"sort": "popular"})
+
+        self.assertEqual(
+            [musician.username for musician in response.context[
+                "musician_list"
+            ]],
+            ["benny", "agnetha"]
+        )
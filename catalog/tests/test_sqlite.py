@@ -0,0 +1,51 @@
+import os
+import tempfile
+
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+
+
+class SqlitePragmasTest(SimpleTestCase):
+    def open_connection(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        wrapper = DatabaseWrapper(
+            {
+                **connection.settings_dict,
+                "NAME": os.path.join(directory.name, "pragmas.sqlite3"),
+            },
+            alias="pragmas",
+        )
+        wrapper.ensure_connection()
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    @override_settings(CATALOG_SQLITE_PRAGMAS={
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "mmap_size": 1024 ** 2,
+        "cache_size": -1024,
+        "busy_timeout": 100,
+    })
+    def test_new_connections_use_configured_pragmas(self):
+        wrapper = self.open_connection()
+
+        self.assertEqual(self.pragma(wrapper, "journal_mode"), "wal")
+        # 1 is NORMAL
+        self.assertEqual(self.pragma(wrapper, "synchronous"), 1)
+        self.assertEqual(self.pragma(wrapper, "mmap_size"), 1024 ** 2)
+        self.assertEqual(self.pragma(wrapper, "cache_size"), -1024)
+        self.assertEqual(self.pragma(wrapper, "busy_timeout"), 100)
+
+    @override_settings(CATALOG_SQLITE_PRAGMAS={"journal_mode": "delete"})
+    def test_pragmas_are_configurable(self):
+        wrapper = self.open_connection()
+
+        self.assertEqual(self.pragma(wrapper, "journal_mode"), "delete")
@@ -0,0 +1,229 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from catalog.models import Band, Country, Genre, Instrument, Task
+from catalog.tasks import (
+    claim_task,
+    enqueue,
+    requeue_stale_tasks,
+    run_task,
+)
+
+
+class TaskQueueTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.country = Country.objects.create(name="Norway")
+        self.genre = Genre.objects.create(name="Black metal")
+
+        for index in range(3):
+            band = Band.objects.create(
+                name=f"Band {index}",
+                description="Band",
+                country=self.country,
+            )
+            band.genres.add(self.genre)
+
+    def test_enqueue_rejects_unknown_task(self):
+        with self.assertRaises(ValueError):
+            enqueue("format_hard_drive")
+
+        self.assertFalse(Task.objects.exists())
+
+    def test_claim_takes_oldest_task_once(self):
+        first = enqueue("repair_relation_counts")
+        second = enqueue("rebuild_search_index")
+
+        self.assertEqual(claim_task(), first.pk)
+        self.assertEqual(claim_task(), second.pk)
+        self.assertIsNone(claim_task())
+
+        first.refresh_from_db()
+        self.assertEqual(first.status, Task.Status.RUNNING)
+        self.assertIsNotNone(first.started)
+
+    def test_requeue_stale_tasks(self):
+        stale = enqueue("repair_relation_counts")
+        recent = enqueue("rebuild_search_index")
+        claim_task()
+        claim_task()
+        Task.objects.filter(pk=stale.pk).update(
+            started=timezone.now() - timedelta(hours=1), progress=5
+        )
+
+        self.assertEqual(requeue_stale_tasks(600), 1)
+
+        stale.refresh_from_db()
+        self.assertEqual(
+            (stale.status, stale.started, stale.progress),
+            (Task.Status.QUEUED, None, 0)
+        )
+        recent.refresh_from_db()
+        self.assertEqual(recent.status, Task.Status.RUNNING)
+        self.assertEqual(claim_task(), stale.pk)
+
+    def test_run_task_records_result(self):
+        Genre.objects.update(band_count=0)
+        task = enqueue("repair_relation_counts")
+
+        self.assertEqual(run_task(claim_task()), Task.Status.DONE)
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.Status.DONE)
+        self.assertIn("Repaired the relation counters", task.result)
+        self.assertIsNotNone(task.finished)
+        self.genre.refresh_from_db()
+        self.assertEqual(self.genre.band_count, 3)
+
+    def test_run_task_records_failure(self):
+        task = enqueue("delete_object", model="catalog.nothing", pk=1)
+
+        with self.assertLogs("catalog.tasks", "ERROR"):
+            self.assertEqual(run_task(claim_task()), Task.Status.FAILED)
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.Status.FAILED)
+        self.assertIn("Traceback", task.result)
+
+    def test_delete_object_reports_progress(self):
+        task = enqueue(
+            "delete_object", model="catalog.country", pk=self.country.pk
+        )
+
+        run_task(claim_task())
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.Status.DONE)
+        self.assertEqual((task.progress, task.total), (3, 3))
+        self.assertFalse(Country.objects.exists())
+        self.assertFalse(Band.objects.exists())
+
+    def test_run_worker_burst_empties_queue(self):
+        enqueue("delete_object", model="catalog.genre", pk=self.genre.pk)
+        enqueue("repair_relation_counts")
+
+        call_command(
+            "run_worker", "--burst", "--processes", "0", stderr=StringIO()
+        )
+
+        self.assertEqual(
+            set(Task.objects.values_list("status", flat=True)),
+            {Task.Status.DONE}
+        )
+        self.assertFalse(Genre.objects.exists())
+        self.assertEqual(Band.objects.count(), 3)
+
+    @staticmethod
+    def run_now(function, *args):
+        future = Future()
+        future.set_result(function(*args))
+        return future
+
+    def test_repair_relation_counts_reports_progress(self):
+        task = enqueue("repair_relation_counts")
+
+        run_task(claim_task())
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.Status.DONE)
+        self.assertEqual(task.progress, task.total)
+        self.assertGreater(task.total, 0)
+
+    def test_run_worker_replaces_broken_pool(self):
+        died = Future()
+        died.set_exception(BrokenProcessPool())
+        broken, fresh = mock.Mock(), mock.Mock()
+        broken.submit.return_value = died
+        task = enqueue("repair_relation_counts")
+        stderr = StringIO()
+
+        with mock.patch(
+            "catalog.management.commands.run_worker.Command.make_executor",
+            side_effect=[broken, fresh],
+        ):
+            call_command(
+                "run_worker", "--burst", "--processes", "1", stderr=stderr
+            )
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.Status.FAILED)
+        self.assertIn("BrokenProcessPool", task.result)
+        broken.shutdown.assert_called_once_with(wait=False)
+        fresh.shutdown.assert_called_once_with(wait=True)
+        self.assertIn("starting a new pool", stderr.getvalue())
+
+    def test_run_worker_requeues_task_on_broken_submit(self):
+        broken, fresh = mock.Mock(), mock.Mock()
+        broken.submit.side_effect = BrokenProcessPool()
+        fresh.submit.side_effect = self.run_now
+        task = enqueue("repair_relation_counts")
+
+        with mock.patch(
+            "catalog.management.commands.run_worker.Command.make_executor",
+            side_effect=[broken, fresh],
+        ), mock.patch(
+            "catalog.management.commands.run_worker.time.sleep"
+        ):
+            call_command(
+                "run_worker", "--burst", "--processes", "1",
+                stderr=StringIO()
+            )
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.Status.DONE)
+
+    def test_run_worker_warns_about_process_local_cache(self):
+        stderr = StringIO()
+        with override_settings(CACHES={"default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }}):
+            call_command(
+                "run_worker", "--burst", "--processes", "0", stderr=stderr
+            )
+        self.assertIn("local to this process", stderr.getvalue())
+
+        stderr = StringIO()
+        call_command(
+            "run_worker", "--burst", "--processes", "0", stderr=stderr
+        )
+        self.assertNotIn("local to this process", stderr.getvalue())
+
+
+class TaskDetailViewTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="admin",
+            password="Pass12345",
+            instrument=Instrument.objects.create(name="Guitar")
+        )
+        self.task = enqueue("rebuild_search_index")
+
+    def test_login_required(self):
+        response = self.client.get(self.task.get_absolute_url())
+
+        self.assertNotEqual(response.status_code, 200)
+
+    def test_shows_status_and_refreshes_until_finished(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(self.task.get_absolute_url())
+
+        self.assertContains(response, "Queued")
+        self.assertContains(response, "window.location.reload")
+
+        Task.objects.filter(pk=self.task.pk).update(
+            status=Task.Status.DONE, result="Indexed 0 bands."
+        )
+        response = self.client.get(self.task.get_absolute_url())
+
+        self.assertContains(response, "Indexed 0 bands.")
+        self.assertNotContains(response, "window.location.reload")
@@ -1,5 +1,10 @@
+import json
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from catalog.models import (
     Instrument,
@@ -10,6 +15,7 @@ from catalog.models import (
 
 BANDS_LIST_URL = reverse("catalog:band-list-view")
 BANDS_CREATE_URL = reverse("catalog:band-create")
+BANDS_EXPORT_URL = reverse("catalog:band-export")
 
 
 class LoginRequiredTest(TestCase):
@@ -72,6 +78,7 @@ class BandViewTest(TestCase):
             )
 
     def setUp(self) -> None:
+        cache.clear()
         self.country = Country.objects.get(name="India")
         self.genre = Genre.objects.create(name="Pop")
         self.instrument = Instrument.objects.create(name="Drums")
@@ -307,3 +314,332 @@ class BandViewTest(TestCase):
             list(band_context_response.members.all()),
             list(new_band.members.all())
         )
+
+
+class BandDetailViewQueriesTest(TestCase):
+    def setUp(self) -> None:
+        self.country = Country.objects.create(name="Norway")
+        self.genre = Genre.objects.create(name="Black metal")
+        self.user = get_user_model().objects.create_user(
+            username="Q_UserName",
+            password="Q_Pass12345",
+            instrument=Instrument.objects.create(name="Bass"),
+        )
+        self.client.force_login(self.user)
+
+    def create_band_with_members(self, name, number_of_members):
+        band = Band.objects.create(
+            name=name,
+            description=f"{name} description",
+            country=self.country,
+        )
+        band.genres.add(self.genre)
+
+        for member_id in range(number_of_members):
+            instrument = Instrument.objects.create(
+                name=f"{name} instrument {member_id}"
+            )
+            band.members.add(get_user_model().objects.create_user(
+                username=f"{name}_member_{member_id}",
+                password="Q_Pass12345",
+                instrument=instrument,
+            ))
+
+        return band
+
+    def count_detail_view_queries(self, band):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse(
+                "catalog:band-detail-view",
+                args=[band.id])
+            )
+        self.assertEqual(response.status_code, 200)
+
+        return len(context.captured_queries)
+
+    def test_band_detail_view_query_count_does_not_depend_on_members(self):
+        small_band = self.create_band_with_members("Small_Band", 1)
+        large_band = self.create_band_with_members("Large_Band", 40)
+
+        self.assertEqual(
+            self.count_detail_view_queries(small_band),
+            self.count_detail_view_queries(large_band),
+        )
+
+    def test_band_detail_view_renders_members_instruments(self):
+        band = self.create_band_with_members("Instrument_Band", 3)
+
+        response = self.client.get(reverse(
+            "catalog:band-detail-view",
+            args=[band.id])
+        )
+
+        for member in band.members.all():
+            self.assertContains(response, member.instrument.name)
+
+
+class BandSearchTest(TestCase):
+    def setUp(self) -> None:
+        self.country = Country.objects.create(name="Finland")
+        self.user = get_user_model().objects.create_user(
+            username="S_UserName",
+            password="S_Pass12345",
+            instrument=Instrument.objects.create(name="Accordion"),
+        )
+        self.client.force_login(self.user)
+
+        self.band = Band.objects.create(
+            name="Nightwish",
+            description="Symphonic metal from Kitee",
+            country=self.country,
+        )
+        Band.objects.create(
+            name="Sonata Arctica",
+            description="Power metal from Kemi",
+            country=self.country,
+        )
+
+    def search_bands(self, query):
+        response = self.client.get(BANDS_LIST_URL, {"name": query})
+        return list(response.context["band_list"])
+
+    def test_band_search_matches_name_substring(self):
+        self.assertEqual(self.search_bands("GHTWI"), [self.band])
+
+    def test_band_search_matches_description(self):
+        self.assertEqual(self.search_bands("kitee"), [self.band])
+
+    def test_band_search_with_short_query(self):
+        self.assertEqual(self.search_bands("Ni"), [self.band])
+
+    def test_band_search_with_nul_character(self):
+        self.assertEqual(self.search_bands("\x00ght"), [self.band])
+
+    def test_band_search_follows_updates_and_deletes(self):
+        self.band.name = "Tarot"
+        self.band.save()
+
+        self.assertEqual(self.search_bands("Nightwish"), [])
+        self.assertEqual(self.search_bands("Tarot"), [self.band])
+
+        self.band.delete()
+
+        self.assertEqual(self.search_bands("Tarot"), [])
+
+
+class BandListRowCacheTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.country = Country.objects.create(name="Sweden")
+        self.genre = Genre.objects.create(name="Melodic death metal")
+        self.user = get_user_model().objects.create_user(
+            username="R_UserName",
+            password="R_Pass12345",
+            instrument=Instrument.objects.create(name="Keytar"),
+        )
+        self.client.force_login(self.user)
+
+        self.band = Band.objects.create(
+            name="In Flames",
+            description="Gothenburg",
+            country=self.country,
+        )
+        self.band.genres.add(self.genre)
+        self.client.get(BANDS_LIST_URL)
+
+    def test_band_list_serves_cached_rows(self):
+        Band.objects.filter(pk=self.band.pk).update(name="Dark Tranquillity")
+
+        response = self.client.get(BANDS_LIST_URL)
+
+        self.assertContains(response, "In Flames")
+
+    def test_cached_rows_do_not_query_genres(self):
+        genres_table = Band.genres.through._meta.db_table
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(BANDS_LIST_URL)
+
+        self.assertFalse([
+            query for query in queries
+            if genres_table in query["sql"]
+        ])
+
+    def test_band_row_is_refreshed_on_band_save(self):
+        self.band.name = "Dark Tranquillity"
+        self.band.save()
+
+        response = self.client.get(BANDS_LIST_URL)
+
+        self.assertContains(response, "Dark Tranquillity")
+
+    def test_band_row_is_refreshed_on_genres_change(self):
+        self.band.genres.add(Genre.objects.create(name="Alternative metal"))
+
+        response = self.client.get(BANDS_LIST_URL)
+
+        self.assertContains(response, "Alternative metal")
+
+    def test_band_row_is_refreshed_on_genre_and_country_rename(self):
+        self.genre.name = "Gothenburg metal"
+        self.genre.save()
+        self.country.name = "Kingdom of Sweden"
+        self.country.save()
+
+        response = self.client.get(BANDS_LIST_URL)
+
+        self.assertContains(response, "Gothenburg metal")
+        self.assertContains(response, "Kingdom of Sweden")
+
+
+class BandExportViewTest(TestCase):
+    def setUp(self) -> None:
+        country = Country.objects.create(name="Germany")
+        genre = Genre.objects.create(name="Krautrock")
+        self.user = get_user_model().objects.create_user(
+            username="E_UserName",
+            password="E_Pass12345",
+            instrument=Instrument.objects.create(name="Synthesizer"),
+        )
+        self.client.force_login(self.user)
+
+        for band_id in range(3):
+            band = Band.objects.create(
+                name=f"Export_Band {band_id}",
+                description=f"Export description {band_id}",
+                country=country,
+            )
+            band.genres.add(genre)
+            band.members.add(self.user)
+
+    def test_login_required_for_band_export(self):
+        self.client.logout()
+        response = self.client.get(BANDS_EXPORT_URL)
+        self.assertNotEqual(response.status_code, 200)
+
+    def test_band_export_streams_csv(self):
+        response = self.client.get(BANDS_EXPORT_URL)
+        content = b"".join(response.streaming_content).decode()
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(
+            content.splitlines()[:2],
+            [
+                "name,description,country,genres,members",
+                "Export_Band 0,Export description 0,Germany,"
+                "Krautrock,E_UserName",
+            ]
+        )
+
+    def test_band_export_streams_ndjson(self):
+        response = self.client.get(BANDS_EXPORT_URL, {
+            "format": "ndjson",
+            "name": "Band 2",
+        })
+        content = b"".join(response.streaming_content).decode()
+
+        self.assertEqual(
+            [json.loads(line) for line in content.splitlines()],
+            [{
+                "name": "Export_Band 2",
+                "description": "Export description 2",
+                "country": "Germany",
+                "genres": ["Krautrock"],
+                "members": ["E_UserName"],
+            }]
+        )
+
+    def test_band_export_query_count_does_not_depend_on_rows(self):
+        response = self.client.get(BANDS_EXPORT_URL)
+
+        with CaptureQueriesContext(connection) as context:
+            b"".join(response.streaming_content)
+
+        self.assertEqual(len(context.captured_queries), 3)
+
+
+class BandFormMemberPickerTest(TestCase):
+    def setUp(self) -> None:
+        self.instrument = Instrument.objects.create(name="Drums")
+        self.country = Country.objects.create(name="Canada")
+        self.genre = Genre.objects.create(name="Progressive rock")
+        self.user = get_user_model().objects.create_user(
+            username="P_User",
+            password="P_ass12345",
+            first_name="Neil",
+            last_name="Peart",
+            instrument=self.instrument
+        )
+        self.client.force_login(self.user)
+        self.musicians = get_user_model().objects.bulk_create([
+            get_user_model()(
+                username=f"Picker_User{index}",
+                first_name="Picker",
+                last_name=f"Musician{index}",
+                instrument=self.instrument
+            )
+            for index in range(30)
+        ])
+        self.band = Band.objects.create(
+            name="Rush",
+            description="Power trio",
+            country=self.country,
+        )
+        self.band.members.add(self.user, self.musicians[0])
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_band_create_renders_no_musicians(self):
+        response = self.client.get(BANDS_CREATE_URL)
+
+        self.assertNotContains(response, "Picker Musician")
+        self.assertContains(response, reverse("catalog:api-musician-list"))
+        self.assertContains(response, "member-picker.js")
+
+    def test_band_update_renders_only_members(self):
+        response = self.client.get(
+            reverse("catalog:band-update", args=[self.band.id])
+        )
+
+        self.assertContains(response, "Neil Peart")
+        self.assertContains(response, "Picker Musician0")
+        self.assertNotContains(response, "Picker Musician2")
+
+    def test_band_form_query_count_does_not_depend_on_musicians(self):
+        url = reverse("catalog:band-update", args=[self.band.id])
+        queries = self.count_queries(url)
+
+        get_user_model().objects.bulk_create([
+            get_user_model()(
+                username=f"Extra_User{index}",
+                instrument=self.instrument
+            )
+            for index in range(30)
+        ])
+
+        self.assertEqual(self.count_queries(url), queries)
+
+    def test_band_form_validates_selected_members(self):
+        form_data = {
+            "name": "Rush",
+            "description": "Power trio",
+            "country": self.country.id,
+            "genres": [self.genre.id],
+            "members": [self.musicians[5].id, "abc"],
+        }
+        url = reverse("catalog:band-update", args=[self.band.id])
+
+        response = self.client.post(url, data=form_data)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Picker Musician5")
+
+        form_data["members"] = [self.musicians[5].id]
+        self.client.post(url, data=form_data)
+        self.assertEqual(
+            list(self.band.members.all()),
+            [self.musicians[5]]
+        )
@@ -1,7 +1,7 @@
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse
-from catalog.models import Country, Instrument
+from catalog.models import Band, Country, Genre, Instrument
 
 COUNTRIES_LIST_URL = reverse("catalog:country-list-view")
 COUNTRIES_CREATE_URL = reverse("catalog:country-create")
@@ -15,6 +15,13 @@ class LoginRequiredTest(TestCase):
         response = self.client.get(COUNTRIES_LIST_URL)
         self.assertNotEqual(response.status_code, 200)
 
+    def test_login_required_for_country_detail_view(self):
+        response = self.client.get(reverse(
+            "catalog:country-detail-view",
+            args=[self.country.id])
+        )
+        self.assertNotEqual(response.status_code, 200)
+
     def test_login_required_for_country_create(self):
         response = self.client.get(COUNTRIES_CREATE_URL)
         self.assertNotEqual(response.status_code, 200)
@@ -185,3 +192,63 @@ class CountryViewTest(TestCase):
         )
 
         self.assertEqual(list(Country.objects.filter(name="Country 1")), [])
+
+
+class CountryDetailViewTest(TestCase):
+    def setUp(self) -> None:
+        instrument = Instrument.objects.create(name="Guitar")
+        self.user = get_user_model().objects.create_user(
+            username="UserName",
+            password="Pass12345",
+            instrument=instrument
+        )
+        self.client.force_login(self.user)
+
+        self.norway = Country.objects.create(name="Norway")
+        sweden = Country.objects.create(name="Sweden")
+        black_metal = Genre.objects.create(name="Black metal")
+
+        for index in range(12):
+            band = Band.objects.create(
+                name=f"Norwegian band {index:02}",
+                description="Band",
+                country=self.norway,
+            )
+            band.genres.add(black_metal)
+        Band.objects.create(
+            name="Swedish band", description="Band", country=sweden
+        )
+
+        self.url = reverse(
+            "catalog:country-detail-view", args=[self.norway.id]
+        )
+
+    def test_country_detail_view_uses_correct_template(self):
+        response = self.client.get(self.url)
+
+        self.assertTemplateUsed(response, "catalog/country_detail.html")
+        self.assertContains(response, "12 bands")
+
+    def test_country_detail_view_pages_through_country_bands(self):
+        first = self.client.get(self.url)
+        second = self.client.get(
+            self.url, {"cursor": first.context["page_obj"].next_cursor}
+        )
+
+        self.assertTrue(first.context["is_paginated"])
+        self.assertEqual(
+            [band.name for band in first.context["band_list"]]
+            + [band.name for band in second.context["band_list"]],
+            [f"Norwegian band {index:02}" for index in range(12)]
+        )
+        self.assertIsNone(second.context["page_obj"].next_cursor)
+        self.assertContains(second, "Black metal")
+
+    def test_country_detail_view_query_count_does_not_depend_on_rows(self):
+        # Session, user, country, bands and their prefetched genres.
+        with self.assertNumQueries(5):
+            self.client.get(self.url)
+
+    def test_country_detail_view_invalid_cursor(self):
+        response = self.client.get(self.url, {"cursor": "invalid"})
+        self.assertEqual(response.status_code, 404)
@@ -1,7 +1,7 @@
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse
-from catalog.models import Genre, Instrument
+from catalog.models import Band, Country, Genre, Instrument
 
 GENRES_LIST_URL = reverse("catalog:genre-list-view")
 GENRES_CREATE_URL = reverse("catalog:genre-create")
@@ -15,6 +15,13 @@ class LoginRequiredTest(TestCase):
         response = self.client.get(GENRES_LIST_URL)
         self.assertNotEqual(response.status_code, 200)
 
+    def test_login_required_for_genre_detail_view(self):
+        response = self.client.get(reverse(
+            "catalog:genre-detail-view",
+            args=[self.genre.id])
+        )
+        self.assertNotEqual(response.status_code, 200)
+
     def test_login_required_for_genre_create(self):
         response = self.client.get(GENRES_CREATE_URL)
         self.assertNotEqual(response.status_code, 200)
@@ -185,3 +192,47 @@ class GenreViewTest(TestCase):
         )
 
         self.assertEqual(list(Genre.objects.filter(name="Genre 1")), [])
+
+
+class GenreDetailViewTest(TestCase):
+    def setUp(self) -> None:
+        instrument = Instrument.objects.create(name="Guitar")
+        self.user = get_user_model().objects.create_user(
+            username="UserName",
+            password="Pass12345",
+            instrument=instrument
+        )
+        self.client.force_login(self.user)
+
+        self.genre = Genre.objects.create(name="Black metal")
+        other_genre = Genre.objects.create(name="Viking metal")
+        norway = Country.objects.create(name="Norway")
+
+        for index in range(16):
+            band = Band.objects.create(
+                name=f"Band {index:02}",
+                description="Band",
+                country=norway,
+            )
+            band.genres.add(self.genre if index % 4 else other_genre)
+
+        self.url = reverse("catalog:genre-detail-view", args=[self.genre.id])
+
+    def test_genre_detail_view_pages_through_genre_bands(self):
+        first = self.client.get(self.url)
+        second = self.client.get(
+            self.url, {"cursor": first.context["page_obj"].next_cursor}
+        )
+
+        self.assertTemplateUsed(first, "catalog/genre_detail.html")
+        self.assertEqual(
+            [band.name for band in first.context["band_list"]]
+            + [band.name for band in second.context["band_list"]],
+            [f"Band {index:02}" for index in range(16) if index % 4]
+        )
+        self.assertContains(first, "[Norway]")
+
+    def test_genre_detail_view_query_count(self):
+        # Session, user, genre, bands with their country, and genres.
+        with self.assertNumQueries(5):
+            self.client.get(self.url)
@@ -1,6 +1,11 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.urls import reverse
+from catalog.counters import aget_catalog_counters, get_catalog_counters
 from catalog.models import (
     Band,
     Genre,
@@ -53,6 +58,7 @@ class IndexViewTest(TestCase):
             )
 
     def setUp(self) -> None:
+        cache.clear()
         self.user = get_user_model().objects.create_user(
             username="UserName",
             password="Pass12345",
@@ -85,3 +91,87 @@ class IndexViewTest(TestCase):
         self.assertEqual(num_musicians, 3)
         self.assertEqual(num_genres, 2)
         self.assertEqual(num_instruments, 2)
+
+
+class CatalogCountersTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.instrument = Instrument.objects.create(name="Violin")
+        self.country = Country.objects.create(name="Japan")
+
+    def test_cold_cache_counts_with_single_query(self):
+        with self.assertNumQueries(1):
+            counters = get_catalog_counters()
+
+        self.assertEqual(counters, {
+            "num_bands": 0,
+            "num_musicians": 0,
+            "num_genres": 0,
+            "num_instruments": 1,
+        })
+
+    def test_warm_cache_counts_without_queries(self):
+        get_catalog_counters()
+
+        with self.assertNumQueries(0):
+            get_catalog_counters()
+
+    def test_counters_are_invalidated_on_create_and_delete(self):
+        get_catalog_counters()
+
+        band = Band.objects.create(
+            name="Counter_Band",
+            description="Counter_Description",
+            country=self.country,
+        )
+        Genre.objects.create(name="Counter_Genre")
+
+        with self.assertNumQueries(1):
+            counters = get_catalog_counters()
+        self.assertEqual(counters["num_bands"], 1)
+        self.assertEqual(counters["num_genres"], 1)
+
+        band.delete()
+
+        self.assertEqual(get_catalog_counters()["num_bands"], 0)
+
+    def test_counters_are_not_invalidated_on_update(self):
+        get_catalog_counters()
+
+        self.instrument.name = "Viola"
+        self.instrument.save()
+
+        with self.assertNumQueries(0):
+            get_catalog_counters()
+
+
+class AsyncCatalogCountersTest(TransactionTestCase):
+    expected = {
+        "num_bands": 0,
+        "num_musicians": 0,
+        "num_genres": 2,
+        "num_instruments": 1,
+    }
+
+    def setUp(self) -> None:
+        cache.clear()
+        Instrument.objects.create(name="Oboe")
+        Genre.objects.create(name="Baroque")
+        Genre.objects.create(name="Classical")
+
+    def test_async_counters_use_single_statement_by_default(self):
+        with self.assertNumQueries(1):
+            counters = async_to_sync(aget_catalog_counters)()
+
+        self.assertEqual(counters, self.expected)
+
+    @override_settings(CATALOG_CONCURRENT_COUNTS=True)
+    def test_async_counters_can_count_concurrently(self):
+        with mock.patch("catalog.counters.SINGLE_STATEMENT_VENDORS", set()):
+            with mock.patch(
+                "catalog.counters.count_rows",
+                side_effect=AssertionError("count_rows used")
+            ):
+                counters = async_to_sync(aget_catalog_counters)()
+
+        self.assertEqual(counters, self.expected)
@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from catalog.models import Instrument, Musician
@@ -62,6 +63,7 @@ class MusicianViewTest(TestCase):
             )
 
     def setUp(self) -> None:
+        cache.clear()
         self.instrument = Instrument.objects.create(name="Drums")
 
         self.user = get_user_model().objects.create_user(
@@ -276,3 +278,81 @@ class MusicianViewTest(TestCase):
             musician_context_response.instrument.id,
             musician.instrument.id
         )
+
+
+class MusicianSearchTest(TestCase):
+    def setUp(self) -> None:
+        instrument = Instrument.objects.create(name="Cello")
+
+        self.user = get_user_model().objects.create_user(
+            username="searcher",
+            password="Pazz12345",
+            instrument=instrument
+        )
+        self.client.force_login(self.user)
+
+        self.by_last_name = get_user_model().objects.create_user(
+            username="aaa",
+            password="Pazz12345",
+            first_name="Peter",
+            last_name="Morgan",
+            instrument=instrument
+        )
+        self.by_first_name = get_user_model().objects.create_user(
+            username="bbb",
+            password="Pazz12345",
+            first_name="Morgana",
+            last_name="Smith",
+            instrument=instrument
+        )
+        self.by_username = get_user_model().objects.create_user(
+            username="morgan_fan",
+            password="Pazz12345",
+            first_name="Ann",
+            last_name="Lee",
+            instrument=instrument
+        )
+        self.by_substring = get_user_model().objects.create_user(
+            username="ccc",
+            password="Pazz12345",
+            first_name="Demorgan",
+            last_name="White",
+            instrument=instrument
+        )
+
+    def test_musician_search_matches_all_name_fields_with_ranking(self):
+        response = self.client.get(MUSICIANS_LIST_URL, {"musician": "morgan"})
+        paginator = response.context["paginator"]
+
+        self.assertEqual(
+            list(paginator.object_list),
+            [
+                self.by_first_name,
+                self.by_last_name,
+                self.by_username,
+                self.by_substring,
+            ]
+        )
+
+    def test_musician_search_matches_last_name_when_first_name_misses(self):
+        response = self.client.get(MUSICIANS_LIST_URL, {"musician": "smith"})
+
+        self.assertEqual(
+            list(response.context["musician_list"]),
+            [self.by_first_name]
+        )
+
+    def test_musician_search_with_nul_character(self):
+        response = self.client.get(
+            MUSICIANS_LIST_URL, {"musician": "m\x00org"}
+        )
+
+        self.assertCountEqual(
+            response.context["paginator"].object_list,
+            [
+                self.by_first_name,
+                self.by_last_name,
+                self.by_username,
+                self.by_substring,
+            ]
+        )
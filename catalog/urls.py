@@ -1,11 +1,27 @@
 from django.urls import path
+from catalog.api import (
+    BandApiView,
+    BandMembershipApiView,
+    MusicianApiView,
+    GenreApiView,
+    CountryApiView,
+    InstrumentApiView,
+)
+from catalog.async_views import (
+    AsyncIndex,
+    AsyncBandListView,
+    AsyncBandDetailView,
+    AsyncMusicianListView,
+)
 from catalog.views import (
     Index,
     GenreListView,
+    GenreDetailView,
     GenreCreateView,
     GenreUpdateView,
     GenreDeleteView,
     CountryListView,
+    CountryDetailView,
     CountryCreateView,
     CountryUpdateView,
     CountryDeleteView,
@@ -22,7 +38,10 @@ from catalog.views import (
     BandDetailView,
     BandCreateView,
     BandUpdateView,
-    BandDeleteView
+    BandDeleteView,
+    BandExportView,
+    TaskDetailView,
+    AutocompleteView,
 )
 
 urlpatterns = [
@@ -33,6 +52,11 @@ urlpatterns = [
         GenreListView.as_view(),
         name="genre-list-view"
     ),
+    path(
+        "genres/<int:pk>/",
+        GenreDetailView.as_view(),
+        name="genre-detail-view"
+    ),
     path(
         "genres/create/",
         GenreCreateView.as_view(),
@@ -54,6 +78,11 @@ urlpatterns = [
         CountryListView.as_view(),
         name="country-list-view"
     ),
+    path(
+        "countries/<int:pk>/",
+        CountryDetailView.as_view(),
+        name="country-detail-view"
+    ),
     path(
         "countries/create/",
         CountryCreateView.as_view(),
@@ -122,6 +151,11 @@ urlpatterns = [
         BandListView.as_view(),
         name="band-list-view"
     ),
+    path(
+        "bands/export/",
+        BandExportView.as_view(),
+        name="band-export"
+    ),
     path(
         "bands/<int:pk>/",
         BandDetailView.as_view(),
@@ -142,6 +176,58 @@ urlpatterns = [
         BandDeleteView.as_view(),
         name="band-delete"
     ),
+
+    path("async/", AsyncIndex.as_view(), name="async-index"),
+    path(
+        "async/bands/",
+        AsyncBandListView.as_view(),
+        name="async-band-list-view"
+    ),
+    path(
+        "async/bands/<int:pk>/",
+        AsyncBandDetailView.as_view(),
+        name="async-band-detail-view"
+    ),
+    path(
+        "async/musicians/",
+        AsyncMusicianListView.as_view(),
+        name="async-musician-list-view"
+    ),
+
+    path(
+        "tasks/<int:pk>/",
+        TaskDetailView.as_view(),
+        name="task-detail-view"
+    ),
+
+    path(
+        "autocomplete/",
+        AutocompleteView.as_view(),
+        name="autocomplete"
+    ),
+
+    path("api/bands/", BandApiView.as_view(), name="api-band-list"),
+    path(
+        "api/bands/memberships/",
+        BandMembershipApiView.as_view(),
+        name="api-band-memberships"
+    ),
+    path(
+        "api/musicians/",
+        MusicianApiView.as_view(),
+        name="api-musician-list"
+    ),
+    path("api/genres/", GenreApiView.as_view(), name="api-genre-list"),
+    path(
+        "api/countries/",
+        CountryApiView.as_view(),
+        name="api-country-list"
+    ),
+    path(
+        "api/instruments/",
+        InstrumentApiView.as_view(),
+        name="api-instrument-list"
+    ),
 ]
 
 app_name = "catalog"
@@ -0,0 +1,20 @@
+from django.core.exceptions import ValidationError
+
+# SQLite stores integers in up to 8 bytes but, unlike other backends,
+# gives Django no range to validate integer fields against.
+DB_INTEGER_RANGE = (-2 ** 63, 2 ** 63 - 1)
+
+
+def run_db_validators(field, value):
+    """
+    Run the validators of field on a value from a request, and reject
+    integers out of the database's range, which raise OverflowError
+    when they are sent as query parameters.
+    """
+    field.run_validators(value)
+
+    minimum, maximum = DB_INTEGER_RANGE
+    if isinstance(value, int) and not minimum <= value <= maximum:
+        raise ValidationError(
+            f"Ensure this value is between {minimum} and {maximum}."
+        )
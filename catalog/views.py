@@ -1,7 +1,34 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db.models import Prefetch, prefetch_related_objects
+from django.http import (
+    Http404,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.urls import reverse_lazy
 from django.views import generic
 
+from catalog.autocomplete import (
+    AUTOCOMPLETE_INDEXES,
+    AUTOCOMPLETE_LIMIT,
+    autocomplete,
+)
+from catalog.counters import get_catalog_counters
+from catalog.deletion import delete_impact, delete_in_batches
+from catalog.detail_cache import CachedDetailMixin
+from catalog.export import (
+    export_bands_queryset,
+    band_records,
+    stream_csv,
+    stream_ndjson,
+)
+from catalog.facets import (
+    filter_bands,
+    get_band_facets,
+    parse_facet_selection,
+)
 from catalog.forms import (
     MusicianCreationForm,
     MusicianSearchForm,
@@ -11,36 +38,129 @@ from catalog.forms import (
     CountrySearchForm,
     InstrumentSearchForm,
 )
+from catalog.fragments import (
+    BAND_ROW_FRAGMENT_TIMEOUT,
+    attach_band_row_versions,
+)
 from catalog.models import (
     Band,
     Musician,
     Genre,
     Instrument,
-    Country
+    Country,
+    Task,
 )
+from catalog.pagination import (
+    CursorPaginationMixin,
+    CursorPaginator,
+    InvalidCursor,
+)
+from catalog.search import search, search_musicians
+from catalog.tasks import enqueue
 
 
-class Index(LoginRequiredMixin, generic.TemplateView):
-    template_name = "catalog/index.html"
+class PopularitySortMixin:
+    """
+    Order a list by a denormalized relation counter on ?sort=popular,
+    most related first, falling back to the model ordering.
+    """
+    popularity_field = "band_count"
+    sort_kwarg = "sort"
 
-    def get_context_data(self, *, object_list=None, **kwargs):
+    def sort_queryset(self, queryset):
+        if self.request.GET.get(self.sort_kwarg) != "popular":
+            return queryset
+
+        return queryset.order_by(
+            f"-{self.popularity_field}", *self.model._meta.ordering
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["sort"] = self.request.GET.get(self.sort_kwarg, "")
+
+        return context
+
+
+class RelatedBandsMixin:
+    """
+    Page through the bands of a DetailView's object, filtered by
+    band_lookup. Always keyset-paged, so deep pages of a country with
+    many bands cost the same index range scan as the first one.
+    """
+    band_lookup = None
+    bands_paginate_by = 10
+    cursor_kwarg = "cursor"
+
+    def get_band_queryset(self):
+        return Band.objects.filter(
+            **{self.band_lookup: self.object}
+        ).prefetch_related("genres")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        paginator = CursorPaginator(
+            self.get_band_queryset(), self.bands_paginate_by
+        )
+
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+
+        context.update({
+            "band_list": page.object_list,
+            "page_obj": page,
+            "is_paginated": page.has_other_pages(),
+        })
+
+        return context
 
-        num_bands = Band.objects.count()
-        num_musicians = Musician.objects.count()
-        num_genres = Genre.objects.count()
-        num_instruments = Instrument.objects.count()
 
-        context = {
-            "num_bands": num_bands,
-            "num_musicians": num_musicians,
-            "num_genres": num_genres,
-            "num_instruments": num_instruments,
-        }
+class DeleteImpactMixin:
+    """
+    Show what a delete cascades to on the confirm page, and delete the
+    dependents in batches. Cascades larger than
+    CATALOG_BACKGROUND_DELETE_THRESHOLD rows are queued for run_worker,
+    redirecting to the task's progress page.
+    """
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["impact"] = delete_impact(self.object)
 
         return context
 
+    def form_valid(self, form):
+        success_url = self.get_success_url()
+        impact = sum(count for _, count in delete_impact(self.object))
+
+        if impact > settings.CATALOG_BACKGROUND_DELETE_THRESHOLD:
+            task = enqueue(
+                "delete_object",
+                model=self.model._meta.label_lower,
+                pk=self.object.pk,
+            )
+            return HttpResponseRedirect(task.get_absolute_url())
 
-class GenreListView(LoginRequiredMixin, generic.ListView):
+        delete_in_batches(self.object)
+
+        return HttpResponseRedirect(success_url)
+
+
+class Index(LoginRequiredMixin, generic.TemplateView):
+    template_name = "catalog/index.html"
+
+    def get_context_data(self, *, object_list=None, **kwargs):
+        return get_catalog_counters()
+
+
+class GenreListView(
+    LoginRequiredMixin,
+    PopularitySortMixin,
+    CursorPaginationMixin,
+    generic.ListView
+):
     model = Genre
     paginate_by = 8
 
@@ -61,9 +181,19 @@ class GenreListView(LoginRequiredMixin, generic.ListView):
         name = self.request.GET.get("name")
 
         if name:
-            return queryset.filter(name__icontains=name)
+            queryset = search(queryset, name)
 
-        return queryset
+        return self.sort_queryset(queryset)
+
+
+class GenreDetailView(
+    LoginRequiredMixin, RelatedBandsMixin, generic.DetailView
+):
+    model = Genre
+    band_lookup = "genres"
+
+    def get_band_queryset(self):
+        return super().get_band_queryset().select_related("country")
 
 
 class GenreCreateView(LoginRequiredMixin, generic.CreateView):
@@ -78,12 +208,19 @@ class GenreUpdateView(LoginRequiredMixin, generic.UpdateView):
     success_url = reverse_lazy("catalog:genre-list-view")
 
 
-class GenreDeleteView(LoginRequiredMixin, generic.DeleteView):
+class GenreDeleteView(
+    LoginRequiredMixin, DeleteImpactMixin, generic.DeleteView
+):
     model = Genre
     success_url = reverse_lazy("catalog:genre-list-view")
 
 
-class CountryListView(LoginRequiredMixin, generic.ListView):
+class CountryListView(
+    LoginRequiredMixin,
+    PopularitySortMixin,
+    CursorPaginationMixin,
+    generic.ListView
+):
     model = Country
     paginate_by = 8
 
@@ -104,9 +241,16 @@ class CountryListView(LoginRequiredMixin, generic.ListView):
         name = self.request.GET.get("name")
 
         if name:
-            return queryset.filter(name__icontains=name)
+            queryset = search(queryset, name)
+
+        return self.sort_queryset(queryset)
 
-        return queryset
+
+class CountryDetailView(
+    LoginRequiredMixin, RelatedBandsMixin, generic.DetailView
+):
+    model = Country
+    band_lookup = "country"
 
 
 class CountryCreateView(LoginRequiredMixin, generic.CreateView):
@@ -121,12 +265,18 @@ class CountryUpdateView(LoginRequiredMixin, generic.UpdateView):
     success_url = reverse_lazy("catalog:country-list-view")
 
 
-class CountryDeleteView(LoginRequiredMixin, generic.DeleteView):
+class CountryDeleteView(
+    LoginRequiredMixin, DeleteImpactMixin, generic.DeleteView
+):
     model = Country
     success_url = reverse_lazy("catalog:country-list-view")
 
 
-class InstrumentListView(LoginRequiredMixin, generic.ListView):
+class InstrumentListView(
+    LoginRequiredMixin,
+    CursorPaginationMixin,
+    generic.ListView
+):
     model = Instrument
     paginate_by = 8
 
@@ -147,7 +297,7 @@ class InstrumentListView(LoginRequiredMixin, generic.ListView):
         name = self.request.GET.get("name")
 
         if name:
-            return queryset.filter(name__icontains=name)
+            return search(queryset, name)
 
         return queryset
 
@@ -164,12 +314,19 @@ class InstrumentUpdateView(LoginRequiredMixin, generic.UpdateView):
     success_url = reverse_lazy("catalog:instrument-list-view")
 
 
-class InstrumentDeleteView(LoginRequiredMixin, generic.DeleteView):
+class InstrumentDeleteView(
+    LoginRequiredMixin, DeleteImpactMixin, generic.DeleteView
+):
     model = Instrument
     success_url = reverse_lazy("catalog:instrument-list-view")
 
 
-class MusicianListView(LoginRequiredMixin, generic.ListView):
+class MusicianListView(
+    LoginRequiredMixin,
+    PopularitySortMixin,
+    CursorPaginationMixin,
+    generic.ListView
+):
     model = Musician
     paginate_by = 3
 
@@ -194,21 +351,19 @@ class MusicianListView(LoginRequiredMixin, generic.ListView):
         musician = self.request.GET.get("musician")
 
         if musician:
-            first_name = queryset.filter(first_name__icontains=musician)
-            if first_name:
-                return first_name
-
-            return queryset.filter(last_name__icontains=musician)
+            queryset = search_musicians(queryset, musician)
 
-        return queryset
+        return self.sort_queryset(queryset)
 
 
-class MusicianDetailView(LoginRequiredMixin, generic.DetailView):
+class MusicianDetailView(
+    LoginRequiredMixin, CachedDetailMixin, generic.DetailView
+):
     model = Musician
     queryset = Musician.objects.all().select_related(
         "instrument"
     ).prefetch_related(
-        "bands"
+        Prefetch("bands", queryset=Band.objects.select_related("country"))
     )
 
 
@@ -229,13 +384,43 @@ class MusicianDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("catalog:musician-list-view")
 
 
-class BandListView(LoginRequiredMixin, generic.ListView):
+class BandListView(
+    LoginRequiredMixin,
+    PopularitySortMixin,
+    CursorPaginationMixin,
+    generic.ListView
+):
     model = Band
     paginate_by = 5
+    popularity_field = "member_count"
+    band_count = None
+
+    def get(self, request, *args, **kwargs):
+        self.band_count, self.facets = self.get_facets()
+
+        return super().get(request, *args, **kwargs)
+
+    def get_facets(self):
+        return get_band_facets(self.request.GET)
+
+    def get_paginator(self, *args, **kwargs):
+        paginator = super().get_paginator(*args, **kwargs)
+        if self.band_count is not None:
+            # Counted and cached along with the facets.
+            paginator.count = self.band_count
+
+        return paginator
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super(BandListView, self).get_context_data(**kwargs)
 
+        # Only rows missing from the fragment cache render their genres.
+        prefetch_related_objects(
+            attach_band_row_versions(context["band_list"]), "genres"
+        )
+        context["band_row_timeout"] = BAND_ROW_FRAGMENT_TIMEOUT
+        context["facets"] = self.facets
+
         name = self.request.GET.get("name", "")
 
         context["search_form"] = BandSearchForm(initial={
@@ -245,26 +430,32 @@ class BandListView(LoginRequiredMixin, generic.ListView):
         return context
 
     def get_queryset(self):
-        queryset = Band.objects.select_related(
-            "country"
-        ).prefetch_related(
-            "genres"
-        )
+        queryset = Band.objects.select_related("country")
 
         name = self.request.GET.get("name")
 
         if name:
-            return queryset.filter(name__icontains=name)
+            queryset = search(queryset, name)
 
-        return queryset
+        queryset = filter_bands(
+            queryset, parse_facet_selection(self.request.GET)
+        )
 
+        return self.sort_queryset(queryset)
 
-class BandDetailView(LoginRequiredMixin, generic.DetailView):
+
+class BandDetailView(
+    LoginRequiredMixin, CachedDetailMixin, generic.DetailView
+):
     model = Band
     queryset = Band.objects.all().select_related(
         "country"
     ).prefetch_related(
-        "genres"
+        "genres",
+        Prefetch(
+            "members",
+            queryset=Musician.objects.select_related("instrument")
+        ),
     )
 
 
@@ -283,3 +474,59 @@ class BandUpdateView(LoginRequiredMixin, generic.UpdateView):
 class BandDeleteView(LoginRequiredMixin, generic.DeleteView):
     model = Band
     success_url = reverse_lazy("catalog:band-list-view")
+
+
+class BandExportView(LoginRequiredMixin, generic.View):
+    formats = {
+        "csv": (stream_csv, "text/csv", "bands.csv"),
+        "ndjson": (stream_ndjson, "application/x-ndjson", "bands.ndjson"),
+    }
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get("format", "csv")
+        if export_format not in self.formats:
+            export_format = "csv"
+        stream, content_type, filename = self.formats[export_format]
+
+        queryset = export_bands_queryset()
+
+        name = request.GET.get("name")
+
+        if name:
+            queryset = search(queryset, name)
+
+        response = StreamingHttpResponse(
+            stream(band_records(queryset)),
+            content_type=content_type
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{filename}"'
+        )
+
+        return response
+
+
+class TaskDetailView(LoginRequiredMixin, generic.DetailView):
+    model = Task
+
+
+class AutocompleteView(LoginRequiredMixin, generic.View):
+    max_limit = 50
+
+    def get(self, request, *args, **kwargs):
+        prefix = request.GET.get("q", "")
+
+        try:
+            limit = int(request.GET.get("limit", AUTOCOMPLETE_LIMIT))
+        except ValueError:
+            limit = AUTOCOMPLETE_LIMIT
+        limit = min(max(limit, 1), self.max_limit)
+
+        kinds = request.GET.getlist("type") or None
+        if kinds and not set(kinds) <= AUTOCOMPLETE_INDEXES.keys():
+            return JsonResponse(
+                {"error": f"type must be one of {list(AUTOCOMPLETE_INDEXES)}"},
+                status=400
+            )
+
+        return JsonResponse(autocomplete(prefix, limit, kinds))
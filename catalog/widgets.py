@@ -0,0 +1,57 @@
+from django import forms
+from django.core.exceptions import ValidationError
+
+
+class MemberPickerWidget(forms.SelectMultiple):
+    """
+    Multiple select that renders only the selected objects of a
+    ModelMultipleChoiceField. Other choices are searched and paged in by
+    the browser from a JSON list endpoint, so the page size does not
+    depend on the size of the table.
+    """
+
+    template_name = "catalog/widgets/member_picker.html"
+
+    class Media:
+        js = ("assets/js/member-picker.js",)
+
+    def __init__(self, source_url, search_param, attrs=None):
+        super().__init__(attrs)
+        self.source_url = source_url
+        self.search_param = search_param
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context["widget"]["source_url"] = str(self.source_url)
+        context["widget"]["search_param"] = self.search_param
+        return context
+
+    def get_selected(self, value):
+        queryset = self.choices.queryset
+        key = self.choices.field.to_field_name or "pk"
+        key_field = (
+            queryset.model._meta.get_field(key) if key != "pk"
+            else queryset.model._meta.pk
+        )
+
+        keys = []
+        for item in value:
+            try:
+                keys.append(key_field.to_python(item))
+            except ValidationError:
+                # Invalid input is reported by the field; skip it here.
+                pass
+
+        return queryset.filter(**{f"{key}__in": keys})
+
+    def optgroups(self, name, value, attrs=None):
+        selected = self.get_selected([item for item in value if item])
+
+        options = []
+        for index, instance in enumerate(selected):
+            option_value, label = self.choices.choice(instance)
+            options.append(self.create_option(
+                name, option_value, label, True, index, attrs=attrs
+            ))
+
+        return [(None, options, 0)]
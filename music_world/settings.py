@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/4.1/ref/settings/
 
 import os
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -51,6 +52,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "catalog.middleware.TimingMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -89,10 +91,74 @@ WSGI_APPLICATION = "music_world.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
 
-DATABASES = {
+# Connections are kept open for DB_CONN_MAX_AGE seconds (0 opens one per
+# request) and checked before reuse when DB_CONN_HEALTH_CHECKS is on. Keep
+# it at 0 under ASGI: each request runs its queries on a new thread, so
+# persistent connections are never reused and stay open until collected.
+# DB_PGBOUNCER=True targets a pgbouncer in transaction pooling mode, which
+# cannot hold server-side cursors across transactions.
+
+DB_ENGINE = os.getenv("DB_ENGINE") or "sqlite"
+
+if DB_ENGINE == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.getenv("DB_NAME") or "music_world",
+            "USER": os.getenv("DB_USER", ""),
+            "PASSWORD": os.getenv("DB_PASSWORD", ""),
+            "HOST": os.getenv("DB_HOST", ""),
+            "PORT": os.getenv("DB_PORT", ""),
+            "DISABLE_SERVER_SIDE_CURSORS": (
+                os.getenv("DB_PGBOUNCER") == "True"
+            ),
+        }
+    }
+elif DB_ENGINE == "sqlite":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("DB_NAME") or BASE_DIR / "db.sqlite3",
+        }
+    }
+else:
+    raise ImproperlyConfigured(
+        f"DB_ENGINE must be 'sqlite' or 'postgresql', not {DB_ENGINE!r}."
+    )
+
+# PRAGMAs run on every new SQLite connection. WAL lets readers work while a
+# write transaction is open; synchronous=NORMAL is durable in WAL mode
+# except for the last commits before a power loss.
+CATALOG_SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("DB_SQLITE_JOURNAL_MODE") or "wal",
+    "synchronous": os.getenv("DB_SQLITE_SYNCHRONOUS") or "normal",
+    "mmap_size": int(os.getenv("DB_SQLITE_MMAP_SIZE") or 128 * 1024 ** 2),
+    # Negative sizes are in KiB
+    "cache_size": int(os.getenv("DB_SQLITE_CACHE_SIZE") or -64 * 1024),
+    "busy_timeout": int(os.getenv("DB_SQLITE_BUSY_TIMEOUT") or 5000),
+}
+
+DATABASES["default"].update({
+    "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE") or 0),
+    "CONN_HEALTH_CHECKS": os.getenv("DB_CONN_HEALTH_CHECKS") != "False",
+})
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# Catalog caches are invalidated by signals, so every process serving
+# requests, run_worker and import_catalog must share one cache backend:
+# a directory by default, or e.g. Redis/Memcached in production.
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": (
+            os.getenv("CACHE_BACKEND")
+            or "django.core.cache.backends.filebased.FileBasedCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION") or BASE_DIR / ".cache",
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES") or 10000),
+        },
     }
 }
 
@@ -119,6 +185,23 @@ AUTH_USER_MODEL = "catalog.Musician"
 
 LOGIN_REDIRECT_URL = "/"
 
+# Requests slower than this are logged by catalog.middleware.TimingMiddleware
+CATALOG_SLOW_REQUEST_MS = int(os.getenv("CATALOG_SLOW_REQUEST_MS", 500))
+
+# Keyset pagination for the catalog list views instead of page numbers
+CATALOG_CURSOR_PAGINATION = os.getenv("CATALOG_CURSOR_PAGINATION") == "True"
+
+# Async views count the dashboard models concurrently, one connection each,
+# instead of in one statement (ignored on SQLite)
+CATALOG_CONCURRENT_COUNTS = os.getenv("CATALOG_CONCURRENT_COUNTS") == "True"
+
+# Deletes cascading to more rows than this run in the background, in
+# batches of CATALOG_DELETE_BATCH_SIZE rows per transaction
+CATALOG_BACKGROUND_DELETE_THRESHOLD = int(
+    os.getenv("CATALOG_BACKGROUND_DELETE_THRESHOLD") or 1000
+)
+CATALOG_DELETE_BATCH_SIZE = int(os.getenv("CATALOG_DELETE_BATCH_SIZE") or 500)
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.1/topics/i18n/
 